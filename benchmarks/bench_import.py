@@ -0,0 +1,37 @@
+"""
+Measure the time to import bluesky and some of its submodules.
+
+Each statement runs in a fresh interpreter. The interpreter's own start-up
+time is measured the same way and subtracted.
+"""
+import subprocess
+import sys
+import time
+
+STATEMENTS = ['import bluesky',
+              'from bluesky import Msg',
+              'import bluesky.callbacks.zmq',
+              'from bluesky import RunEngine',
+              'import bluesky.plans']
+
+
+def best_of(statement, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', statement])
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    bare = best_of('pass')
+    print('interpreter start-up: {:.0f} ms'.format(bare * 1e3))
+    print('{:>32} {:>10}'.format('statement', 'ms'))
+    for statement in STATEMENTS:
+        print('{:>32} {:>10.0f}'.format(statement,
+                                        (best_of(statement) - bare) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure the overhead of plan_mutator per message and per layer.
+
+Compares stacking one plan_mutator per msg_proc, as the stock wrappers do,
+with fusing them into a single pass with fused_plan_mutator, and the same
+for a RunEngine-style list of preprocessors.
+"""
+import time
+
+from bluesky import Msg
+from bluesky.preprocessors import (plan_mutator, fused_plan_mutator,
+                                   MsgProcessor, apply_preprocessors)
+
+
+def plan(num):
+    for i in range(num):
+        yield Msg('null', None, i)
+
+
+def null_proc(msg):
+    return None, None
+
+
+def consume(gen):
+    ret = None
+    try:
+        while True:
+            ret = gen.send(ret)
+    except StopIteration:
+        pass
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def nested(num, layers):
+    gen = plan(num)
+    for _ in range(layers):
+        gen = plan_mutator(gen, null_proc)
+    consume(gen)
+
+
+def fused(num, layers):
+    consume(fused_plan_mutator(plan(num), [null_proc] * layers))
+
+
+def preprocessors(num, layers):
+    return [MsgProcessor(null_proc) for _ in range(layers)]
+
+
+def stacked_preprocessors(num, layers):
+    gen = plan(num)
+    for preprocessor in preprocessors(num, layers):
+        gen = preprocessor(gen)
+    consume(gen)
+
+
+def fused_preprocessors(num, layers):
+    consume(apply_preprocessors(plan(num), preprocessors(num, layers)))
+
+
+def main(num=100000):
+    bare = best_of(lambda: consume(plan(num)))
+    print('{} messages, bare plan: {:.2f} us/msg'.format(num,
+                                                         bare / num * 1e6))
+    print('{:>6} {:>18} {:>18}'.format('layers', 'nested (us/msg)',
+                                       'fused (us/msg)'))
+    for layers in (1, 2, 4, 6):
+        t_nested = best_of(lambda: nested(num, layers))
+        t_fused = best_of(lambda: fused(num, layers))
+        print('{:>6} {:>18.2f} {:>18.2f}'.format(
+            layers, (t_nested - bare) / num * 1e6,
+            (t_fused - bare) / num * 1e6))
+    print('{:>6} {:>18} {:>18}'.format('procs', 'stacked (us/msg)',
+                                       'RE fused (us/msg)'))
+    for layers in (1, 2, 4, 6):
+        t_stacked = best_of(lambda: stacked_preprocessors(num, layers))
+        t_fused = best_of(lambda: fused_preprocessors(num, layers))
+        print('{:>6} {:>18.2f} {:>18.2f}'.format(
+            layers, (t_stacked - bare) / num * 1e6,
+            (t_fused - bare) / num * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure the cost of generating document uids.
+
+Compares the RunEngine's uid sources per uid, and per Event in a RunEngine
+counting a simulated detector, where one uid is made for each Event.
+"""
+import time
+
+from ophyd.sim import det
+
+from bluesky import RunEngine
+from bluesky.plans import count
+from bluesky.utils import new_uid, short_uid, UidPool, SequentialUid
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def per_call(func, num):
+    def run():
+        for _ in range(num):
+            func()
+    return best_of(run) / num * 1e6
+
+
+def old_short_uid(label='set', truncate=6):
+    return '-'.join([label, new_uid()[:truncate]])
+
+
+def main(num=100000, num_events=5000):
+    sources = [('new_uid', new_uid),
+               ('UidPool', UidPool()),
+               ('SequentialUid', SequentialUid())]
+    print('{:>16} {:>10}'.format('source', 'us/uid'))
+    for label, source in sources:
+        print('{:>16} {:>10.2f}'.format(label, per_call(source, num)))
+    print('{:>16} {:>10.2f}'.format('short_uid (old)',
+                                    per_call(old_short_uid, num)))
+    print('{:>16} {:>10.2f}'.format('short_uid',
+                                    per_call(lambda: short_uid('set'), num)))
+
+    print('{} Events per run'.format(num_events))
+    print('{:>16} {:>10}'.format('source', 'us/Event'))
+    for label, source in sources:
+        RE = RunEngine({}, uid_source=source)
+        t = best_of(lambda: RE(count([det], num_events)))
+        print('{:>16} {:>10.2f}'.format(label, t / num_events * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""
+Helpers shared by the benchmarks.
+"""
+from ophyd.sim import SynGauss, motor
+
+from bluesky import RunEngine
+
+
+def make_RE():
+    "Return a RunEngine without the SIGINT handler or subscriptions."
+    return RunEngine({}, context_managers=[])
+
+
+def make_detectors(num):
+    "Return ``num`` simulated detectors reading a Gaussian of ``motor``."
+    return [SynGauss('det{}'.format(i), motor, 'motor', center=0, Imax=1,
+                     sigma=1)
+            for i in range(num)]
@@ -0,0 +1,103 @@
+"""
+Benchmarks of dispatching documents to subscribers, and of the memory used
+while making Events.
+"""
+import gc
+import time
+import tracemalloc
+
+from event_model import DocumentNames
+from ophyd import Signal
+
+from bluesky.plans import count
+from bluesky.utils import new_uid
+
+from .common import make_RE
+
+
+def _event(descriptor, seq_num):
+    now = time.time()
+    return {'descriptor': descriptor, 'uid': new_uid(), 'seq_num': seq_num,
+            'time': now, 'data': {'det': 1.0, 'motor': 0.5},
+            'timestamps': {'det': now, 'motor': now}, 'filled': {}}
+
+
+class Emit:
+    "Events through RunEngine.emit_sync (validation and dispatch)"
+    params = [0, 1, 4, 16]
+    param_names = ['subscribers']
+    num_events = 1000
+
+    def setup(self, num_subscribers):
+        self.RE = make_RE()
+        for _ in range(num_subscribers):
+            self.RE.subscribe(lambda name, doc: None)
+        descriptor = new_uid()
+        self.events = [_event(descriptor, i + 1)
+                       for i in range(self.num_events)]
+
+    def _emit_all(self):
+        emit_sync = self.RE.emit_sync
+        for event in self.events:
+            emit_sync(DocumentNames.event, event)
+
+    def time_emit_events(self, num_subscribers):
+        self._emit_all()
+
+    def track_events_per_second(self, num_subscribers):
+        t0 = time.perf_counter()
+        self._emit_all()
+        return self.num_events / (time.perf_counter() - t0)
+
+    track_events_per_second.unit = 'Events/s'
+
+
+class Dispatch:
+    "Events through the Dispatcher alone, without validation"
+    params = [0, 1, 4, 16]
+    param_names = ['subscribers']
+    num_events = 10000
+
+    def setup(self, num_subscribers):
+        self.RE = make_RE()
+        for _ in range(num_subscribers):
+            self.RE.subscribe(lambda name, doc: None)
+        self.event = _event(new_uid(), 1)
+
+    def time_dispatch_events(self, num_subscribers):
+        process = self.RE.dispatcher.process
+        event = self.event
+        for _ in range(self.num_events):
+            process(DocumentNames.event, event)
+
+
+class Memory:
+    """
+    Memory used by the RunEngine while making Events
+
+    The run is 10k Events long; retained memory is reported per 100k Events.
+    """
+    num_events = 10000
+    timeout = 300
+
+    def setup(self):
+        self.RE = make_RE()
+        self.det = Signal(name='det', value=1.0)
+        # Warm up: fill the caches that are only filled once.
+        self.RE(count([self.det], 10))
+
+    def peakmem_count(self):
+        self.RE(count([self.det], self.num_events))
+
+    def track_retained_per_100k_events(self):
+        "Memory still allocated after the run, e.g. in unbounded caches"
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        self.RE(count([self.det], self.num_events))
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return (after - before) * 100000 // self.num_events
+
+    track_retained_per_100k_events.unit = 'bytes'
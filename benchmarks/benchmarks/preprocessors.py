@@ -0,0 +1,58 @@
+"""
+Benchmarks of the overhead of stacked preprocessors.
+"""
+from bluesky import Msg
+from bluesky.preprocessors import (plan_mutator, MsgProcessor,
+                                   apply_preprocessors, SupplementalData)
+from bluesky.plans import count
+
+from .common import make_RE, make_detectors
+
+
+def _plan(num):
+    for i in range(num):
+        yield Msg('null', None, i)
+
+
+def _null_proc(msg):
+    return None, None
+
+
+def _consume(gen):
+    ret = None
+    try:
+        while True:
+            ret = gen.send(ret)
+    except StopIteration:
+        pass
+
+
+class Stacking:
+    "10k messages through a number of no-op preprocessors"
+    params = (['nested', 'fused'], [0, 1, 2, 4, 8])
+    param_names = ['mode', 'layers']
+    num_msgs = 10000
+
+    def time_preprocessors(self, mode, layers):
+        if mode == 'nested':
+            gen = _plan(self.num_msgs)
+            for _ in range(layers):
+                gen = plan_mutator(gen, _null_proc)
+        else:
+            preprocessors = [MsgProcessor(_null_proc) for _ in range(layers)]
+            gen = apply_preprocessors(_plan(self.num_msgs), preprocessors)
+        _consume(gen)
+
+
+class SupplementalDataRun:
+    "A count of 100 points with baseline and monitor streams"
+    timeout = 120
+
+    def setup(self):
+        self.RE = make_RE()
+        self.detectors = make_detectors(1)
+        self.sd = SupplementalData(baseline=make_detectors(4))
+        self.RE.preprocessors.append(self.sd)
+
+    def time_count(self):
+        self.RE(count(self.detectors, 100))
@@ -0,0 +1,43 @@
+"""
+Benchmarks of the RunEngine executing built-in plans.
+"""
+import time
+
+from ophyd.sim import motor, motor1, motor2
+
+from bluesky.plans import count, scan, grid_scan
+
+from .common import make_RE, make_detectors
+
+# Each plan makes 100 Events.
+PLANS = {
+    'count': lambda dets: count(dets, 100),
+    'scan': lambda dets: scan(dets, motor, -1, 1, 100),
+    'grid_scan': lambda dets: grid_scan(dets, motor1, -1, 1, 10,
+                                        motor2, -1, 1, 10, False),
+}
+
+
+class Plans:
+    params = (list(PLANS), [1, 4, 16])
+    param_names = ['plan', 'detectors']
+    timeout = 120
+
+    def setup(self, plan, num_detectors):
+        self.RE = make_RE()
+        self.detectors = make_detectors(num_detectors)
+        self.num_msgs = 0
+
+    def _count_msgs(self, msg):
+        self.num_msgs += 1
+
+    def time_plan(self, plan, num_detectors):
+        self.RE(PLANS[plan](self.detectors))
+
+    def track_msgs_per_second(self, plan, num_detectors):
+        self.RE.msg_hook = self._count_msgs
+        t0 = time.perf_counter()
+        self.RE(PLANS[plan](self.detectors))
+        return self.num_msgs / (time.perf_counter() - t0)
+
+    track_msgs_per_second.unit = 'msgs/s'
@@ -0,0 +1,76 @@
+"""
+Benchmarks of publishing documents over 0MQ and receiving them.
+"""
+import threading
+import time
+import queue
+
+from bluesky.callbacks.zmq import Proxy, Publisher, RemoteDispatcher
+
+from .documents import _event
+
+_proxy_ports = None
+
+
+def _start_proxy():
+    "Start one proxy per process, on random ports, and return the ports."
+    global _proxy_ports
+    if _proxy_ports is None:
+        ports = queue.Queue()
+
+        def run():
+            proxy = Proxy()
+            ports.put((proxy.in_port, proxy.out_port))
+            proxy.start()
+
+        threading.Thread(target=run, daemon=True).start()
+        _proxy_ports = ports.get(timeout=10)
+    return _proxy_ports
+
+
+class PublishReceive:
+    "Events through a Publisher, a Proxy and a RemoteDispatcher"
+    num_events = 5000
+    # Keep fewer Events in flight than the 0MQ high water mark (1000), so
+    # that none are dropped.
+    max_in_flight = 500
+    timeout = 120
+
+    def setup(self):
+        in_port, out_port = _start_proxy()
+        self.in_address = ('127.0.0.1', in_port)
+        self.dispatcher = RemoteDispatcher(('127.0.0.1', out_port))
+        self.dispatcher.subscribe(self._receive)
+        self.received = 0
+        self.ready = threading.Event()
+        self.t_first = self.t_last = None
+
+    def _receive(self, name, doc):
+        if name == 'start':
+            self.ready.set()
+        elif name == 'event':
+            if self.received == 0:
+                self.t_first = time.perf_counter()
+            self.received += 1
+            if self.received == self.num_events:
+                self.t_last = time.perf_counter()
+                self.dispatcher.stop()
+
+    def _publish(self):
+        publisher = Publisher(self.in_address)
+        # Repeat a start document until the subscription is established.
+        while not self.ready.wait(0.01):
+            publisher('start', {'uid': 'ready', 'time': time.time()})
+        events = [_event('descriptor', i + 1) for i in range(self.num_events)]
+        for sent, event in enumerate(events):
+            while sent - self.received > self.max_in_flight:
+                time.sleep(0.0001)
+            publisher('event', event)
+        publisher.close()
+
+    def track_events_per_second(self):
+        threading.Thread(target=self._publish, daemon=True).start()
+        self.dispatcher.start()
+        return (self.num_events - 1) / (self.t_last - self.t_first)
+
+    track_events_per_second.unit = 'Events/s'
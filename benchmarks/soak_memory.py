@@ -0,0 +1,124 @@
+"""
+Run thousands of plans on one RunEngine and check that memory is bounded.
+
+This mimics a long-running session: a mix of plans, with baselines, monitors,
+per-call subscriptions and failing plans, is run over and over. After a
+warm-up, the sizes of the RunEngine's caches (RunEngine.memory_report) and
+the memory allocated by Python (tracemalloc) must stop growing.
+
+    python soak_memory.py --plans 5000
+
+exits with status 1 and lists the culprits if they do not.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from ophyd.sim import SynGauss, motor, motor1, motor2
+
+from bluesky import RunEngine
+from bluesky.plans import count, scan, grid_scan, rel_scan
+from bluesky.plan_stubs import mv, sleep
+from bluesky.preprocessors import SupplementalData, monitor_during_wrapper
+
+
+det = SynGauss('det', motor, 'motor', center=0, Imax=1, sigma=1)
+
+
+def failing_plan():
+    yield from mv(motor, 1)
+    raise ValueError("failing on purpose")
+
+
+def plans():
+    "Cycle through a mix of plans."
+    while True:
+        yield count([det], 5)
+        yield scan([det], motor, -1, 1, 5)
+        yield grid_scan([det], motor1, -1, 1, 3, motor2, -1, 1, 3, False)
+        yield rel_scan([det], motor, -1, 1, 5)
+        yield monitor_during_wrapper(count([det], 3, delay=0.001), [motor])
+        yield sleep(0.001)
+        yield failing_plan()
+
+
+def run(RE, plan):
+    try:
+        # A per-call subscription, removed when the call is over.
+        RE(plan, {'stop': lambda name, doc: None})
+    except ValueError:
+        pass
+
+
+def cache_sizes(RE):
+    return {name: entry['size']
+            for name, entry in RE.memory_report().items()}
+
+
+def main(num_plans=2000, warm_up=200, max_growth=1e6):
+    RE = RunEngine({}, context_managers=[])
+    RE.verbose = False  # Do not log the tracebacks of failing_plan.
+    RE.preprocessors.append(SupplementalData(baseline=[motor1, motor2]))
+    RE.subscribe(lambda name, doc: None)
+    gen = plans()
+
+    # The largest size of each cache at the end of a plan, after the warm-up
+    # and after all the plans
+    warm_sizes = {}
+    max_sizes = {}
+
+    for _ in range(warm_up):
+        run(RE, next(gen))
+        for name, size in cache_sizes(RE).items():
+            warm_sizes[name] = max(size, warm_sizes.get(name, 0))
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+
+    for i in range(1, num_plans + 1):
+        run(RE, next(gen))
+        for name, size in cache_sizes(RE).items():
+            max_sizes[name] = max(size, max_sizes.get(name, 0))
+        if i % (num_plans // 10 or 1) == 0:
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            print('{:>6} plans: {:>10,d} bytes allocated since warm-up, '
+                  'peak {:>10,d}'.format(i, current, peak))
+
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    failures = []
+    # The warm-up ran every kind of plan, so no cache should be larger now.
+    for name, size in max_sizes.items():
+        if size > warm_sizes.get(name, 0):
+            failures.append('{} grew from {} to {} entries'.format(
+                name, warm_sizes.get(name, 0), size))
+    if growth > max_growth:
+        failures.append('{:,d} bytes allocated since warm-up'.format(growth))
+
+    print('largest cache sizes:', {name: size for name, size
+                                   in max_sizes.items() if size})
+    print('top sources of memory allocated since warm-up:')
+    for stat in end.compare_to(start, 'lineno')[:10]:
+        print('    {}'.format(stat))
+    if failures:
+        print('\n'.join(['FAILED'] + failures))
+        return 1
+    print('OK: memory is bounded')
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--plans', type=int, default=2000,
+                        help='number of plans to run after the warm-up')
+    parser.add_argument('--warm-up', type=int, default=200,
+                        help='number of plans to run before measuring')
+    parser.add_argument('--max-growth', type=float, default=1e6,
+                        help='bytes that may be allocated after the warm-up')
+    args = parser.parse_args()
+    sys.exit(main(args.plans, args.warm_up, args.max_growth))
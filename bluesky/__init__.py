@@ -1,12 +1,30 @@
-from .utils import Msg
-from .utils import RunEngineInterrupted
-from .utils import IllegalMessageSequence
-from .utils import FailedStatus
-
-from .run_engine import RunEngine
-from .preprocessors import SupplementalData
-from .log import set_handler
-
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+from ._lazy import lazy_attributes
+
+# The names exported here, and the submodules defining them. They are
+# imported on first access (PEP 562), so that importing bluesky, or one of its
+# lightweight submodules, does not import the RunEngine and its dependencies.
+_lazy_attrs = {
+    'Msg': 'utils',
+    'RunEngineInterrupted': 'utils',
+    'IllegalMessageSequence': 'utils',
+    'FailedStatus': 'utils',
+    'RunEngine': 'run_engine',
+    'SupplementalData': 'preprocessors',
+    'set_handler': 'log',
+}
+
+__all__ = list(_lazy_attrs) + ['__version__']
+
+
+def _get_version():
+    # Computing the version may run git, so it is deferred too.
+    from ._version import get_versions
+    return get_versions()['version']
+
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__, _lazy_attrs,
+    # imported along with bluesky before its names were made lazy
+    submodules=['bundlers', 'log', 'plan_stubs', 'preprocessors',
+                'run_engine', 'utils'],
+    getters={'__version__': _get_version})
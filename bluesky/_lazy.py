@@ -0,0 +1,57 @@
+"""
+Lazy attributes of the package ``__init__`` modules (PEP 562).
+"""
+import importlib
+import sys
+
+
+def lazy_attributes(module_name, lazy_attrs, submodules=(), getters=None):
+    """
+    Import the names exported by a package on first access.
+
+    This must be called after the package defines ``__all__``.
+
+    Parameters
+    ----------
+    module_name : str
+        the ``__name__`` of the package
+    lazy_attrs : dict
+        maps each exported name to the submodule that defines it
+    submodules : iterable of str, optional
+        submodules that used to be imported along with the package, so that
+        code may still access them as attributes without importing them
+    getters : dict, optional
+        maps any other names to functions computing their values
+
+    Returns
+    -------
+    __getattr__, __dir__ : callable
+        the module-level functions of the package
+    """
+    namespace = sys.modules[module_name].__dict__
+    submodules = frozenset(submodules)
+    getters = dict(getters or {})
+
+    def __getattr__(name):
+        if name in lazy_attrs:
+            module = importlib.import_module('.' + lazy_attrs[name],
+                                             module_name)
+            value = getattr(module, name)
+        elif name in getters:
+            value = getters[name]()
+        elif name in submodules:
+            value = importlib.import_module('.' + name, module_name)
+        else:
+            raise AttributeError("module {!r} has no attribute {!r}"
+                                 .format(module_name, name))
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(namespace['__all__']))
+
+    if sys.version_info < (3, 7):
+        # Module __getattr__ is not supported; import everything now.
+        for name in namespace['__all__']:
+            __getattr__(name)
+    return __getattr__, __dir__
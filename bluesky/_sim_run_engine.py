@@ -0,0 +1,112 @@
+"""
+The RunEngine subclass behind :class:`bluesky.simulators.SimRunEngine`.
+
+It is kept apart so that importing :mod:`bluesky.simulators` does not import
+the RunEngine.
+"""
+import asyncio
+import time as ttime
+
+from bluesky.run_engine import RunEngine, _extract_run_key
+from bluesky.simulators import _SimulatedStatus, _Timeline
+
+
+class SimRunEngine(RunEngine):
+    """
+    A RunEngine that runs plans in virtual time, without moving hardware.
+
+    Plans go through the full document-producing path of the RunEngine, but
+    'set', 'multi_set' and 'trigger' are not sent to the devices: they return
+    statuses that are already done and advance a virtual clock according to
+    the :class:`DeviceModel` of each device, as in :func:`analyze_plan`.
+    'sleep', 'wait' and 'wait_for' advance the virtual clock instead of
+    blocking. So plans run as fast as the CPU allows.
+
+    Each 'read' returns a simulated reading with the keys of the device's
+    ``describe()``, stamped with the virtual time (as are the documents),
+    whose values are the position the plan last set the device to (else 0,
+    or an array of zeros of the described shape). Flyers, staging and
+    configuration still use the real devices.
+
+    Parameters
+    ----------
+    md : dict-like, optional
+        The default is a standard Python dictionary, as for
+        :class:`~bluesky.run_engine.RunEngine`.
+    models : dict, optional
+        maps devices (or their names) to :class:`DeviceModel` instances.
+        Devices without a model move and trigger instantly.
+    initial_positions : dict, optional
+        maps devices (or their names) to their positions at the start
+    start_time : float, optional
+        virtual time at the start; default is the current time
+    **kwargs
+        passed to :class:`~bluesky.run_engine.RunEngine`
+
+    Attributes
+    ----------
+    sim_time : float
+        the current virtual time
+    """
+    def __init__(self, md=None, *, models=None, initial_positions=None,
+                 start_time=None, **kwargs):
+        if start_time is None:
+            start_time = ttime.time()
+        positions = {getattr(obj, 'name', obj): pos
+                     for obj, pos in (initial_positions or {}).items()}
+        self._timeline = _Timeline(models, positions, start=start_time)
+        kwargs.setdefault('time_source', lambda: self._timeline.now)
+        super().__init__(md, **kwargs)
+        self._status = _SimulatedStatus()
+        # 'wait' uses _wait_for internally to wait for real statuses (e.g.
+        # of flyers), so replace only the command.
+        self.register_command('wait_for', self._sim_wait_for)
+
+    @property
+    def sim_time(self):
+        return self._timeline.now
+
+    async def _set(self, msg):
+        self._timeline.set(msg.obj, msg.kwargs.get('group'), msg.args[0])
+        return self._status
+
+    async def _multi_set(self, msg):
+        group = msg.kwargs.get('group')
+        positions, = msg.args
+        if hasattr(positions, 'items'):
+            positions = positions.items()
+        positions = list(positions)
+        for obj, pos in positions:
+            self._timeline.set(obj, group, pos)
+        return (self._status,) * len(positions)
+
+    async def _trigger(self, msg):
+        self._timeline.trigger(msg.obj, msg.kwargs.get('group'))
+        return self._status
+
+    async def _read(self, msg):
+        ret = self._timeline.reading(msg.obj)
+        run_key = _extract_run_key(msg)
+        try:
+            current_run = self._run_bundlers[run_key]
+        except KeyError:
+            ...
+        else:
+            await current_run.read(msg, ret)
+        return ret
+
+    async def _wait(self, msg):
+        if msg.args:
+            group, = msg.args
+        else:
+            group = msg.kwargs['group']
+        self._timeline.wait(group)
+        await super()._wait(msg)
+
+    async def _sleep(self, msg):
+        self._timeline.sleep(*msg.args)
+        # Let requests (e.g. pause) in, as a real sleep would.
+        await asyncio.sleep(0, loop=self.loop)
+
+    async def _sim_wait_for(self, msg):
+        pass
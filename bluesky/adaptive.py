@@ -0,0 +1,290 @@
+"""
+Strategies that choose where to measure next from the data collected so far.
+
+They are used by :func:`bluesky.plans.adaptive_strategy_scan`. A strategy
+follows an "ask and tell" protocol:
+
+* ``ask(n)`` returns a list of up to ``n`` positions to measure next. An empty
+  list means the strategy is done. Positions that have been asked for but not
+  yet told are "pending"; a strategy should not propose them again.
+* ``tell(x, y)`` reports the value ``y`` measured at position ``x``.
+
+Any object with these two methods may be used.
+"""
+import numpy as np
+
+
+class Strategy:
+    """
+    Base class for one-dimensional sampling strategies.
+
+    Subclasses implement ``_propose(n)``, returning up to ``n`` new positions
+    given ``self.xs``, ``self.ys`` and ``self.pending``.
+    """
+    def __init__(self):
+        self.xs = []
+        self.ys = []
+        self.pending = set()
+
+    def ask(self, n=1):
+        "Return a list of up to ``n`` positions to measure next."
+        points = [float(x) for x in self._propose(n)]
+        self.pending.update(points)
+        return points
+
+    def tell(self, x, y):
+        "Record the value ``y`` measured at position ``x``."
+        x = float(x)
+        self.pending.discard(x)
+        self.xs.append(x)
+        self.ys.append(float(y))
+
+    def _propose(self, n):
+        raise NotImplementedError
+
+
+class CallableStrategy(Strategy):
+    """
+    Propose positions with a user-supplied function.
+
+    Parameters
+    ----------
+    func : callable
+        ``func(xs, ys, pending, n)`` returning a list of up to ``n``
+        positions, or an empty list when there is nothing left to measure.
+        ``xs`` and ``ys`` are the positions and values measured so far, and
+        ``pending`` the positions proposed but not yet measured.
+    """
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+
+    def _propose(self, n):
+        return list(self.func(list(self.xs), list(self.ys),
+                              set(self.pending), n))[:n]
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.func)
+
+
+class _IntervalStrategy(Strategy):
+    """
+    Sample a coarse grid, then repeatedly bisect the interval of largest loss.
+
+    Subclasses implement ``_losses(xs, ys)``, the loss of each interval
+    between consecutive points, with both axes scaled to unit range.
+    """
+    def __init__(self, start, stop, min_step, *, max_points=None,
+                 initial_points=5, tolerance=0):
+        super().__init__()
+        if min_step <= 0:
+            raise ValueError("min_step must be positive")
+        if initial_points < 2:
+            raise ValueError("initial_points must be at least 2")
+        self.start = start
+        self.stop = stop
+        self.min_step = min_step
+        self.max_points = max_points
+        self.initial_points = initial_points
+        self.tolerance = tolerance
+        self._initial = list(np.linspace(start, stop, initial_points))
+        self._proposed = 0
+
+    def _propose(self, n):
+        if self.max_points is not None:
+            n = min(n, self.max_points - self._proposed)
+        points = []
+        while len(points) < n and self._initial:
+            points.append(self._initial.pop(0))
+        pending = set(self.pending) | set(points)
+        while len(points) < n:
+            x = self._bisect(pending)
+            if x is None:
+                break
+            points.append(x)
+            pending.add(x)
+        self._proposed += len(points)
+        return points
+
+    def _bisect(self, pending):
+        "Return the midpoint of the interval with the largest loss, or None."
+        if not self.xs:
+            return None
+        order = np.argsort(self.xs)
+        xs = np.asarray(self.xs)[order]
+        ys = np.asarray(self.ys)[order]
+        x_scale = abs(self.stop - self.start) or 1
+        y_scale = np.ptp(ys) or 1
+        losses = self._losses((xs - xs[0]) / x_scale, (ys - ys[0]) / y_scale)
+        pending = np.sort(list(pending))
+        for i in np.argsort(losses)[::-1]:
+            if losses[i] <= self.tolerance:
+                return None
+            left, right = xs[i], xs[i + 1]
+            if right - left < 2 * self.min_step:
+                continue
+            # Skip intervals already being refined by a pending point.
+            if np.any((pending > left) & (pending < right)):
+                continue
+            return (left + right) / 2
+        return None
+
+    def _losses(self, xs, ys):
+        "Loss of each interval between consecutive scaled points."
+        raise NotImplementedError
+
+    def __repr__(self):
+        return ('{}({!r}, {!r}, {!r}, max_points={!r}, initial_points={!r}, '
+                'tolerance={!r})'.format(
+                    type(self).__name__, self.start, self.stop, self.min_step,
+                    self.max_points, self.initial_points, self.tolerance))
+
+
+class GradientStrategy(_IntervalStrategy):
+    """
+    Sample more densely where the signal changes quickly.
+
+    After an evenly spaced initial grid, the interval that is longest in
+    the (normalised) x-y plane is bisected next, so steep regions are
+    refined first.
+
+    Parameters
+    ----------
+    start, stop : float
+        range to sample
+    min_step : float
+        intervals narrower than twice this are not bisected
+    max_points : int, optional
+        stop after proposing this many positions
+    initial_points : int, optional
+        number of points in the initial, evenly spaced, grid; default 5
+    tolerance : float, optional
+        stop when no interval has a loss greater than this; default 0
+    """
+    def _losses(self, xs, ys):
+        return np.hypot(np.diff(xs), np.diff(ys))
+
+
+class CurvatureStrategy(_IntervalStrategy):
+    """
+    Sample more densely where the signal bends, e.g. near peaks and edges.
+
+    The loss of an interval is its length in the (normalised) x-y plane plus
+    a term for the area of the triangles it forms with its neighbours, so
+    curved regions are refined before merely steep ones.
+
+    Parameters
+    ----------
+    start, stop : float
+        range to sample
+    min_step : float
+        intervals narrower than twice this are not bisected
+    curvature_weight : float, optional
+        weight of the curvature term; default 1
+    **kwargs
+        ``max_points``, ``initial_points`` and ``tolerance``, as for
+        :class:`GradientStrategy`
+    """
+    def __init__(self, start, stop, min_step, *, curvature_weight=1,
+                 **kwargs):
+        super().__init__(start, stop, min_step, **kwargs)
+        self.curvature_weight = curvature_weight
+
+    def _losses(self, xs, ys):
+        length = np.hypot(np.diff(xs), np.diff(ys))
+        # Area of the triangle through each point and its two neighbours.
+        area = np.zeros(len(xs))
+        area[1:-1] = 0.5 * np.abs(
+            (xs[1:-1] - xs[:-2]) * (ys[2:] - ys[:-2]) -
+            (xs[2:] - xs[:-2]) * (ys[1:-1] - ys[:-2]))
+        curvature = np.sqrt(np.maximum(area[:-1], area[1:]))
+        return length + self.curvature_weight * curvature
+
+
+class UncertaintyStrategy(Strategy):
+    """
+    Measure where a Gaussian-process model of the signal is least certain.
+
+    The model uses a squared-exponential kernel. Pending positions are
+    treated as if they had been measured at the model's prediction, which
+    shrinks the uncertainty around them and spreads out batches.
+
+    Parameters
+    ----------
+    start, stop : float
+        range to sample
+    length_scale : float
+        correlation length of the signal, in units of position
+    max_points : int, optional
+        stop after proposing this many positions
+    tolerance : float, optional
+        stop when the largest predicted standard deviation, as a fraction of
+        the range of the measured values, is below this; default 0.05
+    noise : float, optional
+        relative measurement noise assumed by the model; default 1e-3
+    num_candidates : int, optional
+        number of evenly spaced candidate positions; default 200
+    """
+    def __init__(self, start, stop, length_scale, *, max_points=None,
+                 tolerance=0.05, noise=1e-3, num_candidates=200):
+        super().__init__()
+        self.start = start
+        self.stop = stop
+        self.length_scale = length_scale
+        self.max_points = max_points
+        self.tolerance = tolerance
+        self.noise = noise
+        self.candidates = np.linspace(start, stop, num_candidates)
+        self._proposed = 0
+
+    def _kernel(self, a, b):
+        d = (np.asarray(a)[:, None] - np.asarray(b)[None, :])
+        return np.exp(-0.5 * (d / self.length_scale) ** 2)
+
+    def _predict(self, xs, ys, at):
+        "Posterior mean and standard deviation of the normalised model."
+        K = self._kernel(xs, xs) + self.noise * np.eye(len(xs))
+        Ks = self._kernel(at, xs)
+        L = np.linalg.cholesky(K)
+        alpha = np.linalg.solve(L.T, np.linalg.solve(L, ys))
+        v = np.linalg.solve(L, Ks.T)
+        mean = Ks @ alpha
+        var = np.clip(1 - np.sum(v ** 2, axis=0), 0, None)
+        return mean, np.sqrt(var)
+
+    def _propose(self, n):
+        if self.max_points is not None:
+            n = min(n, self.max_points - self._proposed)
+        points = []
+        if not self.xs:
+            # Nothing to model yet: start at both ends.
+            points = [x for x in (self.start, self.stop)
+                      if x not in self.pending][:n]
+            self._proposed += len(points)
+            return points
+        ys = np.asarray(self.ys)
+        offset, scale = ys.mean(), (np.ptp(ys) or 1)
+        xs = list(self.xs)
+        ys = list((ys - offset) / scale)
+        for x in self.pending:
+            mean, _ = self._predict(xs, ys, [x])
+            xs.append(x)
+            ys.append(mean[0])
+        while len(points) < n:
+            mean, std = self._predict(xs, ys, self.candidates)
+            i = np.argmax(std)
+            if std[i] < self.tolerance:
+                break
+            x = self.candidates[i]
+            points.append(x)
+            xs.append(x)
+            ys.append(mean[i])
+        self._proposed += len(points)
+        return points
+
+    def __repr__(self):
+        return ('{}({!r}, {!r}, {!r}, max_points={!r}, tolerance={!r}, '
+                'noise={!r}, num_candidates={!r})'.format(
+                    type(self).__name__, self.start, self.stop,
+                    self.length_scale, self.max_points, self.tolerance,
+                    self.noise, len(self.candidates)))
@@ -1,5 +1,6 @@
 from collections import deque
 from itertools import count, tee
+import threading
 import time as ttime
 from event_model import DocumentNames
 from .utils import (
@@ -11,8 +12,52 @@ from .utils import (
 )
 
 
+class _MonitorBuffer:
+    """
+    A bounded buffer of updates from one monitored object.
+
+    Updates are pushed from the control system's callback thread and drained
+    on the RunEngine's event loop. When the buffer is full, the oldest update
+    is discarded and counted in ``overflows``. If ``min_interval`` is given,
+    updates arriving sooner than that many seconds after the last accepted
+    update are discarded and counted in ``skipped``.
+    """
+    def __init__(self, descriptor_uid, maxlen, min_interval=None):
+        self.descriptor_uid = descriptor_uid
+        self.seq_num_counter = count(1)
+        self.min_interval = min_interval
+        self.overflows = 0
+        self.reported_overflows = 0
+        self.skipped = 0
+        self._last_accepted = None
+        self._buffer = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def push(self, data, timestamps, time):
+        with self._lock:
+            if self.min_interval is not None:
+                if (self._last_accepted is not None and
+                        time - self._last_accepted < self.min_interval):
+                    self.skipped += 1
+                    return
+                self._last_accepted = time
+            if len(self._buffer) == self._buffer.maxlen:
+                self.overflows += 1
+            self._buffer.append((data, timestamps, time))
+
+    def drain(self):
+        with self._lock:
+            items = list(self._buffer)
+            self._buffer.clear()
+        return items
+
+
 class RunBundler:
-    def __init__(self, md, record_interruptions, emit, emit_sync, log, *, loop):
+    # Default maximum number of monitor updates held between drains.
+    monitor_buffer_size = 10000
+
+    def __init__(self, md, record_interruptions, emit, emit_sync, log, *, loop,
+                 time_source=ttime.time, uid_source=new_uid):
         # state stolen from the RE
         self.bundling = False  # if we are in the middle of bundling readings
         self._bundle_name = None  # name given to event descriptor
@@ -28,6 +73,9 @@ class RunBundler:
         self._sequence_counters = dict()  # a seq_num counter per stream
         self._teed_sequence_counters = dict()  # for if we redo data-points
         self._monitor_params = dict()  # cache of {obj: (cb, kwargs)}
+        self._monitor_buffers = dict()  # cache of {obj: _MonitorBuffer}
+        self._monitor_drain_pending = False  # a drain is scheduled on loop
+        self._monitor_lock = threading.Lock()
         self.run_is_open = False
         self._uncollected = set()  # objects after kickoff(), before collect()
         # we expect the RE to take care of the composition
@@ -41,24 +89,44 @@ class RunBundler:
         self.log = log
 
         self.loop = loop
+        # the clock for the 'time' of documents, shared with the RE
+        self.time_source = time_source
+        # the generator of document uids, shared with the RE
+        self.uid_source = uid_source
+
+    def caches(self):
+        "Return the caches of this run by name, for RunEngine.memory_report."
+        return {'describe_cache': self._describe_cache,
+                'config_desc_cache': self._config_desc_cache,
+                'config_values_cache': self._config_values_cache,
+                'config_ts_cache': self._config_ts_cache,
+                'descriptors': self._descriptors,
+                'sequence_counters': self._sequence_counters,
+                'teed_sequence_counters': self._teed_sequence_counters,
+                'objs_read': self._objs_read,
+                'read_cache': self._read_cache,
+                'asset_docs_cache': self._asset_docs_cache,
+                'monitor_params': self._monitor_params,
+                'monitor_buffers': self._monitor_buffers,
+                'uncollected': self._uncollected}
 
     async def open_run(self, msg):
         self.run_is_open = True
-        self._run_start_uid = new_uid()
+        self._run_start_uid = self.uid_source()
         self._interruptions_desc_uid = None  # uid for a special Event Desc.
         self._interruptions_counter = count(1)  # seq_num, special Event stream
 
-        doc = dict(uid=self._run_start_uid, time=ttime.time(), **self._md)
+        doc = dict(uid=self._run_start_uid, time=self.time_source(), **self._md)
         await self.emit(DocumentNames.start, doc)
         self.log.debug("Emitted RunStart (uid=%r)", doc["uid"])
         await self.reset_checkpoint_state_coro()
 
         # Emit an Event Descriptor for recording any interruptions as Events.
         if self.record_interruptions:
-            self._interruptions_desc_uid = new_uid()
+            self._interruptions_desc_uid = self.uid_source()
             dk = {"dtype": "string", "shape": [], "source": "RunEngine"}
             interruptions_desc = dict(
-                time=ttime.time(),
+                time=self.time_source(),
                 uid=self._interruptions_desc_uid,
                 name="interruptions",
                 data_keys={"interruption": dk},
@@ -81,6 +149,10 @@ class RunBundler:
         for obj, (cb, kwargs) in list(self._monitor_params.items()):
             obj.clear_sub(cb)
             del self._monitor_params[obj]
+        # Emit any monitor updates that arrived before the callbacks were
+        # cleared.
+        self.drain_monitors()
+        self._monitor_buffers.clear()
         # Count the number of Events in each stream.
         num_events = {}
         for bundle_name, counter in self._sequence_counters.items():
@@ -95,8 +167,8 @@ class RunBundler:
 
         doc = dict(
             run_start=self._run_start_uid,
-            time=ttime.time(),
-            uid=new_uid(),
+            time=self.time_source(),
+            uid=self.uid_source(),
             exit_status=exit_status,
             reason=reason,
             num_events=num_events,
@@ -190,12 +262,14 @@ class RunBundler:
             )
         kwargs = dict(msg.kwargs)
         name = kwargs.pop("name", short_uid("monitor"))
+        buffer_size = kwargs.pop("buffer_size", self.monitor_buffer_size)
+        min_interval = kwargs.pop("min_interval", None)
         if obj in self._monitor_params:
             raise IllegalMessageSequence(
                 "A 'monitor' message was sent for {}"
                 "which is already monitored".format(obj)
             )
-        descriptor_uid = new_uid()
+        descriptor_uid = self.uid_source()
         data_keys = obj.describe()
         config = {obj.name: {"data": {}, "timestamps": {}}}
         config[obj.name]["data_keys"] = obj.describe_configuration()
@@ -208,7 +282,7 @@ class RunBundler:
             hints.update({obj.name: obj.hints})
         desc_doc = dict(
             run_start=self._run_start_uid,
-            time=ttime.time(),
+            time=self.time_source(),
             data_keys=data_keys,
             uid=descriptor_uid,
             configuration=config,
@@ -222,26 +296,74 @@ class RunBundler:
             data_keys.keys(),
             descriptor_uid,
         )
-        seq_num_counter = count(1)
+        buffer = _MonitorBuffer(descriptor_uid, buffer_size, min_interval)
+        # If the object produces exactly one field, the value and timestamp
+        # delivered to the callback are the whole reading.
+        single_key = next(iter(data_keys)) if len(data_keys) == 1 else None
 
         def emit_event(*args, **kwargs):
-            # Ignore the inputs. Use this call as a signal to call read on the
-            # object, a crude way to be sure we get all the info we need.
-            data, timestamps = _rearrange_into_parallel_dicts(obj.read())
-            doc = dict(
-                descriptor=descriptor_uid,
-                time=ttime.time(),
-                data=data,
-                timestamps=timestamps,
-                seq_num=next(seq_num_counter),
-                uid=new_uid(),
-            )
-            self.emit_sync(DocumentNames.event, doc)
+            # This runs on whatever thread the control system uses for its
+            # callbacks. Do not build or dispatch documents here: stash the
+            # reading and let the RunEngine's loop drain it.
+            if single_key is not None and "value" in kwargs:
+                timestamp = kwargs.get("timestamp")
+                if timestamp is None:
+                    timestamp = self.time_source()
+                data = {single_key: kwargs["value"]}
+                timestamps = {single_key: timestamp}
+            else:
+                # Fall back to reading the object, a crude way to be sure we
+                # get all the info we need.
+                data, timestamps = _rearrange_into_parallel_dicts(obj.read())
+            buffer.push(data, timestamps, self.time_source())
+            self._schedule_monitor_drain()
 
         self._monitor_params[obj] = emit_event, kwargs
+        self._monitor_buffers[obj] = buffer
         await self.emit(DocumentNames.descriptor, desc_doc)
         obj.subscribe(emit_event, **kwargs)
 
+    def _schedule_monitor_drain(self):
+        # Coalesce wake-ups: at most one drain is pending on the loop at once.
+        with self._monitor_lock:
+            if self._monitor_drain_pending:
+                return
+            self._monitor_drain_pending = True
+        self.loop.call_soon_threadsafe(self.drain_monitors)
+
+    def drain_monitors(self):
+        """
+        Emit Events for all buffered monitor updates.
+
+        This must be called from the RunEngine's event loop.
+        """
+        with self._monitor_lock:
+            self._monitor_drain_pending = False
+        for obj, buffer in list(self._monitor_buffers.items()):
+            overflows = buffer.overflows
+            for data, timestamps, time in buffer.drain():
+                doc = dict(
+                    descriptor=buffer.descriptor_uid,
+                    time=time,
+                    data=data,
+                    timestamps=timestamps,
+                    seq_num=next(buffer.seq_num_counter),
+                    uid=self.uid_source(),
+                )
+                self.emit_sync(DocumentNames.event, doc)
+            if overflows != buffer.reported_overflows:
+                buffer.reported_overflows = overflows
+                self.log.warning(
+                    "The monitor buffer for %r overflowed; %d updates have "
+                    "been dropped so far.", obj, overflows
+                )
+
+    @property
+    def monitor_overflows(self):
+        "Number of monitor updates dropped because a buffer was full."
+        return {obj: buffer.overflows
+                for obj, buffer in self._monitor_buffers.items()}
+
     def record_interruption(self, content):
         """
         Emit an event in the 'interruptions' event stream.
@@ -253,11 +375,11 @@ class RunBundler:
             # We are inside a run and self.record_interruptions is True.
             doc = dict(
                 descriptor=self._interruptions_desc_uid,
-                time=ttime.time(),
-                uid=new_uid(),
+                time=self.time_source(),
+                uid=self.uid_source(),
                 seq_num=next(self._interruptions_counter),
                 data={"interruption": content},
-                timestamps={"interruption": ttime.time()},
+                timestamps={"interruption": self.time_source()},
             )
             self.emit_sync(DocumentNames.event, doc)
 
@@ -279,6 +401,8 @@ class RunBundler:
         cb, kwargs = self._monitor_params[obj]
         obj.clear_sub(cb)
         del self._monitor_params[obj]
+        self.drain_monitors()
+        del self._monitor_buffers[obj]
         await self.reset_checkpoint_state_coro()
 
     async def save(self, msg):
@@ -337,10 +461,10 @@ class RunBundler:
                 config[name]["data_keys"] = self._config_desc_cache[obj]
                 if hasattr(obj, "hints"):
                     hints[name] = obj.hints
-            descriptor_uid = new_uid()
+            descriptor_uid = self.uid_source()
             doc = dict(
                 run_start=self._run_start_uid,
-                time=ttime.time(),
+                time=self.time_source(),
                 data_keys=data_keys,
                 uid=descriptor_uid,
                 configuration=config,
@@ -369,7 +493,7 @@ class RunBundler:
 
         # Event documents
         seq_num = next(self._sequence_counters[seq_num_key])
-        event_uid = new_uid()
+        event_uid = self.uid_source()
         # Merge list of readings into single dict.
         readings = {k: v for d in self._read_cache for k, v in d.items()}
         for key in readings:
@@ -385,7 +509,7 @@ class RunBundler:
         }
         doc = dict(
             descriptor=descriptor_uid,
-            time=ttime.time(),
+            time=self.time_source(),
             data=data,
             timestamps=timestamps,
             seq_num=seq_num,
@@ -421,6 +545,7 @@ class RunBundler:
     async def suspend_monitors(self):
         for obj, (cb, kwargs) in self._monitor_params.items():
             obj.clear_sub(cb)
+        self.drain_monitors()
 
     async def restore_monitors(self):
         for obj, (cb, kwargs) in self._monitor_params.items():
@@ -485,14 +610,14 @@ class RunBundler:
             if desc_key not in self._descriptors:
                 objs_read = d_objs
                 # We don't not have an Event Descriptor for this set.
-                descriptor_uid = new_uid()
+                descriptor_uid = self.uid_source()
                 object_keys = {obj.name: list(data_keys)}
                 hints = {}
                 if hasattr(obj, "hints"):
                     hints.update({obj.name: obj.hints})
                 doc = dict(
                     run_start=self._run_start_uid,
-                    time=ttime.time(),
+                    time=self.time_source(),
                     data_keys=data_keys,
                     uid=descriptor_uid,
                     name=stream_name,
@@ -531,7 +656,7 @@ class RunBundler:
             stream_name, descriptor_uid = local_descriptors[objs_read]
             seq_num = next(self._sequence_counters[stream_name])
 
-            event_uid = new_uid()
+            event_uid = self.uid_source()
 
             reading = ev["data"]
             for key in ev["data"]:
@@ -1,12 +1,33 @@
+from .._lazy import lazy_attributes
+
 # declare module content to calm pyflakes about unused names
 __all__ = ["CallbackBase", "CallbackCounter", "print_metadata", "collector",
            "get_obj_fields", "CollectThenCompute", "LiveTable", "LiveFit",
            "LiveScatter", "LivePlot", "LiveGrid",
            "LiveFitPlot", "LiveRaster", "LiveMesh"]
 
-from .core import (CallbackBase, CallbackCounter, print_metadata, collector,
-                   get_obj_fields, CollectThenCompute, LiveTable)
-from .fitting import LiveFit
+# The submodules defining the names above. They are imported on first access
+# (PEP 562), so that importing a submodule like bluesky.callbacks.zmq does not
+# import all the others.
+_lazy_attrs = {
+    'CallbackBase': 'core',
+    'CallbackCounter': 'core',
+    'print_metadata': 'core',
+    'collector': 'core',
+    'get_obj_fields': 'core',
+    'CollectThenCompute': 'core',
+    'LiveTable': 'core',
+    'LiveFit': 'fitting',
+    'LiveScatter': 'mpl_plotting',
+    'LivePlot': 'mpl_plotting',
+    'LiveGrid': 'mpl_plotting',
+    'LiveFitPlot': 'mpl_plotting',
+    'LiveRaster': 'mpl_plotting',
+    'LiveMesh': 'mpl_plotting',
+}
+
 
-from .mpl_plotting import (LiveScatter, LivePlot, LiveGrid,
-                           LiveFitPlot, LiveRaster, LiveMesh)
+__getattr__, __dir__ = lazy_attributes(
+    __name__, _lazy_attrs,
+    # imported along with bluesky.callbacks before its names were made lazy
+    submodules=['core', 'fitting', 'mpl_plotting'])
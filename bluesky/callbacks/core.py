@@ -230,6 +230,22 @@ class LiveTable(CallbackBase):
 
     out : callable, optional
         Function to call to 'print' a line.  Defaults to `print`
+
+    buffer_size : int, optional
+        If given, collect up to this many lines and pass them to ``out`` as
+        one newline-joined string instead of calling ``out`` once per line.
+
+    flush_interval : float, optional
+        If given, buffer lines and flush them at most every this many seconds.
+        There is no timer: the interval is checked when a row arrives, so
+        buffered rows are not shown during a long gap between Events (e.g.
+        a slow move or a pause) until the next row, the end of the run, or a
+        call to :meth:`flush`. May be combined with ``buffer_size``.
+
+    print_every : int, optional
+        Only print every Nth row, starting with the first. The last row of the
+        run is always printed, followed by a summary of how many rows were
+        shown. Defaults to 1 (print every row).
     '''
     _FMTLOOKUP = {'s': '{pad}{{{k}: >{width}.{prec}{dtype}}}{pad}',
                   'f': '{pad}{{{k}: >{width}.{prec}{dtype}}}{pad}',
@@ -243,11 +259,13 @@ class LiveTable(CallbackBase):
     water_mark = ("{st[plan_type]} {st[plan_name]} ['{st[uid]:.8s}'] "
                   "(scan num: {st[scan_id]})")
     ev_time_key = 'SUPERLONG_EV_TIMEKEY_THAT_I_REALLY_HOPE_NEVER_CLASHES'
+    summary = '{shown} of {total} rows shown (print_every={print_every})'
 
     def __init__(self, fields, *, stream_name='primary',
                  print_header_interval=50,
                  min_width=12, default_prec=3, extra_pad=1,
-                 logbook=None, out=print):
+                 logbook=None, out=print,
+                 buffer_size=None, flush_interval=None, print_every=1):
         super().__init__()
         self._header_interval = print_header_interval
         # expand objects
@@ -268,6 +286,15 @@ class LiveTable(CallbackBase):
         self.logbook = logbook
         self._sep_format = None
         self._out = out
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._buffered = buffer_size is not None or flush_interval is not None
+        self._buffer = []
+        self._last_flush = ttime.monotonic()
+        if print_every < 1:
+            raise ValueError("print_every must be a positive integer")
+        self._print_every = print_every
+        self._skipped = None
 
     def descriptor(self, doc):
 
@@ -321,14 +348,30 @@ class LiveTable(CallbackBase):
                         self._main_fmnt.format(*headings) +
                         '|'
                         )
+
+        def col_format(k, f):
+            return self._FMTLOOKUP[f.dtype].format(
+                k=k, width=f.width-2*self._pad_len, prec=f.prec,
+                dtype=f.dtype, pad=self._extra_pad)
+
         self._data_formats = OrderedDict(
-            (k, self._FMTLOOKUP[f.dtype].format(k=k,
-                                                width=f.width-2*self._pad_len,
-                                                prec=f.prec, dtype=f.dtype,
-                                                pad=self._extra_pad))
-            for k, f in self._format_info.items())
+            (k, col_format(k, f)) for k, f in self._format_info.items())
+        # Precompile the formatting so that each Event costs one call to
+        # str.format. Fields are positional because data keys are not
+        # necessarily valid format field names.
+        self._data_keys = [k for k in self._format_info
+                           if k not in ('seq_num', self.ev_time_key)]
+        self._col_formatters = [col_format(0, f).format
+                                for f in self._format_info.values()]
+        self._row_formatter = ('|' + '|'.join(
+            col_format(i, f)
+            for i, f in enumerate(self._format_info.values())) + '|').format
+        self._placeholders = [' ' * f.width
+                              for f in self._format_info.values()]
 
         self._count = 0
+        self._printed = 0
+        self._skipped = None
 
         self._print(self._sep_format)
         self._print(self._header)
@@ -337,27 +380,15 @@ class LiveTable(CallbackBase):
 
     def event(self, doc):
         try:
-            # shallow copy so we can mutate
             if ensure_uid(doc['descriptor']) not in self._descriptors:
                 return
-            data = dict(doc['data'])
             self._count += 1
-            if not self._count % self._header_interval:
-                self._print(self._sep_format)
-                self._print(self._header)
-                self._print(self._sep_format)
-            fmt_time = str(datetime.fromtimestamp(doc['time']).time())
-            data[self.ev_time_key] = fmt_time
-            data['seq_num'] = doc['seq_num']
-            cols = [f.format(**{k: data[k]})
-                    # Show data[k] if k exists in this Event and is 'filled'.
-                    # (The latter is only applicable if the data is
-                    # externally-stored -- hence the fallback to `True`.)
-                    if ((k in data) and doc.get('filled', {}).get(k, True))
-                    # Otherwise use a placeholder of whitespace.
-                    else ' ' * self._format_info[k].width
-                    for k, f in self._data_formats.items()]
-            self._print('|' + '|'.join(cols) + '|')
+            if (self._count - 1) % self._print_every:
+                # Rate-limited: hold on to this row in case it is the last.
+                self._skipped = doc
+                return
+            self._skipped = None
+            self._print_row(doc)
         except Exception as ex:
             if self.log is not None:
                 self.log.exception(ex)
@@ -368,6 +399,39 @@ class LiveTable(CallbackBase):
                 raise ex
         super().event(doc)
 
+    def _print_row(self, doc):
+        self._printed += 1
+        if not self._printed % self._header_interval:
+            self._print(self._sep_format)
+            self._print(self._header)
+            self._print(self._sep_format)
+        self._print(self._format_row(doc))
+
+    def _format_row(self, doc):
+        data = doc['data']
+        fmt_time = str(datetime.fromtimestamp(doc['time']).time())
+        filled = doc.get('filled')
+        if not filled or all(filled.get(k, True) for k in self._data_keys):
+            try:
+                values = [data[k] for k in self._data_keys]
+            except KeyError:
+                pass
+            else:
+                # Fast path: every column is present.
+                return self._row_formatter(doc['seq_num'], fmt_time, *values)
+        # Show data[k] if k exists in this Event and is 'filled'.
+        # (The latter is only applicable if the data is
+        # externally-stored -- hence the fallback to `True`.)
+        # Otherwise use a placeholder of whitespace.
+        filled = filled or {}
+        cols = [self._col_formatters[0](doc['seq_num']),
+                self._col_formatters[1](fmt_time)]
+        cols.extend(f(data[k]) if (k in data) and filled.get(k, True) else pl
+                    for k, f, pl in zip(self._data_keys,
+                                        self._col_formatters[2:],
+                                        self._placeholders[2:]))
+        return '|' + '|'.join(cols) + '|'
+
     def stop(self, doc):
         if ensure_uid(doc['run_start']) != self._start['uid']:
             return
@@ -382,11 +446,20 @@ class LiveTable(CallbackBase):
         # Out[2]: |         5 | 22:08:56.8 |      0.000 |
         ttime.sleep(0.1)
 
+        if self._skipped is not None:
+            # Always show the final row of a rate-limited table.
+            self._print_row(self._skipped)
+            self._skipped = None
         if self._sep_format is not None:
             self._print(self._sep_format)
+            if self._print_every > 1:
+                self._print(self.summary.format(shown=self._printed,
+                                                total=self._count,
+                                                print_every=self._print_every))
         self._stop = doc
 
         wm = self.water_mark.format(st=self._start)
+        self.flush()
         self._out(wm)
         if self.logbook:
             self.logbook('\n'.join([wm] + self._rows))
@@ -401,4 +474,19 @@ class LiveTable(CallbackBase):
 
     def _print(self, out_str):
         self._rows.append(out_str)
-        self._out(out_str)
+        if not self._buffered:
+            self._out(out_str)
+            return
+        self._buffer.append(out_str)
+        if ((self._buffer_size is not None and
+                len(self._buffer) >= self._buffer_size) or
+                (self._flush_interval is not None and
+                 ttime.monotonic() - self._last_flush >= self._flush_interval)):
+            self.flush()
+
+    def flush(self):
+        "Pass any buffered lines to ``out``."
+        self._last_flush = ttime.monotonic()
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            self._out('\n'.join(lines))
@@ -1,3 +1,4 @@
+import threading
 import warnings
 from cycler import cycler
 import numpy as np
@@ -23,17 +24,32 @@ class LiveFit(CallbackBase):
     update_every : int or None, optional
         How often to recompute the fit. If `None`, do not compute until the
         end. Default is 1 (recompute after each new point).
+    warm_start : bool, optional
+        If True, start each refit from the best-fit parameters of the
+        previous fit instead of from ``init_guess``. The first fit of each
+        run always starts from ``init_guess``. Default is False.
+    background : bool, optional
+        If True, run intermediate fits on a worker thread so that they do not
+        block the caller. While a fit is still running, requests for a refit
+        are skipped; the data is kept and picked up by the next fit. The
+        final fit at the end of the run is always computed synchronously.
+        Default is False.
 
     Attributes
     ----------
     result : lmfit.ModelResult
+        The most recent completed fit. When ``background=True`` this is
+        replaced atomically when a fit finishes.
     """
     def __init__(self, model, y, independent_vars, init_guess=None, *,
-                 update_every=1):
+                 update_every=1, warm_start=False, background=False):
         self.ydata = []
         self.independent_vars_data = {}
         self.__stale = False
+        self.__fit_thread = None
         self.result = None
+        self.warm_start = warm_start
+        self.background = background
         self._model = model
         self.y = y
         self.independent_vars = independent_vars
@@ -64,6 +80,8 @@ class LiveFit(CallbackBase):
         self._reset()
 
     def _reset(self):
+        # Do not let a fit from a previous run publish into this one.
+        self.wait()
         self.result = None
         self.__stale = False
         self.ydata.clear()
@@ -96,9 +114,11 @@ class LiveFit(CallbackBase):
         super().event(doc)
 
     def stop(self, doc):
-        # Update the fit if it was not updated by the last event.
+        # Let any background fit finish, then update the fit if it was not
+        # updated by the last event.
+        self.wait()
         if self.__stale:
-            self.update_fit()
+            self.update_fit(background=False)
         super().stop(doc)
 
     def update_caches(self, y, independent_vars):
@@ -106,17 +126,60 @@ class LiveFit(CallbackBase):
         for k, v in self.independent_vars_data.items():
             v.append(independent_vars[k])
 
-    def update_fit(self):
+    def update_fit(self, background=None):
+        """
+        Recompute the fit from all the data accumulated so far.
+
+        Parameters
+        ----------
+        background : bool, optional
+            Run the fit on a worker thread. If None (default) use the value
+            given at initialization. If a background fit is already running,
+            this is a no-op and the fit stays stale.
+        """
+        if background is None:
+            background = self.background
         N = len(self.model.param_names)
         if len(self.ydata) < N:
             warnings.warn("LiveFitPlot cannot update fit until there are at least {} "
                           "data points".format(N))
+            return
+        if self.fitting:
+            # A fit is still running; skip this one. The data stays cached and
+            # the fit stays stale, so the next update picks it up.
+            return
+        # Snapshot the data so that the fit sees a consistent set of points
+        # even if more Events arrive while it is running.
+        ydata = list(self.ydata)
+        kwargs = {k: list(v) for k, v in self.independent_vars_data.items()}
+        if self.warm_start and self.result is not None:
+            kwargs['params'] = self.result.params.copy()
         else:
-            kwargs = {}
-            kwargs.update(self.independent_vars_data)
             kwargs.update(self.init_guess)
-            self.result = self.model.fit(self.ydata, **kwargs)
-            self.__stale = False
+        self.__stale = False
+        if background:
+            self.__fit_thread = threading.Thread(target=self._fit,
+                                                 args=(ydata, kwargs),
+                                                 daemon=True)
+            self.__fit_thread.start()
+        else:
+            self._fit(ydata, kwargs)
+
+    def _fit(self, ydata, kwargs):
+        # Assigning the attribute in one step publishes the result atomically.
+        self.result = self.model.fit(ydata, **kwargs)
+
+    @property
+    def fitting(self):
+        "True if a background fit is in progress."
+        thread = self.__fit_thread
+        return thread is not None and thread.is_alive()
+
+    def wait(self, timeout=None):
+        "Block until any background fit in progress has completed."
+        thread = self.__fit_thread
+        if thread is not None:
+            thread.join(timeout)
 
 
 # This function is vendored from scipy v0.16.1 to avoid adding a scipy
@@ -1,16 +1,13 @@
-import functools
-import operator
 import collections
 
 import numpy as np
-from cycler import cycler
 try:
     # cytools is a drop-in replacement for toolz, implemented in Cython
     from cytools import partition
 except ImportError:
     from toolz import partition
 
-from .utils import snake_cyclers
+from .utils import ArrayCycler
 
 
 def spiral(x_motor, y_motor, x_start, y_start, x_range, y_range, dr, nth, *,
@@ -49,7 +46,7 @@ def spiral(x_motor, y_motor, x_start, y_start, x_range, y_range, dr, nth, *,
         dr_aspect = 1
     else:
         dr_aspect = dr_y / dr
-   
+
     half_x = x_range / 2
     half_y = y_range / (2 * dr_aspect)
 
@@ -57,24 +54,22 @@ def spiral(x_motor, y_motor, x_start, y_start, x_range, y_range, dr, nth, *,
     num_ring = 1 + int(r_max / dr)
     tilt_tan = np.tan(tilt + np.pi / 2.)
 
-    x_points, y_points = [], []
-
-    for i_ring in range(1, num_ring + 2):
-        radius = i_ring * dr
-        angle_step = 2. * np.pi / (i_ring * nth)
+    # Ring i has int(i * nth) equally-spaced angles. Lay out every candidate
+    # point, ring by ring, then keep those inside the (tilted) rectangle.
+    i_rings = np.arange(1, num_ring + 2)
+    num_angles = np.array([int(i_ring * nth) for i_ring in i_rings])
+    ring = np.repeat(i_rings, num_angles)
+    i_angle = (np.arange(num_angles.sum()) -
+               np.repeat(np.cumsum(num_angles) - num_angles, num_angles))
+    radius = ring * dr
+    angle = i_angle * (2. * np.pi / (ring * nth))
+    x = radius * np.cos(angle)
+    y = radius * np.sin(angle) * dr_aspect
+    mask = ((np.abs(x - (y / dr_aspect) / tilt_tan) <= half_x) &
+            (np.abs(y / dr_aspect) <= half_y))
 
-        for i_angle in range(int(i_ring * nth)):
-            angle = i_angle * angle_step
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle) * dr_aspect
-            if ((abs(x - (y / dr_aspect) / tilt_tan) <= half_x) and 
-                    (abs(y / dr_aspect) <= half_y)):
-                x_points.append(x_start + x)
-                y_points.append(y_start + y)
-
-    cyc = cycler(x_motor, x_points)
-    cyc += cycler(y_motor, y_points)
-    return cyc
+    return ArrayCycler({x_motor: x_start + x[mask],
+                        y_motor: y_start + y[mask]})
 
 
 def spiral_square_pattern(x_motor, y_motor, x_center, y_center,
@@ -104,8 +99,6 @@ def spiral_square_pattern(x_motor, y_motor, x_center, y_center,
     -------
     cyc : cycler
     '''
-    x_points, y_points = [], []
-
     # checks if x_num/y_num is even or odd and sets the required offset
     # parameter for the start point from the centre point.
     if x_num % 2 == 0:
@@ -122,92 +115,43 @@ def spiral_square_pattern(x_motor, y_motor, x_center, y_center,
     x_delta = x_range / (x_num - 1)
     y_delta = y_range / (y_num - 1)
 
-    # include the first point, as it is the first 'ring' to include.
-    x_points.append(x_center - x_delta * x_offset)
-    y_points.append(y_center - y_delta * y_offset)
-
-    # set the number of found points to 0
-    num_pnts_fnd = 1
-
-    # step through each of the rings required to map out the entire area.
-    for i_ring in range(2, num_ring+1, 1):
-        # step through each of the 'sides' of the ring if the constant value
-        # for each side is within the range to plot and
-        # that we have not already found all the required points.
-        # SIDE 1
-        if (abs(i_ring - 1 - x_offset) <= x_num / 2) and \
-           (num_pnts_fnd < x_num * y_num):
-            for n in range(i_ring-2, -i_ring, -1):
-                # Ensure that the variable value for this side is within the
-                # range to plot and that we have not already
-                # found all the required points.
-                if (abs(n - y_offset) < y_num / 2) and \
-                   (num_pnts_fnd < y_num * x_num):
-
-                    x = x_center - x_delta * x_offset + x_delta * (i_ring - 1)
-                    y = y_center - y_delta * y_offset + y_delta * n
-                    num_pnts_fnd += 1
-
-                    x_points.append(x)
-                    y_points.append(y)
-
-        # SIDE 2
-        if (abs(-i_ring + 1 - y_offset) < y_num / 2) and \
-           (num_pnts_fnd < x_num * y_num):
-            for n in range(i_ring - 2, -i_ring, -1):
-                # Ensure that the variable value for this side is within the
-                # range to plot and that we have not already
-                # found all the required points.
-                if (abs(n - x_offset) < x_num / 2) and \
-                   (num_pnts_fnd < y_num * x_num):
-
-                    x = x_center - x_delta * x_offset + x_delta * n
-                    y = y_center - y_delta * y_offset + y_delta * (-i_ring + 1)
-
-                    num_pnts_fnd += 1
-
-                    x_points.append(x)
-                    y_points.append(y)
-
-        # SIDE 3
-        if (abs(-i_ring + 1 - x_offset) < x_num / 2) and \
-           (num_pnts_fnd < x_num * y_num):
-            for n in range(-i_ring + 2, i_ring, 1):
-                # Ensure that the variable value for this side is within the
-                # range to plot and that we have not already
-                # found all the required points.
-                if (abs(n - y_offset) < y_num / 2) and \
-                   (num_pnts_fnd < y_num * x_num):
-
-                    x = x_center - x_delta * x_offset + x_delta * (-i_ring + 1)
-                    y = y_center - y_delta * y_offset + y_delta * n
-                    num_pnts_fnd += 1
-
-                    x_points.append(x)
-                    y_points.append(y)
-
-        # SIDE 4
-        if (abs(i_ring - 1 - y_offset) < y_num / 2) and \
-           (num_pnts_fnd < x_num * y_num):
-            for n in range(-i_ring + 2, i_ring, 1):
-                # Ensure that the variable value for this side is within the
-                # range to plot and that we have not already
-                # found all the required points.
-                if (abs(n - x_offset) < x_num / 2) and \
-                   (num_pnts_fnd < y_num * x_num):
-
-                    x = x_center - x_delta * x_offset + x_delta * n
-                    y = y_center - y_delta * y_offset + y_delta * (i_ring - 1)
-
-                    num_pnts_fnd += 1
-
-                    x_points.append(x)
-                    y_points.append(y)
-
-    cyc = cycler(x_motor, x_points)
-    cyc += cycler(y_motor, y_points)
-
-    return cyc
+    # Work in integer grid steps (i, j) from the first point. The first
+    # point is the first 'ring'. Each further ring k walks four sides:
+    #   1: i = k,  j = k-1 ... -k     2: j = -k, i = k-1 ... -k
+    #   3: i = -k, j = -k+1 ... k     4: j = k,  i = -k+1 ... k
+    # A side is walked only if its constant coordinate is within range, and
+    # only the points whose varying coordinate is within range are kept.
+    i_steps = [np.zeros(1)]
+    j_steps = [np.zeros(1)]
+    for k in range(1, num_ring):
+        down = np.arange(k - 1, -k - 1, -1)
+        up = np.arange(-k + 1, k + 1)
+        # (side is in range, i, j, point is in range)
+        sides = ((abs(k - x_offset) <= x_num / 2,
+                  np.full_like(down, k), down,
+                  np.abs(down - y_offset) < y_num / 2),
+                 (abs(-k - y_offset) < y_num / 2,
+                  down, np.full_like(down, -k),
+                  np.abs(down - x_offset) < x_num / 2),
+                 (abs(-k - x_offset) < x_num / 2,
+                  np.full_like(up, -k), up,
+                  np.abs(up - y_offset) < y_num / 2),
+                 (abs(k - y_offset) < y_num / 2,
+                  up, np.full_like(up, k),
+                  np.abs(up - x_offset) < x_num / 2))
+        for walk, i, j, keep in sides:
+            if walk:
+                i_steps.append(i[keep])
+                j_steps.append(j[keep])
+
+    # Stop once all the required points have been found.
+    num_points = x_num * y_num
+    i = np.concatenate(i_steps)[:num_points]
+    j = np.concatenate(j_steps)[:num_points]
+
+    x_points = x_center - x_delta * x_offset + x_delta * i
+    y_points = y_center - y_delta * y_offset + y_delta * j
+    return ArrayCycler({x_motor: x_points, y_motor: y_points})
 
 
 def spiral_fermat(x_motor, y_motor, x_start, y_start, x_range, y_range, dr,
@@ -245,30 +189,25 @@ def spiral_fermat(x_motor, y_motor, x_start, y_start, x_range, y_range, dr,
         dr_aspect = 1
     else:
         dr_aspect = dr_y / dr
-    
+
     phi = 137.508 * np.pi / 180.
 
     half_x = x_range / 2
     half_y = y_range / (2 * dr_aspect)
     tilt_tan = np.tan(tilt + np.pi / 2.)
 
-    x_points, y_points = [], []
-
     diag = np.sqrt(half_x ** 2 + half_y ** 2)
     num_rings = int((1.5 * diag / (dr / factor)) ** 2)
-    for i_ring in range(1, num_rings):
-        radius = np.sqrt(i_ring) * dr / factor
-        angle = phi * i_ring
-        x = radius * np.cos(angle)
-        y = radius * np.sin(angle) * dr_aspect
-
-        if ((abs(x - (y / dr_aspect) / tilt_tan) <= half_x) and (abs(y) <= half_y)):
-            x_points.append(x_start + x)
-            y_points.append(y_start + y)
+    i_ring = np.arange(1, max(num_rings, 1))
+    radius = np.sqrt(i_ring) * dr / factor
+    angle = phi * i_ring
+    x = radius * np.cos(angle)
+    y = radius * np.sin(angle) * dr_aspect
+    mask = ((np.abs(x - (y / dr_aspect) / tilt_tan) <= half_x) &
+            (np.abs(y) <= half_y))
 
-    cyc = cycler(x_motor, x_points)
-    cyc += cycler(y_motor, y_points)
-    return cyc
+    return ArrayCycler({x_motor: x_start + x[mask],
+                        y_motor: y_start + y[mask]})
 
 
 def inner_list_product(args):
@@ -291,11 +230,7 @@ def inner_list_product(args):
         raise ValueError("Wrong number of positional arguments for "
                          "'inner_list_product'")
 
-    cyclers = []
-    for motor, pos_list, in partition(2, args):
-        c = cycler(motor, pos_list)
-        cyclers.append(c)
-    return functools.reduce(operator.add, cyclers)
+    return ArrayCycler(dict(partition(2, args)))
 
 
 def outer_list_product(args, snake_axes):
@@ -329,7 +264,7 @@ def outer_list_product(args, snake_axes):
     cyc : cycler
     '''
     snaking = []
-    cyclers = []
+    axes = []
     for motor, pos_list in partition(2, args):
         if not snake_axes:
             snaking.append(False)
@@ -349,10 +284,9 @@ def outer_list_product(args, snake_axes):
                              '"True" (snake all axes) or a list of axes to '
                              'snake. Instead it is {}.'.format(snake_axes))
 
-        c = cycler(motor, pos_list)
-        cyclers.append(c)
+        axes.append({motor: pos_list})
 
-    return snake_cyclers(cyclers, snaking)
+    return ArrayCycler.from_axes(axes, snaking)
 
 
 def inner_product(num, args):
@@ -374,12 +308,8 @@ def inner_product(num, args):
         raise ValueError("Wrong number of positional arguments for "
                          "'inner_product'")
 
-    cyclers = []
-    for motor, start, stop, in partition(3, args):
-        steps = np.linspace(start, stop, num=num, endpoint=True)
-        c = cycler(motor, steps)
-        cyclers.append(c)
-    return functools.reduce(operator.add, cyclers)
+    return ArrayCycler({motor: np.linspace(start, stop, num=num, endpoint=True)
+                        for motor, start, stop, in partition(3, args)})
 
 
 def chunk_outer_product_args(args):
@@ -441,16 +371,10 @@ def outer_product(args):
     -------
     cyc : cycler
     '''
-    shape = []
-    extents = []
     snaking = []
-    cyclers = []
+    axes = []
     for motor, start, stop, num, snake in chunk_outer_product_args(args):
-        shape.append(num)
-        extents.append([start, stop])
         snaking.append(snake)
-        steps = np.linspace(start, stop, num=num, endpoint=True)
-        c = cycler(motor, steps)
-        cyclers.append(c)
+        axes.append({motor: np.linspace(start, stop, num=num, endpoint=True)})
 
-    return snake_cyclers(cyclers, snaking)
+    return ArrayCycler.from_axes(axes, snaking)
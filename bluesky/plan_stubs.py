@@ -101,6 +101,12 @@ def monitor(obj, *, name=None, **kwargs):
         passed through to ``obj.subscribe()``
     name : string, optional
         name of event stream; default is None
+    buffer_size : int, optional
+        maximum number of updates buffered between Events being emitted;
+        if exceeded, the oldest updates are dropped. Default is 10000.
+    min_interval : float, optional
+        ignore updates that arrive less than this many seconds after the
+        last accepted update. Default is None (accept every update).
     kwargs :
         passed through to ``obj.subscribe()``
 
@@ -952,6 +958,72 @@ def one_nd_step(detectors, step, pos_cache):
     yield from trigger_and_read(list(detectors) + list(motors))
 
 
+def one_nd_step_pipelined(detectors, step, pos_cache, next_step):
+    """
+    Inner loop of an N-dimensional step scan that overlaps motion and readout
+
+    Pass this as ``per_step`` to :func:`bluesky.plans.scan_nd` (or any plan
+    built on it). Like :func:`one_nd_step`, it moves to ``step`` and
+    triggers the detectors. Once their trigger statuses report that
+    acquisition is done, it reads the motors, starts the move to
+    ``next_step`` and only then reads the detectors. The motors travel
+    while the detectors are read out and the Event is emitted.
+
+    This is only correct for detectors whose readings no longer change once
+    their trigger status is done.
+
+    Parameters
+    ----------
+    detectors : iterable
+        devices to read
+    step : dict
+        mapping motors to positions in this step
+    pos_cache : dict
+        mapping motors to their last-set positions
+    next_step : dict or None
+        mapping motors to positions in the following step, or None if this
+        is the last step
+    """
+    yield from move_per_step(step, pos_cache)
+    devices = separate_devices(list(detectors) + list(step))
+    motors = [obj for obj in devices if obj in step]
+    detectors = [obj for obj in devices if obj not in step]
+    rewindable = all_safe_rewind(devices)
+
+    def inner_step():
+        grp = _short_uid('trigger')
+        no_wait = True
+        for obj in devices:
+            if hasattr(obj, 'trigger'):
+                no_wait = False
+                yield from trigger(obj, group=grp)
+        if not no_wait:
+            yield from wait(group=grp)
+        yield from create('primary')
+        ret = {}
+        # Read the motors before they start moving to the next point.
+        for obj in motors:
+            reading = (yield from read(obj))
+            if reading is not None:
+                ret.update(reading)
+        move_grp = _short_uid('set')
+        if next_step is not None:
+            for motor, pos in next_step.items():
+                if pos == pos_cache[motor]:
+                    continue
+                yield Msg('set', motor, pos, group=move_grp)
+                pos_cache[motor] = pos
+        for obj in detectors:
+            reading = (yield from read(obj))
+            if reading is not None:
+                ret.update(reading)
+        yield from save()
+        yield Msg('wait', None, group=move_grp)
+        return ret
+    from .preprocessors import rewindable_wrapper
+    return (yield from rewindable_wrapper(inner_step(), rewindable))
+
+
 def repeat(plan, num=1, delay=None):
     """
     Repeat a plan num times with delay and checkpoint between each repeat.
@@ -3,7 +3,7 @@ import inspect
 from itertools import chain
 from functools import partial
 
-from collections import defaultdict
+from collections import defaultdict, deque
 import time
 
 import numpy as np
@@ -666,6 +666,97 @@ def adaptive_scan(detectors, target_field, motor, start, stop,
     return (yield from adaptive_core())
 
 
+def adaptive_strategy_scan(detectors, target_field, motor, strategy, *,
+                           lookahead=1, md=None):
+    """
+    Scan over one variable, letting a strategy choose where to measure.
+
+    The strategy is asked for positions and told the value of
+    ``target_field`` measured at each one, until it has nothing more to
+    propose. See :mod:`bluesky.adaptive` for the protocol and some
+    ready-made strategies.
+
+    While the motor moves to a position, the strategy is told about the
+    previous measurement and, if needed, asked for the next batch, so its
+    computation overlaps with the motion.
+
+    Parameters
+    ----------
+    detectors : list
+        list of 'readable' objects
+    target_field : string
+        data field whose values are passed to the strategy
+    motor : object
+        any 'settable' object (motor, temp controller, etc.)
+    strategy : object
+        has ``ask(n)`` and ``tell(x, y)`` methods, such as
+        :class:`bluesky.adaptive.GradientStrategy`,
+        :class:`bluesky.adaptive.CurvatureStrategy`,
+        :class:`bluesky.adaptive.UncertaintyStrategy` or
+        :class:`bluesky.adaptive.CallableStrategy`
+    lookahead : int, optional
+        number of positions to ask for at a time. Larger batches need fewer
+        calls to the strategy, but each batch is chosen without knowing the
+        results of the measurements still pending. Default is 1.
+    md : dict, optional
+        metadata
+
+    See Also
+    --------
+    :func:`bluesky.plans.adaptive_scan`
+    """
+    if lookahead < 1:
+        raise ValueError("lookahead must be at least 1")
+    _md = {'detectors': [det.name for det in detectors],
+           'motors': [motor.name],
+           'plan_args': {'detectors': list(map(repr, detectors)),
+                         'target_field': target_field,
+                         'motor': repr(motor),
+                         'strategy': repr(strategy),
+                         'lookahead': lookahead},
+           'plan_name': 'adaptive_strategy_scan',
+           'hints': {},
+           }
+    _md.update(md or {})
+    try:
+        dimensions = [(motor.hints['fields'], 'primary')]
+    except (AttributeError, KeyError):
+        pass
+    else:
+        _md['hints'].setdefault('dimensions', dimensions)
+
+    @bpp.stage_decorator(list(detectors) + [motor])
+    @bpp.run_decorator(md=_md)
+    def adaptive_core():
+        batch = deque(strategy.ask(lookahead))
+        last = None  # the measurement the strategy has not been told yet
+        while batch:
+            pos = batch.popleft()
+            yield Msg('checkpoint')
+            grp = utils.short_uid('set')
+            yield Msg('set', motor, pos, group=grp)
+            # Let the strategy compute while the motor is moving.
+            if last is not None:
+                strategy.tell(*last)
+                last = None
+            if not batch:
+                batch.extend(strategy.ask(lookahead))
+            yield Msg('wait', None, group=grp)
+            ret = yield from bps.trigger_and_read(list(detectors) + [motor])
+            if ret is None:
+                # in simulation, there is no data
+                continue
+            last = (pos, ret[target_field]['value'])
+            if not batch:
+                # Nothing was proposed while this position was pending;
+                # give the strategy the result and ask again.
+                strategy.tell(*last)
+                last = None
+                batch.extend(strategy.ask(lookahead))
+
+    return (yield from adaptive_core())
+
+
 def rel_adaptive_scan(detectors, target_field, motor, start, stop,
                       min_step, max_step, target_delta, backstep,
                       threshold=0.8, *, md=None):
@@ -859,6 +950,354 @@ def tune_centroid(
     return (yield from _tune_core(start, stop, num, signal))
 
 
+def tune_peak(detectors, signal, motor, start, stop, tolerance, *,
+              max_evaluations=50, parabolic=True, maximize=True, md=None):
+    r"""
+    plan: tune a motor to the peak of signal(motor) with few measurements
+
+    Brent's method is used: the bracket from ``start`` to ``stop`` is
+    shrunk by golden-section steps, and by steps to the vertex of a
+    parabola through the three best points whenever that is well-behaved.
+    The search stops once the position of the peak is known to within
+    ``tolerance``. Compared with :func:`tune_centroid`, which rescans
+    ``num`` points per pass, this usually needs several times fewer moves
+    for the same precision. At the end, the motor is moved to the best
+    position found.
+
+    Note:  the signal must have a single peak between ``start`` and
+    ``stop``.
+
+    Parameters
+    ----------
+    detectors : Signal
+        list of 'readable' objects
+    signal : string
+        detector field whose output is to maximize
+    motor : object
+        any 'settable' object (motor, temp controller, etc.)
+    start : float
+        start of range
+    stop : float
+        end of range
+    tolerance : float
+        required precision of the position of the peak
+    max_evaluations : int, optional
+        give up after this many measurements, default = 50
+    parabolic : bool, optional
+        if False, take only golden-section steps; this is slower but does
+        not assume that the peak is smooth. Default is True.
+    maximize : bool, optional
+        if False, find the minimum of the signal instead; default is True
+    md : dict, optional
+        metadata
+
+    Returns
+    -------
+    result : dict
+        ``position`` and ``value`` of the best point measured,
+        ``uncertainty`` of the position (the half-width of the final
+        bracket) and ``num_evaluations``. None if run in simulation (no
+        readings).
+
+    Examples
+    --------
+    Find the center of a peak using synthetic hardware.
+
+    >>> from ophyd.sim import SynAxis, SynGauss
+    >>> motor = SynAxis(name='motor')
+    >>> det = SynGauss('det', motor, 'motor',
+    ...                center=-1.3, Imax=1e5, sigma=0.05)
+    >>> RE(tune_peak([det], "det", motor, -1.5, -0.5, 0.001))
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    if max_evaluations < 1:
+        raise ValueError("max_evaluations must be at least 1")
+    _md = {'detectors': [det.name for det in detectors],
+           'motors': [motor.name],
+           'plan_args': {'detectors': list(map(repr, detectors)),
+                         'motor': repr(motor),
+                         'start': start,
+                         'stop': stop,
+                         'tolerance': tolerance,
+                         'max_evaluations': max_evaluations,
+                         'parabolic': parabolic,
+                         'maximize': maximize},
+           'plan_name': 'tune_peak',
+           'hints': {},
+           }
+    _md.update(md or {})
+    try:
+        dimensions = [(motor.hints['fields'], 'primary')]
+    except (AttributeError, KeyError):
+        pass
+    else:
+        _md['hints'].setdefault('dimensions', dimensions)
+
+    sign = -1 if maximize else 1
+    evaluations = []  # (position, value) of every measurement
+    result = {}
+
+    def evaluate(x):
+        "Measure at x; return the cost to minimize, or None in simulation."
+        yield Msg('checkpoint')
+        yield from bps.mv(motor, x)
+        ret = (yield from bps.trigger_and_read(list(detectors) + [motor]))
+        if ret is None:
+            return None
+        value = ret[signal]['value']
+        evaluations.append((x, value))
+        return sign * value
+
+    @bpp.stage_decorator(list(detectors) + [motor])
+    @bpp.run_decorator(md=_md)
+    def _tune_core():
+        # Brent's method for a bounded minimum, as in Numerical Recipes.
+        golden = 0.5 * (3 - np.sqrt(5))
+        a, b = min(start, stop), max(start, stop)
+        x = w = v = a + golden * (b - a)
+        fx = yield from evaluate(x)
+        if fx is None:
+            return
+        fw = fv = fx
+        d = e = 0.
+        tol1 = tolerance / 2
+        while len(evaluations) < max_evaluations:
+            xm = (a + b) / 2
+            if abs(x - xm) <= 2 * tol1 - (b - a) / 2:
+                break
+            golden_step = True
+            if parabolic and abs(e) > tol1:
+                # Try the vertex of the parabola through x, w and v.
+                r = (x - w) * (fx - fv)
+                q = (x - v) * (fx - fw)
+                p = (x - v) * q - (x - w) * r
+                q = 2 * (q - r)
+                if q > 0:
+                    p = -p
+                q = abs(q)
+                e_prev, e = e, d
+                if (abs(p) < abs(q * e_prev / 2) and
+                        q * (a - x) < p < q * (b - x)):
+                    d = p / q
+                    u = x + d
+                    if u - a < 2 * tol1 or b - u < 2 * tol1:
+                        d = tol1 if xm >= x else -tol1
+                    golden_step = False
+            if golden_step:
+                e = (a - x) if x >= xm else (b - x)
+                d = golden * e
+            u = x + (d if abs(d) >= tol1 else np.copysign(tol1, d))
+            fu = yield from evaluate(u)
+            if fu <= fx:
+                if u >= x:
+                    a = x
+                else:
+                    b = x
+                v, fv, w, fw, x, fx = w, fw, x, fx, u, fu
+            else:
+                if u < x:
+                    a = u
+                else:
+                    b = u
+                if fu <= fw or w == x:
+                    v, fv, w, fw = w, fw, u, fu
+                elif fu <= fv or v == x or v == w:
+                    v, fv = u, fu
+
+        yield from bps.mv(motor, x)
+        result.update(position=x,
+                      value=sign * fx,
+                      uncertainty=(b - a) / 2,
+                      num_evaluations=len(evaluations))
+
+    yield from _tune_core()
+    return result or None
+
+
+def tune_nelder_mead(detectors, signal, *args, xtol, ftol=0,
+                     max_evaluations=200, maximize=True, bounds=None,
+                     md=None):
+    """
+    plan: tune several motors together to the optimum of a signal
+
+    The derivative-free Nelder-Mead simplex method is used, so correlated
+    axes (e.g., the pitch and height of a mirror) are optimized together
+    rather than one at a time. Every measurement starts with a checkpoint,
+    so the plan can be paused and resumed. At the end, the motors are moved
+    to the best point found.
+
+    Parameters
+    ----------
+    detectors : list
+        list of 'readable' objects
+    signal : string
+        detector field whose output is to maximize
+    *args
+        patterned like (``motor1, start1, step1, ...,``
+                        ``motorN, startN, stepN``)
+
+        Each motor starts at its ``start`` position; ``step`` sets the size
+        of the initial simplex along that axis.
+    xtol : float
+        stop once every vertex of the simplex is within this distance of
+        the best one along every axis...
+    ftol : float, optional
+        ...and their values are within this of the best value; default 0
+    max_evaluations : int, optional
+        give up after this many measurements, default = 200
+    maximize : bool, optional
+        if False, find the minimum of the signal instead; default is True
+    bounds : dict, optional
+        maps motors to ``(low, high)`` positions to stay within. By default
+        the ``limits`` of each motor are used, if it has them and they are
+        set.
+    md : dict, optional
+        metadata
+
+    Returns
+    -------
+    result : dict
+        ``position`` (mapping motor names to the best positions), ``value``
+        there and ``num_evaluations``. None if run in simulation (no
+        readings).
+
+    See Also
+    --------
+    :func:`bluesky.plans.tune_peak`
+    """
+    if len(args) % 3 != 0 or not args:
+        raise ValueError("The motors must be given as "
+                         "motor, start, step triplets.")
+    if xtol <= 0:
+        raise ValueError("xtol must be positive")
+    chunks = list(partition(3, args))
+    motors = [motor for motor, start, step in chunks]
+    bounds = dict(bounds or {})
+    low, high = [], []
+    for motor in motors:
+        try:
+            lo, hi = bounds[motor]
+        except KeyError:
+            try:
+                lo, hi = motor.limits
+            except AttributeError:
+                lo = hi = 0
+            if lo == hi:
+                # The limits are not set.
+                lo, hi = -np.inf, np.inf
+        low.append(lo)
+        high.append(hi)
+    low, high = np.asarray(low, dtype=float), np.asarray(high, dtype=float)
+
+    _md = {'detectors': [det.name for det in detectors],
+           'motors': [motor.name for motor in motors],
+           'plan_args': {'detectors': list(map(repr, detectors)),
+                         'args': list(chain(*((repr(motor), start, step)
+                                              for motor, start, step
+                                              in chunks))),
+                         'signal': signal,
+                         'xtol': xtol,
+                         'ftol': ftol,
+                         'max_evaluations': max_evaluations,
+                         'maximize': maximize},
+           'plan_name': 'tune_nelder_mead',
+           'hints': {},
+           }
+    _md.update(md or {})
+    try:
+        dimensions = [(motor.hints['fields'], 'primary')
+                      for motor in motors]
+    except (AttributeError, KeyError):
+        pass
+    else:
+        _md['hints'].setdefault('dimensions', dimensions)
+
+    sign = -1 if maximize else 1
+    evaluations = []  # (position, value) of every measurement
+    result = {}
+
+    def evaluate(x):
+        "Measure at x; return the cost to minimize, or None in simulation."
+        yield Msg('checkpoint')
+        yield from bps.mv(*chain(*zip(motors, x)))
+        ret = (yield from bps.trigger_and_read(list(detectors) + motors))
+        if ret is None:
+            return None
+        value = ret[signal]['value']
+        evaluations.append((x, value))
+        return sign * value
+
+    @bpp.stage_decorator(list(detectors) + motors)
+    @bpp.run_decorator(md=_md)
+    def _tune_core():
+        x0 = np.clip([start for motor, start, step in chunks], low, high)
+        steps = [step for motor, start, step in chunks]
+        simplex = [x0]
+        for i, step in enumerate(steps):
+            x = x0.copy()
+            x[i] += step
+            if not low[i] <= x[i] <= high[i]:
+                x[i] = x0[i] - step
+            simplex.append(np.clip(x, low, high))
+        values = []
+        for x in simplex:
+            fx = yield from evaluate(x)
+            if fx is None:
+                return
+            values.append(fx)
+
+        while len(evaluations) < max_evaluations:
+            order = np.argsort(values)
+            simplex = [simplex[i] for i in order]
+            values = [values[i] for i in order]
+            best = simplex[0]
+            if (max(np.max(np.abs(x - best)) for x in simplex[1:]) <= xtol and
+                    values[-1] - values[0] <= ftol):
+                break
+            centroid = np.mean(simplex[:-1], axis=0)
+
+            def towards(coef):
+                return np.clip(centroid + coef * (simplex[-1] - centroid),
+                               low, high)
+
+            xr = towards(-1)  # reflection
+            fr = yield from evaluate(xr)
+            if fr < values[0]:
+                xe = towards(-2)  # expansion
+                fe = yield from evaluate(xe)
+                if fe < fr:
+                    simplex[-1], values[-1] = xe, fe
+                else:
+                    simplex[-1], values[-1] = xr, fr
+                continue
+            if fr < values[-2]:
+                simplex[-1], values[-1] = xr, fr
+                continue
+            if fr < values[-1]:
+                xc = towards(-0.5)  # outside contraction
+            else:
+                xc = towards(0.5)  # inside contraction
+            fc = yield from evaluate(xc)
+            if fc < min(fr, values[-1]):
+                simplex[-1], values[-1] = xc, fc
+                continue
+            # Shrink the simplex towards the best vertex.
+            for i in range(1, len(simplex)):
+                simplex[i] = best + 0.5 * (simplex[i] - best)
+                values[i] = yield from evaluate(simplex[i])
+
+        i = int(np.argmin(values))
+        yield from bps.mv(*chain(*zip(motors, simplex[i])))
+        result.update(position={motor.name: pos for motor, pos
+                                in zip(motors, simplex[i])},
+                      value=sign * values[i],
+                      num_evaluations=len(evaluations))
+
+    yield from _tune_core()
+    return result or None
+
+
 def scan_nd(detectors, cycler, *, per_step=None, md=None):
     """
     Scan over an arbitrary N-dimensional trajectory.
@@ -871,7 +1310,8 @@ def scan_nd(detectors, cycler, *, per_step=None, md=None):
     per_step : callable, optional
         hook for customizing action of inner loop (messages per step).
         See docstring of :func:`bluesky.plan_stubs.one_nd_step` (the default)
-        for details.
+        for details. Pass :func:`bluesky.plan_stubs.one_nd_step_pipelined`
+        to start each move while the previous point is being read out.
     md : dict, optional
         metadata
 
@@ -905,6 +1345,7 @@ def scan_nd(detectors, cycler, *, per_step=None, md=None):
         # change it, else set it to the one generated above
         _md['hints'].setdefault('dimensions', dimensions)
 
+    lookahead = False
     if per_step is None:
         per_step = bps.one_nd_step
     else:
@@ -912,6 +1353,9 @@ def scan_nd(detectors, cycler, *, per_step=None, md=None):
         sig = inspect.signature(per_step)
         if sig == inspect.signature(bps.one_nd_step):
             pass
+        elif sig == inspect.signature(bps.one_nd_step_pipelined):
+            # per_step also needs to know where it is going next.
+            lookahead = True
         elif sig == inspect.signature(bps.one_1d_step):
             # Accept this signature for back-compat reasons (because
             # inner_product_scan was renamed scan).
@@ -930,7 +1374,9 @@ def scan_nd(detectors, cycler, *, per_step=None, md=None):
             per_step = adapter
         else:
             raise TypeError("per_step must be a callable with the signature "
-                            "<Signature (detectors, step, pos_cache)> or "
+                            "<Signature (detectors, step, pos_cache)>, "
+                            "<Signature (detectors, step, pos_cache, "
+                            "next_step)> or "
                             "<Signature (detectors, motor, step)>.")
     pos_cache = defaultdict(lambda: None)  # where last position is stashed
     cycler = utils.merge_cycler(cycler)
@@ -939,8 +1385,17 @@ def scan_nd(detectors, cycler, *, per_step=None, md=None):
     @bpp.stage_decorator(list(detectors) + motors)
     @bpp.run_decorator(md=_md)
     def inner_scan_nd():
-        for step in list(cycler):
-            yield from per_step(detectors, step, pos_cache)
+        # Iterate lazily: positions are generated one point at a time.
+        if not lookahead:
+            for step in cycler:
+                yield from per_step(detectors, step, pos_cache)
+            return
+        steps = iter(cycler)
+        step = next(steps, None)
+        while step is not None:
+            next_step = next(steps, None)
+            yield from per_step(detectors, step, pos_cache, next_step)
+            step = next_step
 
     return (yield from inner_scan_nd())
 
@@ -1797,6 +2252,218 @@ def fly(flyers, *, md=None):
     yield from bps.close_run()
 
 
+def _fly_sweep(devices, moves, *, period=None):
+    """
+    Move each motor in ``moves`` to its target while reading ``devices``.
+
+    The motion is started without waiting for it. Until it is done, the
+    devices (which should include the motors) are triggered and read at
+    most once every ``period`` seconds, so each Event records the read-back
+    positions at the time of the reading. One more reading is taken after
+    the motion has completed.
+    """
+    group = utils.short_uid('fly_sweep')
+    statuses = []
+    for motor, target in moves:
+        ret = yield from bps.abs_set(motor, target, group=group)
+        statuses.append(ret)
+
+    # In simulation (e.g., summarize_plan) no status object is returned.
+    while not all(st is None or st.done for st in statuses):
+        start_time = time.time()
+        yield from bps.trigger_and_read(devices)
+        if period is not None:
+            wait_time = (start_time + period) - time.time()
+            if wait_time > 0:
+                yield from bps.sleep(wait_time)
+    yield from bps.wait(group=group)
+    yield from bps.trigger_and_read(devices)
+
+
+def fly_scan(detectors, *args, period=None, monitor_motors=False, md=None):
+    """
+    Read detectors continuously while sweeping one or more motors.
+
+    This is a "software fly scan": unlike :func:`scan`, the motors are not
+    stopped at each point. They are moved to their start positions and then
+    set in motion towards their stop positions together. While they move,
+    the detectors and the motors are triggered and read as often as
+    possible, or at most once every ``period`` seconds, so each Event is
+    tagged with the read-back positions of the motors.
+
+    Parameters
+    ----------
+    detectors : list
+        list of 'readable' objects
+    *args :
+        For one dimension, ``motor, start, stop``.
+        In general:
+
+        .. code-block:: python
+
+            motor1, start1, stop1,
+            motor2, start2, stop2,
+            ...,
+            motorN, startN, stopN
+
+        Motors can be any 'settable' object (motor, temp controller, etc.)
+    period : float, optional
+        If not None, take readings no faster than this, in seconds. If None,
+        take readings as fast as possible.
+    monitor_motors : bool, optional
+        If True, also monitor the motors for the duration of the run, which
+        records every position update in a separate stream per motor.
+        False by default.
+    md : dict, optional
+        metadata
+
+    See Also
+    --------
+    :func:`bluesky.plans.scan`
+    :func:`bluesky.plans.fly_grid_scan`
+    :func:`bluesky.plans.ramp_plan`
+    """
+    if len(args) % 3 != 0:
+        raise ValueError("The motors must be given as "
+                         "motor, start, stop triplets.")
+    chunks = list(partition(3, args))
+    motors = [motor for motor, start, stop in chunks]
+    md_args = list(chain(*((repr(motor), start, stop)
+                           for motor, start, stop in chunks)))
+    _md = {'detectors': [det.name for det in detectors],
+           'motors': [motor.name for motor in motors],
+           'plan_args': {'detectors': list(map(repr, detectors)),
+                         'args': md_args,
+                         'period': period},
+           'plan_name': 'fly_scan',
+           'hints': {},
+           }
+    _md.update(md or {})
+    try:
+        dimensions = [(motor.hints['fields'], 'primary')
+                      for motor in motors]
+    except (AttributeError, KeyError):
+        pass
+    else:
+        _md['hints'].setdefault('dimensions', dimensions)
+
+    @bpp.stage_decorator(list(detectors) + motors)
+    @bpp.run_decorator(md=_md)
+    def inner_fly_scan():
+        yield from bps.checkpoint()
+        yield from bps.mv(*chain(*((motor, start)
+                                   for motor, start, stop in chunks)))
+        yield from _fly_sweep(list(detectors) + motors,
+                              [(motor, stop)
+                               for motor, start, stop in chunks],
+                              period=period)
+
+    plan = inner_fly_scan()
+    if monitor_motors:
+        plan = bpp.monitor_during_wrapper(plan, motors)
+    return (yield from plan)
+
+
+def fly_grid_scan(detectors, *args, snake=False, period=None,
+                  monitor_motors=False, md=None):
+    """
+    Step over a mesh, sweeping the fastest axis continuously.
+
+    The outer axes are stepped as in :func:`grid_scan`. For each of their
+    positions, the last (fastest) motor is moved to its start position and
+    then swept to its stop position, reading the detectors while it moves,
+    as in :func:`fly_scan`.
+
+    Parameters
+    ----------
+    detectors : list
+        list of 'readable' objects
+    *args
+        patterned like (``motor1, start1, stop1, num1,``
+                        ``motor2, start2, stop2, num2, snake2,``
+                        ``...,``
+                        ``motorN, startN, stopN, numN, snakeN,``
+                        ``fly_motor, fly_start, fly_stop``)
+
+        The stepped axes are given as in :func:`grid_scan`. The last three
+        arguments give the axis that is swept continuously.
+    snake : bool, optional
+        If True, sweep the fastest axis in alternating directions instead of
+        returning it to its start position for every row. False by default.
+    period : float, optional
+        If not None, take readings no faster than this, in seconds. If None,
+        take readings as fast as possible.
+    monitor_motors : bool, optional
+        If True, also monitor all of the motors for the duration of the run.
+        False by default.
+    md : dict, optional
+        metadata
+
+    See Also
+    --------
+    :func:`bluesky.plans.grid_scan`
+    :func:`bluesky.plans.fly_scan`
+    """
+    args = list(args)
+    if len(args) < 7:
+        raise ValueError("At least one stepped axis and the swept axis "
+                         "are required.")
+    fly_motor, fly_start, fly_stop = args[-3:]
+    step_args = args[:-3]
+    outer = plan_patterns.outer_product(args=step_args)
+    chunk_args = list(plan_patterns.chunk_outer_product_args(step_args))
+
+    md_args = []
+    motors = []
+    for i, (motor, start, stop, num, snake_axis) in enumerate(chunk_args):
+        md_args.extend([repr(motor), start, stop, num])
+        if i > 0:
+            # snake argument only shows up after the first motor
+            md_args.append(snake_axis)
+        motors.append(motor)
+    md_args.extend([repr(fly_motor), fly_start, fly_stop])
+    motors.append(fly_motor)
+    _md = {'detectors': [det.name for det in detectors],
+           'motors': [motor.name for motor in motors],
+           'shape': tuple(num for motor, start, stop, num, snake_axis
+                          in chunk_args),
+           'extents': tuple([start, stop] for motor, start, stop, num,
+                            snake_axis in chunk_args) + ([fly_start,
+                                                          fly_stop],),
+           'snaking': tuple(snake_axis for motor, start, stop, num,
+                            snake_axis in chunk_args) + (snake,),
+           'plan_args': {'detectors': list(map(repr, detectors)),
+                         'args': md_args,
+                         'snake': snake,
+                         'period': period},
+           'plan_name': 'fly_grid_scan',
+           'hints': {},
+           }
+    _md.update(md or {})
+    try:
+        _md['hints'].setdefault('dimensions', [(m.hints['fields'], 'primary')
+                                               for m in motors])
+    except (AttributeError, KeyError):
+        ...
+
+    @bpp.stage_decorator(list(detectors) + motors)
+    @bpp.run_decorator(md=_md)
+    def inner_fly_grid_scan():
+        start, stop = fly_start, fly_stop
+        for step in outer:
+            yield from bps.checkpoint()
+            yield from bps.mv(*chain(*step.items()), fly_motor, start)
+            yield from _fly_sweep(list(detectors) + motors,
+                                  [(fly_motor, stop)], period=period)
+            if snake:
+                start, stop = stop, start
+
+    plan = inner_fly_grid_scan()
+    if monitor_motors:
+        plan = bpp.monitor_during_wrapper(plan, motors)
+    return (yield from plan)
+
+
 def x2x_scan(detectors, motor1, motor2, start, stop, num, *,
              per_step=None, md=None):
     """
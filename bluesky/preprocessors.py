@@ -55,158 +55,323 @@ def plan_mutator(plan, msg_proc):
     See Also
     --------
     :func:`bluesky.plans.msg_mutator`
+    :func:`bluesky.preprocessors.fused_plan_mutator`
     """
+    # Return the generator directly, rather than delegating to it, to save
+    # a frame per message when plan_mutators are nested.
+    return fused_plan_mutator(plan, [msg_proc])
+
+
+def fused_plan_mutator(plan, msg_procs):
+    """
+    Apply several ``msg_proc`` functions to a plan in a single pass.
+
+    This is equivalent to nesting :func:`plan_mutator` once per function, ::
+
+        plan_mutator(plan_mutator(plan, msg_procs[0]), msg_procs[1])
+
+    but every message passes through only one generator, however many
+    functions there are. As with nesting, the messages inserted by a function
+    are processed by that function and the ones after it, but not by the ones
+    before it.
+
+    Parameters
+    ----------
+    plan : generator
+        a generator that yields messages (`Msg` objects)
+    msg_procs : list
+        functions with the signature described in :func:`plan_mutator`
+
+    Yields
+    ------
+    msg : Msg
+        messages from `plan`, altered by `msg_procs`
+
+    See Also
+    --------
+    :func:`bluesky.preprocessors.plan_mutator`
+    """
+    msg_procs = list(msg_procs)
     # internal stacks
-    msgs_seen = dict()
-    plan_stack = deque()
+    plan_stack = deque()  # (generator, index of the msg_proc that made it)
     result_stack = deque()
     tail_cache = dict()
     tail_result_cache = dict()
+    # A message is handed to a msg_proc only once. While the generators that
+    # msg_proc returned for it are running, map them to (msg, index) so that
+    # the message can be recognized if they yield it. Unlike remembering
+    # every message ever processed, this holds only as many messages as
+    # there are generators on the stack.
+    in_flight = dict()
     exception = None
 
     parent_plan = plan
     ret_value = None
     # seed initial conditions
-    plan_stack.append(plan)
+    plan_stack.append((plan, 0))
     result_stack.append(None)
 
+    def pop_exhausted():
+        # discard the exhausted generator and, if it was a 'head', replace it
+        # with its 'tail' generator
+        exhausted_gen, level = plan_stack.pop()
+        spawner = in_flight.pop(id(exhausted_gen), None)
+        gen = tail_cache.pop(id(exhausted_gen), None)
+        if gen is not None:
+            plan_stack.append((gen, level))
+            if spawner is not None:
+                in_flight[id(gen)] = spawner
+        return exhausted_gen, gen
+
     while True:
         # get last result
-        if exception is not None:
-            # if we have a stashed exception, pass it along
-            try:
-                msg = plan_stack[-1].throw(exception)
-            except StopIteration as e:
-                # discard the exhausted generator
-                exhausted_gen = plan_stack.pop()
-                # if this is the parent plan, capture it's return value
-                if exhausted_gen is parent_plan:
-                    ret_value = e.value
-
-                # if we just came out of a 'tail' generator,
-                # discard its return value and replace it with the
-                # cached one (from the last message in its paired
-                # 'new_gen')
-                if id(exhausted_gen) in tail_result_cache:
-                    ret = tail_result_cache.pop(id(exhausted_gen))
-
-                result_stack.append(ret)
-
-                if id(exhausted_gen) in tail_cache:
-                    gen = tail_cache.pop(id(exhausted_gen))
-                    if gen is not None:
-                        plan_stack.append(gen)
-                        saved_result = result_stack.pop()
-                        tail_result_cache[id(gen)] = saved_result
-                        # must use None to prime generator
-                        result_stack.append(None)
-
-                if plan_stack:
-                    continue
-                else:
-                    return ret_value
-            except Exception as e:
-                # if we catch an exception,
-                # the current top plan is dead so pop it
-                plan_stack.pop()
-                if plan_stack:
-                    # stash the exception and go to the top
-                    exception = e
-                    continue
-                else:
-                    raise
-            else:
+        try:
+            if exception is not None:
+                # if we have a stashed exception, pass it along
+                msg = plan_stack[-1][0].throw(exception)
                 exception = None
-        else:
-            ret = result_stack.pop()
-            try:
-                msg = plan_stack[-1].send(ret)
-            except StopIteration as e:
-                # discard the exhausted generator
-                exhausted_gen = plan_stack.pop()
-                # if this is the parent plan, capture it's return value
-                if exhausted_gen is parent_plan:
-                    ret_value = e.value
-
-                # if we just came out of a 'tail' generator,
-                # discard its return value and replace it with the
-                # cached one (from the last message in its paired
-                # 'new_gen')
-                if id(exhausted_gen) in tail_result_cache:
-                    ret = tail_result_cache.pop(id(exhausted_gen))
-
+            else:
+                ret = result_stack.pop()
+                msg = plan_stack[-1][0].send(ret)
+        except StopIteration as e:
+            exhausted_gen, level = plan_stack[-1]
+            # if this is the parent plan, capture it's return value
+            if exhausted_gen is parent_plan:
+                ret_value = e.value
+
+            # if we just came out of a 'tail' generator,
+            # discard its return value and replace it with the
+            # cached one (from the last message in its paired
+            # 'new_gen')
+            if id(exhausted_gen) in tail_result_cache:
+                ret = tail_result_cache.pop(id(exhausted_gen))
+
+            _, gen = pop_exhausted()
+            if gen is not None:
+                tail_result_cache[id(gen)] = ret
+                # must use None to prime generator
+                result_stack.append(None)
+            else:
                 result_stack.append(ret)
 
-                if id(exhausted_gen) in tail_cache:
-                    gen = tail_cache.pop(id(exhausted_gen))
-                    if gen is not None:
-                        plan_stack.append(gen)
-                        saved_result = result_stack.pop()
-                        tail_result_cache[id(gen)] = saved_result
-                        # must use None to prime generator
-                        result_stack.append(None)
+            if plan_stack:
+                continue
+            else:
+                return ret_value
+        except Exception as ex:
+            # we are here because an exception came out of the send
+            # this may be due to
+            # a) the plan really raising or
+            # b) an exception that came out of the run engine via ophyd
+
+            # in either case the current plan is dead so pop it
+            failed_gen, _ = pop_exhausted()
+            tail_result_cache.pop(id(failed_gen), None)
+            # if there is at least
+            if plan_stack:
+                exception = ex
+                continue
+            else:
+                raise
 
-                if plan_stack:
-                    continue
-                else:
-                    return ret_value
-            except Exception as ex:
-                # we are here because an exception came out of the send
-                # this may be due to
-                # a) the plan really raising or
-                # b) an exception that came out of the run engine via ophyd
-
-                # in either case the current plan is dead so pop it
-                failed_gen = plan_stack.pop()
-                if id(failed_gen) in tail_cache:
-                    gen = tail_cache.pop(id(failed_gen))
-                    if gen is not None:
-                        plan_stack.append(gen)
-                # if there is at least
-                if plan_stack:
-                    exception = ex
-                    continue
-                else:
-                    raise ex
         # if inserting / mutating, put new generator on the stack
         # and replace the current msg with the first element from the
         # new generator
-        if id(msg) not in msgs_seen:
-            # Use the id as a hash, and hold a reference to the msg so that
-            # it cannot be garbage collected until the plan is complete.
-            msgs_seen[id(msg)] = msg
-
-            new_gen, tail_gen = msg_proc(msg)
+        start = plan_stack[-1][1]
+        if in_flight:
+            for seen, index in in_flight.values():
+                if seen is msg and index >= start:
+                    # resume after the msg_proc that has already had it
+                    start = index + 1
+        for index in range(start, len(msg_procs)):
+            new_gen, tail_gen = msg_procs[index](msg)
             # mild correctness check
             if tail_gen is not None and new_gen is None:
                 new_gen = single_gen(msg)
             if new_gen is not None:
                 # stash the new generator
-                plan_stack.append(new_gen)
+                plan_stack.append((new_gen, index))
+                in_flight[id(new_gen)] = (msg, index)
                 # put in a result value to prime it
                 result_stack.append(None)
                 # stash the tail generator
                 tail_cache[id(new_gen)] = tail_gen
-                # go to the top of the loop
-                continue
-
-        try:
-            # yield out the 'current message' and collect the return
-            inner_ret = yield msg
-        except GeneratorExit:
-            # special case GeneratorExit.  We must clean up all of our plans
-            # and exit with out yielding anything else.
-            for p in plan_stack:
-                p.close()
-            raise
-        except Exception as ex:
-            if plan_stack:
-                exception = ex
-                continue
-            else:
-                raise
+                break
         else:
-            result_stack.append(inner_ret)
+            try:
+                # yield out the 'current message' and collect the return
+                inner_ret = yield msg
+            except GeneratorExit:
+                # special case GeneratorExit.  We must clean up all of our
+                # plans and exit with out yielding anything else.
+                for p, _ in plan_stack:
+                    p.close()
+                raise
+            except Exception as ex:
+                if plan_stack:
+                    exception = ex
+                    continue
+                else:
+                    raise
+            else:
+                result_stack.append(inner_ret)
+
+
+class MsgProcessor:
+    """
+    A plan preprocessor made of message-level ``msg_proc`` functions.
+
+    Calling it on a plan is the same as applying :func:`fused_plan_mutator`,
+    but it also declares its functions through :meth:`msg_procs`. When
+    several such preprocessors are adjacent in ``RunEngine.preprocessors``,
+    the RunEngine fuses them into a single pass over the messages, rather than
+    nesting one generator per preprocessor. Ordinary generator preprocessors
+    are still supported between them.
+
+    Parameters
+    ----------
+    *msg_procs : callable
+        functions with the signature described in :func:`plan_mutator`,
+        innermost first
+
+    Examples
+    --------
+    Build message-level preprocessors from common transforms.
+
+    >>> RE.preprocessors.append(MsgProcessor.insert_before(
+    ...     lambda msg: bps.sleep(0.1) if msg.command == 'trigger' else None))
+    >>> RE.preprocessors.append(MsgProcessor.filter(
+    ...     lambda msg: msg.command != 'checkpoint'))
+    """
+    def __init__(self, *msg_procs):
+        self._msg_procs = list(msg_procs)
+
+    def msg_procs(self):
+        "The msg_proc functions to apply, innermost first."
+        return list(self._msg_procs)
+
+    def __call__(self, plan):
+        return fused_plan_mutator(plan, self.msg_procs())
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__,
+                               ', '.join(map(repr, self._msg_procs)))
+
+    @classmethod
+    def map(cls, func):
+        """
+        Replace each message with ``func(msg)``, or drop it if that is None.
+
+        The plan receives the response to the replacement (None if dropped).
+        """
+        produced = {}  # id -> replacement, until it comes back through
+
+        def msg_proc(msg):
+            if produced.pop(id(msg), None) is msg:
+                # our own replacement: do not map it again
+                return None, None
+            new_msg = func(msg)
+            if new_msg is msg:
+                return None, None
+            if new_msg is None:
+                return _drop(), None
+            produced[id(new_msg)] = new_msg
+            return single_gen(new_msg), None
+
+        return cls(msg_proc)
+
+    @classmethod
+    def filter(cls, predicate):
+        """
+        Drop the messages for which ``predicate(msg)`` is False.
+
+        The plan receives None as the response to a dropped message.
+        """
+        def msg_proc(msg):
+            if predicate(msg):
+                return None, None
+            return _drop(), None
+
+        return cls(msg_proc)
+
+    @classmethod
+    def insert_before(cls, func):
+        """
+        Insert the plan ``func(msg)`` before each message, unless it is None.
+        """
+        def msg_proc(msg):
+            plan = func(msg)
+            if plan is None:
+                return None, None
+
+            def head():
+                yield from ensure_generator(plan)
+                return (yield msg)
+
+            return head(), None
+
+        return cls(msg_proc)
+
+    @classmethod
+    def insert_after(cls, func):
+        """
+        Insert the plan ``func(msg)`` after each message, unless it is None.
+        """
+        def msg_proc(msg):
+            plan = func(msg)
+            if plan is None:
+                return None, None
+            return None, ensure_generator(plan)
+
+        return cls(msg_proc)
+
+
+def _drop():
+    "A plan_mutator 'head' that removes the message, sending back None."
+    return
+    yield
+
+
+def _is_fusable(preprocessor):
+    "Whether calling the preprocessor is the same as fusing its msg_procs."
+    return any(isinstance(preprocessor, cls) and
+               type(preprocessor).__call__ is cls.__call__
+               for cls in (MsgProcessor, SupplementalData))
+
+
+def apply_preprocessors(plan, preprocessors):
+    """
+    Apply preprocessors to a plan, fusing the message-level ones.
+
+    The preprocessors ``[f, g]`` are applied like ``g(f(plan))``. Adjacent
+    instances of :class:`MsgProcessor` and :class:`SupplementalData` are
+    combined into one :func:`fused_plan_mutator`; any others, including
+    subclasses that override ``__call__``, are called on the plan.
+
+    Parameters
+    ----------
+    plan : iterable or iterator
+        a generator, list, or similar containing `Msg` objects
+    preprocessors : list
+        callables that take a plan and return a new one
+
+    Returns
+    -------
+    plan : generator
+    """
+    gen = ensure_generator(plan)
+    msg_procs = []
+    for preprocessor in preprocessors:
+        if _is_fusable(preprocessor):
+            msg_procs.extend(preprocessor.msg_procs())
+            continue
+        if msg_procs:
+            gen = fused_plan_mutator(gen, msg_procs)
+            msg_procs = []
+        gen = preprocessor(gen)
+    if msg_procs:
+        gen = fused_plan_mutator(gen, msg_procs)
+    return gen
 
 
 def msg_mutator(plan, msg_proc):
@@ -764,6 +929,14 @@ def monitor_during_wrapper(plan, signals):
     --------
     :func:`bluesky.plans.fly_during_wrapper`
     """
+    return (yield from fused_plan_mutator(
+        plan, _monitor_during_msg_procs(signals)))
+
+
+def _monitor_during_msg_procs(signals):
+    "The msg_procs of monitor_during_wrapper, for fused_plan_mutator."
+    if not signals:
+        return []
     monitor_msgs = [Msg('monitor', sig, name=sig.name + '_monitor')
                     for sig in signals]
     unmonitor_msgs = [Msg('unmonitor', sig) for sig in signals]
@@ -785,10 +958,7 @@ def monitor_during_wrapper(plan, signals):
         else:
             return None, None
 
-    # Apply nested mutations.
-    plan1 = plan_mutator(plan, insert_after_open)
-    plan2 = plan_mutator(plan1, insert_before_close)
-    return (yield from plan2)
+    return [insert_after_open, insert_before_close]
 
 
 def fly_during_wrapper(plan, flyers):
@@ -815,6 +985,14 @@ def fly_during_wrapper(plan, flyers):
     --------
     :func:`bluesky.plans.fly`
     """
+    return (yield from fused_plan_mutator(
+        plan, _fly_during_msg_procs(flyers)))
+
+
+def _fly_during_msg_procs(flyers):
+    "The msg_procs of fly_during_wrapper, for fused_plan_mutator."
+    if not flyers:
+        return []
     grp1 = _short_uid('flyers-kickoff')
     grp2 = _short_uid('flyers-complete')
     kickoff_msgs = [Msg('kickoff', flyer, group=grp1) for flyer in flyers]
@@ -843,10 +1021,7 @@ def fly_during_wrapper(plan, flyers):
         else:
             return None, None
 
-    # Apply nested mutations.
-    plan1 = plan_mutator(plan, insert_after_open)
-    plan2 = plan_mutator(plan1, insert_before_close)
-    return (yield from plan2)
+    return [insert_after_open, insert_before_close]
 
 
 def lazily_stage_wrapper(plan):
@@ -1130,6 +1305,19 @@ def baseline_wrapper(plan, devices, name='baseline'):
     msg : Msg
         messages from plan, with 'set' messages inserted
     """
+    if not devices:
+        # no-op
+        return (yield from plan)
+    else:
+        return (yield from fused_plan_mutator(
+            plan, _baseline_msg_procs(devices, name)))
+
+
+def _baseline_msg_procs(devices, name='baseline'):
+    "The msg_procs of baseline_wrapper, for fused_plan_mutator."
+    if not devices:
+        return []
+
     def insert_baseline(msg):
         if msg.command == 'open_run':
             return None, trigger_and_read(devices, name=name)
@@ -1143,11 +1331,7 @@ def baseline_wrapper(plan, devices, name='baseline'):
 
         return None, None
 
-    if not devices:
-        # no-op
-        return (yield from plan)
-    else:
-        return (yield from plan_mutator(plan, insert_baseline))
+    return [insert_baseline]
 
 
 # Make generator function decorator for each generator instance wrapper.
@@ -1279,7 +1463,7 @@ class SupplementalData:
         plan : iterable or iterator
             a generator, list, or similar containing `Msg` objects
         """
-        # Read this as going from the inside out: first we wrap the plan in the
+        # Read this as going from the inside out: first we apply the
         # flying instructions, then monitoring, then baseline, so that the
         # order of operations is:
         # - Take baseline readings
@@ -1289,10 +1473,19 @@ class SupplementalData:
         # - Complete and collect flyers.
         # - Stop monitoring.
         # - Take baseline readings.
-        plan = fly_during_wrapper(plan, self.flyers)
-        plan = monitor_during_wrapper(plan, self.monitors)
-        plan = baseline_wrapper(plan, self.baseline)
-        return (yield from plan)
+        return (yield from fused_plan_mutator(plan, self.msg_procs()))
+
+    def msg_procs(self):
+        """
+        The functions that insert the messages, for :func:`fused_plan_mutator`.
+
+        A RunEngine applies these in a single pass, fused with those of any
+        adjacent message-level preprocessors (see :class:`MsgProcessor`).
+        """
+        # Innermost first, as for __call__.
+        return (_fly_during_msg_procs(self.flyers) +
+                _monitor_during_msg_procs(self.monitors) +
+                _baseline_msg_procs(self.baseline))
 
 
 def define_run_wrapper(plan, run):
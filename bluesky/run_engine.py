@@ -6,7 +6,8 @@ import logging
 from warnings import warn
 from inspect import Parameter, Signature
 from itertools import count, tee
-from collections import deque, defaultdict, ChainMap
+from collections import deque, defaultdict
+import copy
 from enum import Enum
 import functools
 import inspect
@@ -36,7 +37,9 @@ from .utils import (CallbackRegistry, SigintHandler,
                     RunEngineInterrupted, IllegalMessageSequence,
                     FailedPause, FailedStatus, InvalidCommand,
                     PlanHalt, Msg, ensure_generator, single_gen,
-                    default_during_task)
+                    default_during_task, new_uid, root_ancestor,
+                    DeviceLocked)
+from .preprocessors import apply_preprocessors, plan_mutator
 
 
 class _RunEnginePanic(Exception):
@@ -152,6 +155,71 @@ def _extract_run_key(msg):
 _extract_run_key.__default_run = object()
 
 
+class _StatusBatch:
+    """
+    Status objects that are waited on together: everything in one group.
+
+    Completions are counted under a lock from whatever thread reports them,
+    and the event loop is woken only once, when the last member is done.
+    Failures are still reported one status at a time, as soon as they
+    happen.
+
+    Parameters
+    ----------
+    schedule : callable
+        ``schedule(func, *args)`` arranges for ``func(*args)`` to be called
+        on the event loop; it must be safe to call from any thread.
+    log : logging.Logger
+    loop : asyncio.AbstractEventLoop
+    """
+    def __init__(self, schedule, log, *, loop):
+        self._schedule = schedule
+        self._log = log
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._event = asyncio.Event(loop=loop)
+
+    def add(self, status, on_failure, obj=None, action='set'):
+        """
+        Track ``status``, calling ``on_failure(status)`` on the loop if it
+        finishes unsuccessfully.
+        """
+        with self._lock:
+            self._pending += 1
+
+        def done_callback():
+            self._log.debug("The object %r reports %s is done "
+                            "with status %r", obj, action, status.success)
+            if not status.success:
+                self._schedule(on_failure, status)
+            with self._lock:
+                self._pending -= 1
+                last = not self._pending
+            if last:
+                self._schedule(self._event.set)
+
+        try:
+            status.add_callback(done_callback)
+        except AttributeError:
+            # for ophyd < v0.8.0
+            status.finished_cb = done_callback
+
+    @property
+    def done(self):
+        with self._lock:
+            return not self._pending
+
+    async def wait(self):
+        "Wait until every status added so far is done."
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                # Forget wake-ups from before more statuses were added.
+                self._event.clear()
+            await self._event.wait()
+
+
 class RunEngine:
     """The Run Engine execute messages and emits Documents.
 
@@ -173,7 +241,9 @@ class RunEngine:
         modify its messages on the way out. Suitable examples include
         the functions in the module ``bluesky.plans`` with names ending in
         'wrapper'.  Functions are composed in order: the preprocessors
-        ``[f, g]`` are applied like ``f(g(plan))``.
+        ``[f, g]`` are applied like ``g(f(plan))``. Adjacent message-level
+        preprocessors (see :class:`~bluesky.preprocessors.MsgProcessor`) are
+        fused into a single pass.
 
     context_managers : list, optional
         Context managers that will be entered when we run a plan. The context
@@ -216,6 +286,19 @@ class RunEngine:
            - Matplotlib is imported and using a nbagg or ipympl backend (
              wait on the event and poll to push updates to the browser)
 
+    time_source : callable, optional
+        Function returning the current time, used for the 'time' of the
+        documents. Default is :func:`time.time`. To run in virtual time, pass
+        the ``time`` method of a
+        :class:`~bluesky.simulators.VirtualTimeEventLoop` given as ``loop``.
+
+    uid_source : callable, optional
+        Function returning a new, unique string, used for the 'uid' of the
+        documents. Default is :func:`bluesky.utils.new_uid`, which makes a
+        uuid4 per call. :class:`~bluesky.utils.UidPool` makes uuid4s in
+        batches and :class:`~bluesky.utils.SequentialUid` makes uuid-formatted
+        uids from a random prefix and a counter; both are faster.
+
     Attributes
     ----------
     md
@@ -237,7 +320,8 @@ class RunEngine:
         modify its messages on the way out. Suitable examples include
         the functions in the module ``bluesky.plans`` with names ending in
         'wrapper'.  Functions are composed in order: the preprocessors
-        ``[f, g]`` are applied like ``f(g(plan))``.
+        ``[f, g]`` are applied like ``g(f(plan))``. Adjacent message-level
+        preprocessors are fused into a single pass.
 
     msg_hook
         Callable that receives all messages before they are processed
@@ -293,7 +377,8 @@ class RunEngine:
     def __init__(self, md=None, *, loop=None, preprocessors=None,
                  context_managers=None, md_validator=None,
                  scan_id_source=default_scan_id_source,
-                 during_task=default_during_task):
+                 during_task=default_during_task, time_source=ttime.time,
+                 uid_source=new_uid):
         if loop is None:
             loop = get_bluesky_event_loop()
         self._th = _ensure_event_loop_running(loop)
@@ -303,6 +388,8 @@ class RunEngine:
 
         # When set, RunEngine.__call__ should stop blocking.
         self._blocking_event = threading.Event()
+        # When done, RunEngine.run should stop awaiting.
+        self._blocking_waiter = None
 
         # When cleared, RunEngine._run will pause until set.
         self._run_permit = asyncio.Event(loop=loop)
@@ -338,6 +425,8 @@ class RunEngine:
             md_validator = _default_md_validator
         self.md_validator = md_validator
         self.scan_id_source = scan_id_source
+        self.time_source = time_source
+        self.uid_source = uid_source
 
         self.max_depth = None
         self.msg_hook = None
@@ -359,8 +448,9 @@ class RunEngine:
         self._movable_objs_touched = set()  # objects we moved at any point
         self._run_start_uids = list()  # run start uids generated by __call__
         self._suspenders = set()  # set holding suspenders
-        self._groups = defaultdict(set)  # sets of Events to wait for
+        self._groups = defaultdict(set)  # awaitable factories to wait for
         self._status_objs = defaultdict(set)  # status objects to wait for
+        self._status_batches = {}  # group -> _StatusBatch to wait for
         self._temp_callback_ids = set()  # ids from CallbackRegistry
         self._msg_cache = deque()  # history of processed msgs for rewinding
         self._rewindable_flag = True  # if the RE is allowed to replay msgs
@@ -370,9 +460,11 @@ class RunEngine:
         self._reason = ''  # reason for abort
         self._task = None  # asyncio.Task associated with call to self._run
         self._task_fut = None  # future proxy to the task above
-        self._status_tasks = deque()  # from self._status_object_completed
+        self._status_tasks = set()  # pending from _schedule_status_task
+        self._status_tasks_lock = threading.Lock()
         self._pardon_failures = None  # will hold an asyncio.Event
         self._plan = None  # the plan instance from __call__
+        self._persistent_md_cache = None  # [md, md.version, copy of md]
         self._command_registry = {
             'create': self._create,
             'save': self._save,
@@ -383,6 +475,7 @@ class RunEngine:
             'null': self._null,
             'stop': self._stop,
             'set': self._set,
+            'multi_set': self._multi_set,
             'trigger': self._trigger,
             'sleep': self._sleep,
             'wait': self._wait,
@@ -553,6 +646,7 @@ class RunEngine:
         "Clean up for a new run."
         self._groups.clear()
         self._status_objs.clear()
+        self._status_batches.clear()
         self._interruptions_desc_uid = None
         self._interruptions_counter = count(1)
 
@@ -573,7 +667,7 @@ class RunEngine:
         self._reason = ''
         self._task = None
         self._task_fut = None
-        self._status_tasks.clear()
+        self._cancel_status_tasks()
         self._pardon_failures = asyncio.Event(loop=self.loop)
         self._plan = None
         self._interrupted = False
@@ -595,6 +689,66 @@ class RunEngine:
         self._clear_call_cache()
         self.dispatcher.unsubscribe_all()
 
+    def memory_report(self, max_objects=10):
+        """
+        Report the size of the RunEngine's internal caches.
+
+        This is a diagnostic for long-running sessions: a cache that keeps
+        growing from one plan to the next is a memory leak.
+
+        Parameters
+        ----------
+        max_objects : int, optional
+            the number of retained objects to list for each cache; default 10
+
+        Returns
+        -------
+        report : dict
+            Maps the name of each cache to a dict with its ``'size'`` (the
+            number of entries), ``'bytes'`` (the size of the container itself,
+            not counting the objects it holds) and ``'objects'`` (a list
+            describing up to ``max_objects`` of the objects it retains, by
+            their ``name`` if they have one). The caches of each open run are
+            named like ``'run[<run key>].describe_cache'``.
+        """
+        def entry(container, objects=None):
+            # Copy first: the run loop may be changing the container.
+            objects = tuple(container if objects is None else objects)
+            return {'size': len(objects),
+                    'bytes': sys.getsizeof(container),
+                    'objects': [_describe_object(obj)
+                                for obj in objects[:max_objects]]}
+
+        report = {
+            'objs_seen': entry(self._objs_seen),
+            'movable_objs_touched': entry(self._movable_objs_touched),
+            'staged': entry(self._staged),
+            'msg_cache': entry(self._msg_cache if self._msg_cache is not None
+                               else ()),
+            'plan_stack': entry(self._plan_stack),
+            'status_tasks': entry(self._status_tasks),
+            'status_objs': entry(self._status_objs, [
+                st for sts in tuple(self._status_objs.values()) for st in sts]),
+            'groups': entry(self._groups, [
+                f for fs in tuple(self._groups.values()) for f in fs]),
+            'status_batches': entry(self._status_batches),
+            'temp_callback_ids': entry(self._temp_callback_ids),
+            'callbacks': entry(self.dispatcher.cb_registry.callbacks, [
+                proxy.func for proxies in tuple(
+                    self.dispatcher.cb_registry.callbacks.values())
+                for proxy in tuple(proxies.values())]),
+            'run_start_uids': entry(self._run_start_uids),
+            'suspenders': entry(self._suspenders),
+            'run_bundlers': entry(self._run_bundlers),
+        }
+        default_run_key = _extract_run_key(Msg(None))
+        for run_key, bundler in tuple(self._run_bundlers.items()):
+            if run_key is default_run_key:
+                run_key = None
+            for name, container in bundler.caches().items():
+                report['run[{}].{}'.format(run_key, name)] = entry(container)
+        return report
+
     @property
     def resumable(self):
         "i.e., can the plan in progress by rewound"
@@ -660,12 +814,33 @@ class RunEngine:
             If True, pause at the next checkpoint.
             False by default.
         """
+        if self._th is None:
+            raise RuntimeError(OWNED_LOOP_PAUSE_ERR_MSG)
         future = asyncio.run_coroutine_threadsafe(
             self._request_pause_coro(defer),
             loop=self.loop)
         # TODO add a timeout here?
         return future.result()
 
+    async def pause_async(self, defer=False):
+        """
+        Command the Run Engine to pause, from its event loop.
+
+        This is the asynchronous counterpart of :meth:`RunEngine.request_pause`,
+        which would deadlock if it were called on the RunEngine's loop. The
+        awaiting :meth:`RunEngine.run` raises ``RunEngineInterrupted`` once the
+        plan is paused.
+
+        Parameters
+        ----------
+        defer : bool, optional
+            If False, pause immediately before processing any new messages.
+            If True, pause at the next checkpoint.
+            False by default.
+        """
+        self._check_async_call()
+        await self._request_pause_coro(defer)
+
     async def _request_pause_coro(self, defer=False):
         # We are pausing. Cancel any deferred pause previously requested.
         if defer:
@@ -715,6 +890,8 @@ class RunEngine:
             raise RuntimeError("The RunEngine is panicked and "
                                "cannot be recovered. "
                                "You must restart bluesky.")
+        if self._th is None:
+            raise RuntimeError(OWNED_LOOP_ERR_MSG)
         # This scheme lets us make 'plan' and 'subs' POSITIONAL ONLY, reserving
         # all keyword arguments for user metdata.
         arguments = _call_sig.bind(self, *args, **metadata_kw).arguments
@@ -735,6 +912,109 @@ class RunEngine:
                 text = MAX_DEPTH_EXCEEDED_ERR_MSG.format(self.max_depth, depth)
                 raise RuntimeError(text)
 
+        self._prepare_plan(plan, subs, metadata_kw)
+        self._resume_task(init_func=self._build_run_task)
+
+        if self._interrupted:
+            raise RunEngineInterrupted(self.pause_msg) from None
+
+        return tuple(self._run_start_uids)
+
+    __call__.__signature__ = _call_sig
+
+    async def run(self, plan, subs=None, **metadata_kw):
+        """Execute a plan, from a coroutine running on the RunEngine's loop.
+
+        This is the asynchronous counterpart of :meth:`RunEngine.__call__`,
+        for applications that run the event loop themselves. The plan is
+        executed by a task on the same loop, with no other thread involved.
+        Create the RunEngine from a coroutine, or once its loop is running,
+        so that it does not start a thread to run the loop.
+
+        ``RunEngine.context_managers`` are not entered; in particular, Ctrl+C
+        is not handled. Use :meth:`pause_async`, :meth:`abort_async`, etc.,
+        or cancel the awaiting task, which halts the plan.
+
+        Parameters
+        ----------
+        plan : generator
+            a generator or that yields ``Msg`` objects (or an iterable that
+            returns such a generator)
+        subs : callable, list, or dict, optional
+            Temporary subscriptions (a.k.a. callbacks) to be used on this run,
+            as for :meth:`RunEngine.__call__`
+        **metadata_kw
+            metadata recorded with any run(s) created by executing the plan
+
+        Returns
+        -------
+        uids : tuple
+            uids (i.e. RunStart Document uids) of run(s)
+
+        Raises
+        ------
+        RunEngineInterrupted
+            if the plan is paused, aborted, stopped or halted
+
+        Examples
+        --------
+        >>> async def main():
+        ...     RE = RunEngine(loop=asyncio.get_event_loop())
+        ...     uids = await RE.run(count([det]))
+        >>> asyncio.get_event_loop().run_until_complete(main())
+        """
+        self._check_async_call()
+        self._prepare_plan(plan, subs, metadata_kw)
+        self._run_permit.clear()
+        self._task_fut = self.loop.create_task(self._run())
+        self._task_fut.add_done_callback(lambda task: self._unblock())
+        return await self._await_task()
+
+    def _check_async_call(self):
+        if self.state == 'panicked':
+            raise RuntimeError("The RunEngine is panicked and "
+                               "cannot be recovered. "
+                               "You must restart bluesky.")
+        if asyncio.get_event_loop() is not self.loop:
+            raise RuntimeError("The RunEngine's coroutine methods must be "
+                               "awaited on the RunEngine's event loop.")
+
+    def _unblock(self):
+        "Let RunEngine.__call__ or RunEngine.run return. Call on the loop."
+        self._blocking_event.set()
+        if (self._blocking_waiter is not None
+                and not self._blocking_waiter.done()):
+            self._blocking_waiter.set_result(None)
+
+    async def _await_task(self):
+        "Let the _run task proceed; return like __call__ when it stops."
+        await self._wait_for_task()
+        if self._interrupted:
+            raise RunEngineInterrupted(self.pause_msg) from None
+        return tuple(self._run_start_uids)
+
+    async def _wait_for_task(self):
+        "Let the _run task proceed, and wait until it is done or paused."
+        self._blocking_event.clear()
+        self._blocking_waiter = self.loop.create_future()
+        self._run_permit.set()
+        try:
+            await self._blocking_waiter
+        except asyncio.CancelledError:
+            # The caller gave up waiting; do not leave the plan running.
+            if not self._state.is_idle:
+                await self._halt_coro()
+            raise
+        finally:
+            self._blocking_waiter = None
+        if self._task_fut.done():
+            exc = None if self._task_fut.cancelled() else (
+                self._task_fut.exception())
+            if exc is not None and not isinstance(exc, _RunEnginePanic):
+                raise exc
+
+    def _prepare_plan(self, plan, subs, metadata_kw):
+        "Reset the caches and stack up a plan for a new call to _run."
         # If we are in the wrong state, raise.
         if not self._state.is_idle:
             raise RuntimeError("The RunEngine is in a %s state" % self._state)
@@ -767,9 +1047,7 @@ class RunEngine:
         self._plan = plan  # this ref is just used for metadata introspection
         self._metadata_per_call.update(metadata_kw)
 
-        gen = ensure_generator(plan)
-        for wrapper_func in self.preprocessors:
-            gen = wrapper_func(gen)
+        gen = apply_preprocessors(plan, self.preprocessors)
 
         self._plan_stack.append(gen)
         self._response_stack.append(None)
@@ -778,26 +1056,18 @@ class RunEngine:
             self._response_stack.append(None)
         self.log.info("Executing plan %r", self._plan)
 
-        def _build_task():
-            # make sure _run will block at the top
-            self._run_permit.clear()
-            self._blocking_event.clear()
-            self._task_fut = asyncio.run_coroutine_threadsafe(self._run(),
-                                                              loop=self.loop)
-
-            def set_blocking_event(future):
-                self._blocking_event.set()
-
-            self._task_fut.add_done_callback(set_blocking_event)
-
-        self._resume_task(init_func=_build_task)
-
-        if self._interrupted:
-            raise RunEngineInterrupted(self.pause_msg) from None
+    def _build_run_task(self):
+        "Schedule _run on the loop, where it waits for _run_permit."
+        # make sure _run will block at the top
+        self._run_permit.clear()
+        self._blocking_event.clear()
+        self._task_fut = asyncio.run_coroutine_threadsafe(self._run(),
+                                                          loop=self.loop)
 
-        return tuple(self._run_start_uids)
+        def set_blocking_event(future):
+            self._blocking_event.set()
 
-    __call__.__signature__ = _call_sig
+        self._task_fut.add_done_callback(set_blocking_event)
 
     def resume(self):
         """Resume a paused plan from the last checkpoint.
@@ -811,7 +1081,31 @@ class RunEngine:
             raise RuntimeError("The RunEngine is panicked and "
                                "cannot be recovered. "
                                "You must restart bluesky.")
+        if self._th is None:
+            raise RuntimeError(OWNED_LOOP_ERR_MSG)
+        self._prepare_resume()
+        self._resume_task()
+        if self._interrupted:
+            raise RunEngineInterrupted(self.pause_msg) from None
+        return tuple(self._run_start_uids)
 
+    async def resume_async(self):
+        """Resume a paused plan from the last checkpoint, and wait for it.
+
+        This is the asynchronous counterpart of :meth:`RunEngine.resume`,
+        see :meth:`RunEngine.run`.
+
+        Returns
+        -------
+        uids : tuple
+            uids (i.e. RunStart Document uids) of run(s)
+        """
+        self._check_async_call()
+        self._prepare_resume()
+        return await self._await_task()
+
+    def _prepare_resume(self):
+        "Stack up the plan rewound to the last checkpoint."
         # The state machine does not capture the whole picture.
         if not self._state.is_paused:
             raise TransitionError("The RunEngine is the {0} state. "
@@ -828,10 +1122,6 @@ class RunEngine:
         for obj in self._objs_seen:
             if hasattr(obj, 'resume'):
                 obj.resume()
-        self._resume_task()
-        if self._interrupted:
-            raise RunEngineInterrupted(self.pause_msg) from None
-        return tuple(self._run_start_uids)
 
     def _rewind(self):
         '''Clean up in preparation for resuming from a pause or suspension.
@@ -1116,8 +1406,7 @@ class RunEngine:
                 self._exception = RequestAbort()
         else:
             self._task.cancel()
-        for task in self._status_tasks:
-            task.cancel()
+        self._cancel_status_tasks()
 
         return tuple(self._run_start_uids)
 
@@ -1156,11 +1445,54 @@ class RunEngine:
         '''
         return self.__interrupter_helper(self._halt_coro())
 
+    async def abort_async(self, reason=''):
+        """
+        Stop a running or paused plan and mark it as aborted.
+
+        This is the asynchronous counterpart of :meth:`RunEngine.abort`. If the
+        plan is paused, this waits for it to clean up.
+        """
+        return await self._async_interrupter_helper(self._abort_coro(reason))
+
+    async def stop_async(self):
+        """
+        Stop a running or paused plan, but mark it as successful (not aborted).
+
+        This is the asynchronous counterpart of :meth:`RunEngine.stop`. If the
+        plan is paused, this waits for it to clean up.
+        """
+        return await self._async_interrupter_helper(self._stop_coro())
+
+    async def halt_async(self):
+        """
+        Stop the running plan and do not allow the plan a chance to clean up.
+
+        This is the asynchronous counterpart of :meth:`RunEngine.halt`.
+        """
+        return await self._async_interrupter_helper(self._halt_coro())
+
+    async def _async_interrupter_helper(self, coro):
+        try:
+            self._check_async_call()
+        except RuntimeError:
+            coro.close()
+            raise
+        was_paused = self._state == 'paused'
+        uids = await coro
+        if was_paused:
+            # Nobody is awaiting the plan; let it clean up, as the blocking
+            # interrupters do.
+            await self._wait_for_task()
+        return uids
+
     def __interrupter_helper(self, coro):
         if self.state == 'panicked':
             raise RuntimeError("The RunEngine is panicked and "
                                "cannot be recovered. "
                                "You must restart bluesky.")
+        if self._th is None:
+            coro.close()
+            raise RuntimeError(OWNED_LOOP_ERR_MSG)
 
         coro_event = threading.Event()
         task = None
@@ -1239,8 +1571,7 @@ class RunEngine:
                     if not self.resumable:
                         self._run_permit.set()
                         stashed_exception = FailedPause()
-                        for task in self._status_tasks:
-                            task.cancel()
+                        self._cancel_status_tasks()
                         self._state = 'aborting'
                         continue
                 # currently only using 'suspending' to get us into the
@@ -1268,8 +1599,8 @@ class RunEngine:
                             except NoReplayAllowed:
                                 self._reset_checkpoint_state_meth()
                     self._state = 'paused'
-                    # Let RunEngine.__call__ return...
-                    self._blocking_event.set()
+                    # Let RunEngine.__call__ (or RunEngine.run) return...
+                    self._unblock()
 
                     await self._run_permit.wait()
                     # Restore any monitors
@@ -1564,18 +1895,26 @@ class RunEngine:
                                          "message")
 
         # Run scan_id calculation method
-        self.md['scan_id'] = self.scan_id_source(self.md)
+        scan_id = self.scan_id_source(self.md)
+        persistent_md = self._persistent_md_snapshot()
+        self.md['scan_id'] = scan_id
+        self._update_persistent_md_snapshot('scan_id', scan_id)
 
         # For metadata below, info about plan passed to self.__call__ for.
         plan_type = type(self._plan).__name__
         plan_name = getattr(self._plan, '__name__', '')
 
-        # Combine metadata, in order of decreasing precedence:
-        md = ChainMap(self._metadata_per_call,  # from kwargs to self.__call__
-                      msg.kwargs,  # from 'open_run' Msg
-                      {'plan_type': plan_type,  # computed from self._plan
-                       'plan_name': plan_name},
-                      self.md)  # stateful, persistent metadata
+        # Combine metadata, in order of increasing precedence.
+        if getattr(self.md, 'version', None) is None:
+            md = dict(persistent_md)  # stateful, persistent metadata
+        else:
+            # The cached snapshot is shared by every run, so give each its
+            # own nested values, as re-reading the mapping would.
+            md = copy.deepcopy(persistent_md)
+        md['plan_type'] = plan_type  # computed from self._plan
+        md['plan_name'] = plan_name
+        md.update(msg.kwargs)  # from 'open_run' Msg
+        md.update(self._metadata_per_call)  # from kwargs to self.__call__
         # The metadata is final. Validate it now, at the last moment.
         # Use copy for some reasonable (admittedly not total) protection
         # against users mutating the md with their validator.
@@ -1583,11 +1922,40 @@ class RunEngine:
 
         current_run = self._run_bundlers[run_key] = RunBundler(
             md, self.record_interruptions, self.emit, self.emit_sync, self.log,
-            loop=self.loop)
-
-        new_uid = await current_run.open_run(msg)
-        self._run_start_uids.append(new_uid)
-        return new_uid
+            loop=self.loop, time_source=self.time_source,
+            uid_source=self.uid_source)
+
+        run_start_uid = await current_run.open_run(msg)
+        self._run_start_uids.append(run_start_uid)
+        return run_start_uid
+
+    def _persistent_md_snapshot(self):
+        """
+        Return a copy of ``self.md``.
+
+        If ``self.md`` has a ``version`` counter (like
+        :class:`~bluesky.utils.PersistentDict`), the copy is cached until the
+        version changes, so a large or slow (e.g., on-disk) mapping is not
+        re-read for every run. Callers must not mutate it.
+        """
+        md = self.md
+        version = getattr(md, 'version', None)
+        cache = self._persistent_md_cache
+        if (version is None or cache is None or cache[0] is not md or
+                cache[1] != version):
+            cache = self._persistent_md_cache = [md, version, dict(md)]
+        return cache[2]
+
+    def _update_persistent_md_snapshot(self, key, value):
+        "Apply a change the RunEngine made to self.md to the cached copy."
+        md, version, snapshot = self._persistent_md_cache
+        snapshot[key] = value
+        if version is not None and md is self.md:
+            if getattr(md, 'version', None) == version + 1:
+                # Ours was the only change: the copy is still current.
+                self._persistent_md_cache[1] = version + 1
+            else:
+                self._persistent_md_cache = None
 
     async def _close_run(self, msg):
         """Instruct the RunEngine to write the RunStop document
@@ -1777,28 +2145,11 @@ class RunEngine:
         group = kwargs.pop("group", None)
 
         ret = obj.kickoff(*msg.args, **kwargs)
-        p_event = asyncio.Event(loop=self.loop)
-        pardon_failures = self._pardon_failures
+        on_failure = self._status_failure_handler()
 
         await current_run.kickoff(msg)
 
-        def done_callback():
-            self.log.debug(
-                "The object %r reports 'kickoff' is done " "with status %r",
-                msg.obj,
-                ret.success,
-            )
-            task = self._loop.call_soon_threadsafe(
-                self._status_object_completed, ret, p_event, pardon_failures
-            )
-            self._status_tasks.append(task)
-
-        try:
-            ret.add_callback(done_callback)
-        except AttributeError:
-            # for ophyd < v0.8.0
-            ret.finished_cb = done_callback
-        self._groups[group].add(p_event.wait)
+        self._status_batch(group).add(ret, on_failure, msg.obj, 'kickoff')
         self._status_objs[group].add(ret)
 
         return ret
@@ -1831,26 +2182,8 @@ class RunEngine:
         group = kwargs.pop("group", None)
         ret = msg.obj.complete(*msg.args, **kwargs)
 
-        p_event = asyncio.Event(loop=self.loop)
-        pardon_failures = self._pardon_failures
-
-        def done_callback():
-            self.log.debug(
-                "The object %r reports 'complete' is done " "with status %r",
-                msg.obj,
-                ret.success,
-            )
-            task = self._loop.call_soon_threadsafe(
-                self._status_object_completed, ret, p_event, pardon_failures
-            )
-            self._status_tasks.append(task)
-
-        try:
-            ret.add_callback(done_callback)
-        except AttributeError:
-            # for ophyd < v0.8.0
-            ret.finished_cb = done_callback
-        self._groups[group].add(p_event.wait)
+        self._status_batch(group).add(ret, self._status_failure_handler(),
+                                      msg.obj, 'complete')
         self._status_objs[group].add(ret)
         return ret
 
@@ -1910,25 +2243,91 @@ class RunEngine:
         group = kwargs.pop('group', None)
         self._movable_objs_touched.add(msg.obj)
         ret = msg.obj.set(*msg.args, **kwargs)
-        p_event = asyncio.Event(loop=self.loop)
-        pardon_failures = self._pardon_failures
+        # All the sets in a group are tracked together, so the loop is woken
+        # once when the last of them is done rather than once per device.
+        self._status_batch(group).add(ret, self._status_failure_handler(),
+                                      msg.obj, 'set')
+        self._status_objs[group].add(ret)
 
-        def done_callback():
-            self.log.debug("The object %r reports set is done "
-                           "with status %r", msg.obj, ret.success)
-            task = self._loop.call_soon_threadsafe(
-                self._status_object_completed, ret, p_event, pardon_failures)
-            self._status_tasks.append(task)
+        return ret
+
+    async def _multi_set(self, msg):
+        """
+        Set several devices at once and cache the returned status objects.
+
+        The statuses are tracked as one batch: the RunEngine is woken once,
+        when all of them are done. A failure of any of them is still
+        reported individually, as a FailedStatus for that device's status.
+
+        Expected message object is
+
+            Msg('multi_set', None, {obj1: value1, obj2: value2, ...},
+                group=<GROUP>)
 
+        where the positions may also be given as a sequence of
+        ``(obj, value)`` pairs. Any other keyword arguments are passed to
+        each ``obj.set(value, **kwargs)``. The statuses are returned as a
+        tuple in the same order as the positions.
+        """
+        kwargs = dict(msg.kwargs)
+        group = kwargs.pop('group', None)
+        positions, = msg.args
+        if hasattr(positions, 'items'):
+            positions = positions.items()
+        batch = self._status_batch(group)
+        on_failure = self._status_failure_handler()
+        rets = []
+        for obj, value in positions:
+            self._movable_objs_touched.add(obj)
+            ret = obj.set(value, **kwargs)
+            batch.add(ret, on_failure, obj, 'set')
+            self._status_objs[group].add(ret)
+            rets.append(ret)
+
+        return tuple(rets)
+
+    def _status_batch(self, group):
+        "Get the batch of status objects for a group, creating it if needed."
         try:
-            ret.add_callback(done_callback)
-        except AttributeError:
-            # for ophyd < v0.8.0
-            ret.finished_cb = done_callback
-        self._groups[group].add(p_event.wait)
-        self._status_objs[group].add(ret)
+            return self._status_batches[group]
+        except KeyError:
+            batch = _StatusBatch(self._schedule_status_task, self.log,
+                                 loop=self.loop)
+            self._status_batches[group] = batch
+            self._groups[group].add(batch.wait)
+            return batch
+
+    def _schedule_status_task(self, func, *args):
+        "Thread-safely schedule a call on the loop, which abort can cancel."
+        def run():
+            # Forget the handle once it has run, so that a long scan does
+            # not accumulate one per status object.
+            with self._status_tasks_lock:
+                self._status_tasks.discard(task)
+            func(*args)
+
+        with self._status_tasks_lock:
+            task = self._loop.call_soon_threadsafe(run)
+            self._status_tasks.add(task)
+
+    def _cancel_status_tasks(self):
+        "Cancel the status callbacks that have not yet run."
+        with self._status_tasks_lock:
+            tasks = list(self._status_tasks)
+            self._status_tasks.clear()
+        for task in tasks:
+            task.cancel()
 
-        return ret
+    def _status_failure_handler(self):
+        "Report a failed status unless this __call__ is over."
+        pardon_failures = self._pardon_failures
+
+        def on_failure(ret):
+            if not pardon_failures.is_set():
+                with self._state_lock:
+                    self._exception = FailedStatus(ret)
+
+        return on_failure
 
     async def _trigger(self, msg):
         """
@@ -1941,22 +2340,8 @@ class RunEngine:
         kwargs = dict(msg.kwargs)
         group = kwargs.pop('group', None)
         ret = msg.obj.trigger(*msg.args, **kwargs)
-        p_event = asyncio.Event(loop=self.loop)
-        pardon_failures = self._pardon_failures
-
-        def done_callback():
-            self.log.debug("The object %r reports trigger is "
-                           "done with status %r.", msg.obj, ret.success)
-            task = self._loop.call_soon_threadsafe(
-                self._status_object_completed, ret, p_event, pardon_failures)
-            self._status_tasks.append(task)
-
-        try:
-            ret.add_callback(done_callback)
-        except AttributeError:
-            # for ophyd < v0.8.0
-            ret.finished_cb = done_callback
-        self._groups[group].add(p_event.wait)
+        self._status_batch(group).add(ret, self._status_failure_handler(),
+                                      msg.obj, 'trigger')
         self._status_objs[group].add(ret)
 
         return ret
@@ -1976,6 +2361,7 @@ class RunEngine:
         else:
             group = msg.kwargs['group']
         futs = list(self._groups.pop(group, []))
+        self._status_batches.pop(group, None)
         if futs:
             status_objs = self._status_objs.pop(group)
             try:
@@ -1994,25 +2380,6 @@ class RunEngine:
                     # cases.
                     self.waiting_hook(None)
 
-    def _status_object_completed(self, ret, p_event, pardon_failures):
-        """
-        Created as a task on the loop when a status object is finished
-
-        Parameters
-        ----------
-        ret : status object
-        p_event : asyncio.Event
-            held in the RunEngine's self._groups cache for waiting
-        pardon_failuers : asyncio.Event
-            tells us whether the __call__ this status object is over
-        """
-        if not ret.success and not pardon_failures.is_set():
-            # TODO: need a better channel to move this information back
-            # to the run task.
-            with self._state_lock:
-                self._exception = FailedStatus(ret)
-        p_event.set()
-
     async def _sleep(self, msg):
         """Sleep the event loop
 
@@ -2263,12 +2630,23 @@ class RunEngine:
         self.emit_sync(name, doc)
 
 
+def _describe_object(obj):
+    "Return a short description of obj for RunEngine.memory_report."
+    name = getattr(obj, 'name', None)
+    if isinstance(name, str):
+        return name
+    description = repr(obj)
+    if len(description) > 80:
+        description = description[:77] + '...'
+    return description
+
+
 class Dispatcher:
     """Dispatch documents to user-defined consumers on the main thread."""
 
     def __init__(self):
         self.cb_registry = CallbackRegistry(allowed_sigs=DocumentNames)
-        self._counter = count()
+        self._num_tokens = 0  # tokens issued so far: 0, 1, 2, ...
         self._token_mapping = dict()
 
     def process(self, name, doc):
@@ -2337,36 +2715,52 @@ class Dispatcher:
             private_tokens = []
             for key in DocumentNames:
                 private_tokens.append(self.cb_registry.connect(key, func))
-            public_token = next(self._counter)
+            public_token = self._new_token()
             self._token_mapping[public_token] = private_tokens
             return public_token
 
         name = DocumentNames[name]
         private_token = self.cb_registry.connect(name, func)
-        public_token = next(self._counter)
+        public_token = self._new_token()
         self._token_mapping[public_token] = [private_token]
         return public_token
 
+    def _new_token(self):
+        token = self._num_tokens
+        self._num_tokens += 1
+        return token
+
     def unsubscribe(self, token):
         """
         Unregister a callback function using its integer ID.
 
+        Unsubscribing a token again does nothing.
+
         Parameters
         ----------
         token : int
             the integer ID issued by :meth:`Dispatcher.subscribe`
 
+        Raises
+        ------
+        KeyError
+            if ``token`` was never issued
+
         See Also
         --------
         :meth:`Dispatcher.subscribe`
         """
-        for private_token in self._token_mapping[token]:
+        if not (isinstance(token, int) and 0 <= token < self._num_tokens):
+            raise KeyError(token)
+        # Forget the token too, or a long session that subscribes per plan
+        # accumulates them.
+        for private_token in self._token_mapping.pop(token, ()):
             self.cb_registry.disconnect(private_token)
 
     def unsubscribe_all(self):
         """Unregister all callbacks from the dispatcher
         """
-        for public_token in self._token_mapping.keys():
+        for public_token in list(self._token_mapping):
             self.unsubscribe(public_token)
 
     @property
@@ -2378,6 +2772,259 @@ class Dispatcher:
         self.cb_registry.ignore_exceptions = val
 
 
+class _DeviceLocks:
+    """
+    The devices held by each plan of a RunEngineGroup.
+
+    A plan holds the root ancestor of every object it uses, from its first
+    message to that object until the plan is over.
+    """
+    def __init__(self):
+        self._owners = {}  # device -> owner
+        self._lock = threading.Lock()
+
+    def acquire(self, owner, objs):
+        "Hold all of objs for owner and return True, or none and return False."
+        devices = {root_ancestor(obj) for obj in objs}
+        with self._lock:
+            if any(self._owners.get(device, owner) is not owner
+                   for device in devices):
+                return False
+            for device in devices:
+                self._owners[device] = owner
+            return True
+
+    def claim(self, owner, obj):
+        "Hold obj for owner, or raise DeviceLocked if another plan holds it."
+        if not self.acquire(owner, [obj]):
+            raise DeviceLocked(
+                "{!r} is in use by another plan".format(
+                    getattr(obj, 'name', obj)))
+
+    def release(self, owner):
+        "Release all the devices held by owner."
+        with self._lock:
+            for device, device_owner in list(self._owners.items()):
+                if device_owner is owner:
+                    del self._owners[device]
+
+    def owners(self):
+        with self._lock:
+            return dict(self._owners)
+
+
+class RunEngineGroup:
+    """
+    Run independent plans concurrently, sharing one event loop.
+
+    Each plan is executed by its own :class:`RunEngine`, with its own run
+    bundlers, caches and temporary subscriptions, but all the RunEngines run
+    on one event loop (and one thread). RunEngines are reused once their plan
+    is done.
+
+    A plan holds every device it uses until it is over. If it tries to use a
+    device held by another plan, :class:`~bluesky.utils.DeviceLocked` is
+    raised in the plan, at the message that used the device. Devices may
+    also be reserved up front, in which case the plan does not start until
+    they are all free.
+
+    A plan that pauses (e.g., on a 'pause' message or a call to the
+    ``request_pause`` method of its RunEngine) keeps its devices, and its
+    future stays pending, until it is resumed with :meth:`resume` or ended
+    with the ``abort``, ``stop`` or ``halt`` method of its RunEngine.
+
+    Parameters
+    ----------
+    md : dict-like, optional
+        The persistent metadata shared by all the plans, see
+        :class:`RunEngine`.
+    loop : asyncio event loop, optional
+        Default is the event loop shared by all RunEngines in this process.
+    **kwargs
+        passed to each :class:`RunEngine`, e.g. ``md_validator`` or
+        ``preprocessors``.
+
+    Attributes
+    ----------
+    md
+        The persistent metadata shared by all the plans
+    dispatcher
+        The :class:`Dispatcher` for the subscriptions to all the plans'
+        documents
+
+    Examples
+    --------
+    Ramp a temperature controller while calibrating a detector.
+
+    >>> group = RunEngineGroup()
+    >>> group.subscribe(LiveTable(['det']))
+    >>> ramp = group.submit(ramp_plan(temperature), devices=[temperature])
+    >>> calibration = group.submit(count([det], 10))
+    >>> calibration.result()  # wait for it and get the uids
+    """
+    def __init__(self, md=None, *, loop=None, **kwargs):
+        if md is None:
+            md = {}
+        if loop is None:
+            loop = get_bluesky_event_loop()
+        self.md = md
+        self.loop = loop
+        self.dispatcher = Dispatcher()
+        self._kwargs = kwargs
+        self._locks = _DeviceLocks()
+        self._idle = deque()  # RunEngines without a plan
+        self._waiting = deque()  # plans waiting for their devices
+        self._lock = threading.Lock()
+
+    def subscribe(self, func, name='all'):
+        """
+        Subscribe a callback to the documents of all plans.
+
+        See :meth:`Dispatcher.subscribe`.
+        """
+        return self.dispatcher.subscribe(func, name)
+
+    def unsubscribe(self, token):
+        "Unsubscribe a callback, see :meth:`Dispatcher.unsubscribe`."
+        self.dispatcher.unsubscribe(token)
+
+    @property
+    def locks(self):
+        "Mapping of each device in use to the RunEngine executing its plan"
+        return self._locks.owners()
+
+    def submit(self, plan, subs=None, *, devices=(), **metadata_kw):
+        """
+        Start executing a plan, without waiting for it.
+
+        Parameters
+        ----------
+        plan : generator
+            a generator or that yields ``Msg`` objects (or an iterable that
+            returns such a generator)
+        subs : callable, list, or dict, optional
+            temporary subscriptions to this plan's documents, as for
+            :meth:`RunEngine.__call__`
+        devices : iterable, optional
+            devices to reserve before the plan starts; it waits until all of
+            them are free
+        **metadata_kw
+            metadata for the run(s) of this plan
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the uids of the plan's runs when the plan is over. It
+            raises the plan's exception if it failed, or
+            ``RunEngineInterrupted`` if it was aborted, stopped or halted.
+            The RunEngine executing the plan is ``future.run_engine``; while
+            the plan is paused, its state is 'paused' and the future is not
+            done.
+        """
+        future = concurrent.futures.Future()
+        future.run_engine = None
+        devices = list(devices)
+        with self._lock:
+            self._waiting.append((future, plan, subs, devices, metadata_kw))
+        self._start_waiting()
+        return future
+
+    def resume(self, future):
+        """
+        Resume a paused plan from its last checkpoint, without waiting for it.
+
+        Parameters
+        ----------
+        future : concurrent.futures.Future
+            as returned by :meth:`submit`
+        """
+        RE = future.run_engine
+        if RE is None or future.done():
+            raise RuntimeError("This plan is not running.")
+        RE._prepare_resume()
+        RE._blocking_event.clear()
+        self.loop.call_soon_threadsafe(RE._run_permit.set)
+
+    def _engine(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        RE = RunEngine(self.md, loop=self.loop, **self._kwargs)
+        RE.subscribe(self._forward)
+        return RE
+
+    def _forward(self, name, doc):
+        self.dispatcher.process(DocumentNames[name], doc)
+
+    def _start_waiting(self):
+        "Start the waiting plans whose devices are free, in order."
+        while True:
+            with self._lock:
+                for item in self._waiting:
+                    future, plan, subs, devices, metadata_kw = item
+                    if self._locks.acquire(future, devices):
+                        self._waiting.remove(item)
+                        break
+                else:
+                    return
+            self._start(*item)
+
+    def _start(self, future, plan, subs, devices, metadata_kw):
+        if not future.set_running_or_notify_cancel():
+            self._locks.release(future)
+            return
+        RE = self._engine()
+        future.run_engine = RE
+        locks = self._locks
+
+        def claim(msg):
+            if msg.obj is not None:
+                try:
+                    locks.claim(future, msg.obj)
+                except DeviceLocked as err:
+                    return _raise(err), None
+            return None, None
+
+        try:
+            plan = plan_mutator(ensure_generator(plan), claim)
+            RE._prepare_plan(plan, subs, metadata_kw)
+            RE._build_run_task()
+        except Exception as err:
+            self._finish(future, RE, err)
+            return
+        RE._task_fut.add_done_callback(
+            lambda task_fut: self._finish(future, RE, None))
+        self.loop.call_soon_threadsafe(RE._run_permit.set)
+
+    def _finish(self, future, RE, exc):
+        if exc is None:
+            try:
+                exc = RE._task_fut.exception()
+            except (asyncio.CancelledError,
+                    concurrent.futures.CancelledError):
+                exc = None
+        if exc is None and RE._interrupted:
+            exc = RunEngineInterrupted(
+                "The plan was interrupted; its exit status is {!r}."
+                "".format(RE._exit_status))
+        uids = tuple(RE._run_start_uids)
+        self._locks.release(future)
+        if RE.state == 'idle':
+            with self._lock:
+                self._idle.append(RE)
+        if exc is None:
+            future.set_result(uids)
+        else:
+            future.set_exception(exc)
+        self._start_waiting()
+
+
+def _raise(exc):
+    "A plan that raises exc."
+    raise exc
+    yield
+
+
 PAUSE_MSG = """
 Your RunEngine is entering a paused state. These are your options for changing
 the state of the RunEngine:
@@ -2400,6 +3047,22 @@ instead:
 http://nsls-ii.github.io/bluesky/plans_intro.html#combining-plans
 """
 
+OWNED_LOOP_ERR_MSG = """
+The RunEngine's event loop is run by the caller, not by a thread of the
+RunEngine, so calling the RunEngine would block the loop forever. From a
+coroutine running on the loop, use this instead:
+
+    await RE.run(plan)
+"""
+
+OWNED_LOOP_PAUSE_ERR_MSG = """
+The RunEngine's event loop is run by the caller, not by a thread of the
+RunEngine, so waiting for the pause would block the loop forever. From a
+coroutine running on the loop, use this instead:
+
+    await RE.pause_async()
+"""
+
 
 def _default_md_validator(md):
     if 'sample' in md and not (hasattr(md['sample'], 'keys') or
@@ -2419,13 +3082,15 @@ def _ensure_event_loop_running(loop):
     Run an asyncio event loop forever on a background thread.
 
     This is idempotent: if the loop is already running nothing will be done.
+    Returns the thread, or None if the loop was started by something else.
     """
     if not loop.is_running():
         th = threading.Thread(target=loop.run_forever, daemon=True)
         th.start()
         _ensure_event_loop_running.loop_to_thread[loop] = th
     else:
-        th = _ensure_event_loop_running.loop_to_thread[loop]
+        # None if the loop is run by the caller, see RunEngine.run.
+        th = _ensure_event_loop_running.loop_to_thread.get(loop)
     return th
 
 
@@ -1,5 +1,11 @@
+import asyncio
+from collections import Counter
+import sys
+import time as ttime
 from warnings import warn
+import numpy as np
 from bluesky.preprocessors import print_summary_wrapper
+from bluesky.utils import ensure_generator, new_uid
 
 
 def plot_raster_path(plan, x_motor, y_motor, ax=None, probe_size=None, lw=2):
@@ -114,3 +120,318 @@ def check_limits(plan):
                 raise LimitsExceeded("This plan would put {} at {} "
                                      "which is outside of its limits, {}."
                                      "".format(msg.obj.name, pos, (low, high)))
+
+
+class DeviceModel:
+    """
+    Timing model of a device, used by :func:`analyze_plan`.
+
+    Parameters
+    ----------
+    velocity : float, optional
+        speed of moves, in units of position per second. If None (default),
+        moves take no time apart from ``settle_time``.
+    settle_time : float, optional
+        time added to every move; default 0
+    exposure_time : float, optional
+        time taken by every trigger; default 0
+    """
+    def __init__(self, velocity=None, settle_time=0, exposure_time=0):
+        self.velocity = velocity
+        self.settle_time = settle_time
+        self.exposure_time = exposure_time
+
+    def move_time(self, start, stop):
+        "Time to move from start to stop (either may be None if unknown)."
+        if self.velocity is None or start is None or stop is None:
+            return self.settle_time
+        try:
+            distance = abs(stop - start)
+        except TypeError:  # not a number, e.g. an enum string
+            distance = 0
+        return distance / self.velocity + self.settle_time
+
+    def __repr__(self):
+        return ('DeviceModel(velocity={!r}, settle_time={!r}, '
+                'exposure_time={!r})'.format(self.velocity, self.settle_time,
+                                             self.exposure_time))
+
+
+class PlanStatistics:
+    """
+    The result of :func:`analyze_plan`.
+
+    Attributes
+    ----------
+    commands : collections.Counter
+        number of messages of each command
+    events : collections.Counter
+        number of Events in each stream, summed over all runs
+    devices : set
+        names of the devices the plan refers to
+    runs : int
+        number of runs opened
+    duration : float
+        estimated time to execute the plan, in seconds
+    """
+    def __init__(self):
+        self.commands = Counter()
+        self.events = Counter()
+        self.devices = set()
+        self.runs = 0
+        self.duration = 0
+
+    def __repr__(self):
+        return ('<PlanStatistics: {} messages, {} runs, {} events, {} '
+                'devices, ~{:.1f} s>'.format(
+                    sum(self.commands.values()), self.runs,
+                    sum(self.events.values()), len(self.devices),
+                    self.duration))
+
+
+class _SimulatedStatus:
+    "A status that is already done, fed back to plans in place of a real one."
+    done = True
+    success = True
+
+    def add_callback(self, callback):
+        callback(self)
+
+
+class _Timeline:
+    """
+    A virtual clock for simulated plans.
+
+    Moves and triggers in a group run in parallel from the moment they are
+    started; waiting on the group advances the clock to the end of the
+    slowest of them.
+    """
+    def __init__(self, models=None, positions=None, start=0):
+        self.models = models or {}
+        self.positions = dict(positions or {})  # device name -> position
+        self.now = start
+        self.pending = {}  # group -> time at which its last action ends
+        self._default_model = DeviceModel()
+
+    def model(self, obj):
+        try:
+            return self.models[obj]
+        except (KeyError, TypeError):
+            return self.models.get(obj.name, self._default_model)
+
+    def start_action(self, group, duration):
+        self.pending[group] = max(self.pending.get(group, self.now),
+                                  self.now + duration)
+
+    def set(self, obj, group, pos):
+        self.start_action(group, self.model(obj).move_time(
+            self.positions.get(obj.name), pos))
+        self.positions[obj.name] = pos
+
+    def trigger(self, obj, group):
+        self.start_action(group, self.model(obj).exposure_time)
+
+    def wait(self, group):
+        self.now = max(self.now, self.pending.pop(group, self.now))
+
+    def sleep(self, duration):
+        self.now += duration
+
+    def end(self):
+        "The time at which everything started so far is done."
+        return max([self.now] + list(self.pending.values()))
+
+    def reading(self, obj):
+        """
+        A reading with the keys of obj.describe(), stamped with the current
+        time, whose values are the position obj was last set to (else 0, or
+        zeros of the described shape).
+        """
+        try:
+            desc = obj.describe()
+        except Exception:
+            desc = {obj.name: {}}
+        reading = {}
+        for key, data_key in desc.items():
+            shape = data_key.get('shape')
+            if shape:
+                value = np.zeros(shape)
+            else:
+                value = self.positions.get(obj.name, 0)
+            reading[key] = {'value': value, 'timestamp': self.now}
+        return reading
+
+
+def analyze_plan(plan, *, models=None, initial_positions=None,
+                 message_overhead=0):
+    """
+    Consume a plan without hardware and estimate what it would do.
+
+    Plausible responses are sent back into the plan in place of the RunEngine:
+    statuses that are already done, a new uid for each run and, for each
+    'read', a reading with the keys of the device's ``describe()`` and the
+    position the plan last set it to (else 0) as the value.
+
+    The duration is estimated by stepping a clock through the messages:
+    moves and triggers in a group run in parallel and a 'wait' advances the
+    clock to the end of the slowest of them; 'sleep' advances it directly.
+    Flyers ('kickoff', 'complete') and 'wait_for' are counted but take no time.
+
+    Parameters
+    ----------
+    plan : iterable
+        Must yield `Msg` objects
+    models : dict, optional
+        maps devices (or their names) to :class:`DeviceModel` instances.
+        Devices without a model move and trigger instantly.
+    initial_positions : dict, optional
+        maps devices (or their names) to their positions before the plan
+        starts, used to estimate the length of the first move
+    message_overhead : float, optional
+        time added for every message, e.g. the RunEngine's own overhead;
+        default 0
+
+    Returns
+    -------
+    stats : PlanStatistics
+
+    Examples
+    --------
+    >>> stats = analyze_plan(scan([det], motor, -1, 1, 10),
+    ...                      models={motor: DeviceModel(velocity=0.5)})
+    >>> stats.events
+    Counter({'primary': 10})
+    """
+    positions = {getattr(obj, 'name', obj): pos
+                 for obj, pos in (initial_positions or {}).items()}
+    timeline = _Timeline(models, positions)
+    stats = PlanStatistics()
+    stream = None
+    status = _SimulatedStatus()
+
+    plan = ensure_generator(plan)
+    response = None
+    while True:
+        try:
+            msg = plan.send(response)
+        except StopIteration:
+            break
+        response = None
+        cmd = msg.command
+        stats.commands[cmd] += 1
+        timeline.sleep(message_overhead)
+        group = msg.kwargs.get('group')
+        if msg.obj is not None:
+            stats.devices.add(getattr(msg.obj, 'name', repr(msg.obj)))
+        if cmd == 'open_run':
+            stats.runs += 1
+            response = new_uid()
+        elif cmd == 'create':
+            stream = msg.kwargs.get('name', msg.args[0] if msg.args
+                                    else 'primary')
+        elif cmd == 'save':
+            stats.events[stream] += 1
+        elif cmd == 'read':
+            response = timeline.reading(msg.obj)
+        elif cmd == 'set':
+            timeline.set(msg.obj, group, msg.args[0])
+            response = status
+        elif cmd == 'multi_set':
+            positions, = msg.args
+            if hasattr(positions, 'items'):
+                positions = positions.items()
+            positions = list(positions)
+            for obj, pos in positions:
+                stats.devices.add(getattr(obj, 'name', repr(obj)))
+                timeline.set(obj, group, pos)
+            response = (status,) * len(positions)
+        elif cmd == 'trigger':
+            timeline.trigger(msg.obj, group)
+            response = status
+        elif cmd in ('kickoff', 'complete'):
+            response = status
+        elif cmd == 'wait':
+            timeline.wait(msg.args[0] if msg.args else group)
+        elif cmd == 'sleep':
+            timeline.sleep(msg.args[0])
+        elif cmd == 'configure':
+            response = ({}, {})
+    stats.duration = timeline.end()
+    return stats
+
+
+class _VirtualTimeSelector:
+    "Wrap a selector so that waiting for a timer advances virtual time."
+    def __init__(self, selector, loop):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if timeout is None or timeout <= 0:
+            # Nothing is scheduled (or something is ready): wait for real
+            # I/O, e.g. a call_soon_threadsafe from another thread.
+            return self._selector.select(timeout)
+        events = self._selector.select(0)
+        if not events:
+            # Idle until the next timer: jump straight to it.
+            self._loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    An event loop whose clock jumps ahead whenever it would otherwise idle.
+
+    Timers (``asyncio.sleep``, ``call_later``, timeouts) fire in order, as
+    soon as there is nothing else ready to run, and :meth:`time` reports the
+    virtual time at which they were due. Use it to run plans that sleep, and
+    suspenders that wait before resuming, without waiting in real time:
+
+    >>> loop = VirtualTimeEventLoop()
+    >>> RE = RunEngine({}, loop=loop, time_source=loop.time)
+
+    Passing ``loop.time`` as the ``time_source`` stamps documents with the
+    same virtual time. Work done on other threads (e.g. a device reporting
+    that it finished moving) still takes real time, and timers may fire
+    while it is in progress.
+
+    Parameters
+    ----------
+    start : float, optional
+        virtual time at the start; default is the current time
+    selector : selectors.BaseSelector, optional
+        passed to :class:`asyncio.SelectorEventLoop`
+    """
+    def __init__(self, start=None, selector=None):
+        super().__init__(selector)
+        if start is None:
+            start = ttime.time()
+        self._virtual_time = start
+        self._selector = _VirtualTimeSelector(self._selector, self)
+
+    def time(self):
+        return self._virtual_time
+
+    def advance(self, seconds):
+        "Move the virtual clock forward."
+        self._virtual_time += seconds
+
+
+def __getattr__(name):
+    # SimRunEngine subclasses RunEngine, so it is defined in its own module
+    # and imported on first access (PEP 562); the rest of this module does
+    # not need the RunEngine.
+    if name == 'SimRunEngine':
+        from bluesky._sim_run_engine import SimRunEngine
+        globals()[name] = SimRunEngine
+        return SimRunEngine
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is not supported; import it now.
+    __getattr__('SimRunEngine')
@@ -25,6 +25,27 @@ def RE(request):
     return RE
 
 
+@pytest.fixture(scope='function')
+def virtual_RE(request):
+    "A RunEngine on a VirtualTimeEventLoop, so sleeping takes no time."
+    from bluesky.simulators import VirtualTimeEventLoop
+    loop = VirtualTimeEventLoop(start=0)
+    RE = RunEngine({}, loop=loop, time_source=loop.time)
+
+    def clean_event_loop():
+        if RE.state not in ('idle', 'panicked'):
+            try:
+                RE.halt()
+            except TransitionError:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        RE._th.join()
+        loop.close()
+
+    request.addfinalizer(clean_event_loop)
+    return RE
+
+
 @pytest.fixture(scope='function')
 def hw(tmpdir):
     from ophyd.sim import hw
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import bluesky.plans as bp
+from bluesky.adaptive import (GradientStrategy, CurvatureStrategy,
+                              UncertaintyStrategy, CallableStrategy)
+from bluesky.tests.utils import DocCollector
+
+
+def _positions(RE, plan):
+    d = DocCollector()
+    RE.subscribe(d.insert)
+    rs, = RE(plan)
+    desc, = d.descriptor[rs]
+    return [ev['data']['motor'] for ev in d.event[desc['uid']]]
+
+
+@pytest.mark.parametrize('lookahead', [1, 3])
+@pytest.mark.parametrize('strategy_factory', [
+    lambda: GradientStrategy(-5, 5, 0.05, max_points=25),
+    lambda: CurvatureStrategy(-5, 5, 0.05, max_points=25),
+])
+def test_interval_strategies_refine_peak(RE, hw, strategy_factory, lookahead):
+    # hw.det is a Gaussian centered on motor = 0
+    xs = _positions(RE, bp.adaptive_strategy_scan(
+        [hw.det], 'det', hw.motor, strategy_factory(), lookahead=lookahead))
+    assert len(xs) == 25
+    assert len(set(xs)) == len(xs)
+    xs = np.asarray(xs)
+    # Far more samples on the peak than in the flat tails.
+    assert np.sum(np.abs(xs) < 2.5) > 2 * np.sum(np.abs(xs) >= 2.5)
+
+
+def test_uncertainty_strategy(RE, hw):
+    strategy = UncertaintyStrategy(-5, 5, 1.0, max_points=40)
+    xs = _positions(RE, bp.adaptive_strategy_scan(
+        [hw.det], 'det', hw.motor, strategy, lookahead=2))
+    # It stops once the model is certain enough, spreading points evenly.
+    assert 3 < len(xs) < 40
+    assert max(np.diff(sorted(xs))) < 1.0
+
+
+def test_callable_strategy(RE, hw):
+    def propose(xs, ys, pending, n):
+        if len(xs) + len(pending) >= 4:
+            return []
+        return [len(xs) + len(pending)]
+
+    strategy = CallableStrategy(propose)
+    xs = _positions(RE, bp.adaptive_strategy_scan(
+        [hw.det], 'det', hw.motor, strategy))
+    assert xs == [0, 1, 2, 3]
+    assert len(strategy.ys) == 4
+    assert not strategy.pending
+
+
+def test_strategy_min_step():
+    strategy = GradientStrategy(0, 1, 0.3, initial_points=2)
+    assert strategy.ask(5) == [0, 1]
+    strategy.tell(0, 0)
+    strategy.tell(1, 1)
+    assert strategy.ask(5) == [0.5]
+    strategy.tell(0.5, 0.5)
+    # Both halves are narrower than twice min_step.
+    assert strategy.ask(5) == []
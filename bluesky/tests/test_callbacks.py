@@ -289,6 +289,33 @@ def test_live_fit(RE, hw):
         assert np.allclose(cb.result.values[k], v, atol=1e-6)
 
 
+@pytest.mark.parametrize('warm_start, background',
+                         [(True, False), (False, True), (True, True)])
+def test_live_fit_incremental(RE, hw, warm_start, background):
+    try:
+        import lmfit
+    except ImportError:
+        raise pytest.skip('requires lmfit')
+
+    def gaussian(x, A, sigma, x0):
+        return A * np.exp(-(x - x0) ** 2 / (2 * sigma ** 2))
+
+    model = lmfit.Model(gaussian)
+    init_guess = {'A': 2,
+                  'sigma': lmfit.Parameter('sigma', 3, min=0),
+                  'x0': -0.2}
+    cb = LiveFit(model, 'det', {'x': 'motor'}, init_guess,
+                 update_every=5, warm_start=warm_start, background=background)
+    RE(scan([hw.det], hw.motor, -1, 1, 50), cb)
+    assert not cb.fitting
+
+    expected = {'A': 1, 'sigma': 1, 'x0': 0}
+    for k, v in expected.items():
+        assert np.allclose(cb.result.values[k], v, atol=1e-6)
+    # The final fit always sees every point.
+    assert cb.result.ndata == 50
+
+
 def test_live_fit_multidim(RE, hw):
 
     try:
@@ -528,6 +555,51 @@ def test_broken_table():
         assert ln.strip() == "failed to format row"
 
 
+def _run_table(n, **kwargs):
+    start_doc, descriptor_factory, *_ = compose_run(
+        metadata={'plan_type': 'generator', 'plan_name': 'count',
+                  'scan_id': 1})
+    desc, compose_event, _ = descriptor_factory(
+        name="primary",
+        data_keys={
+            "x": {"dtype": "integer", "source": "", "shape": []},
+            "y": {"dtype": "number", "source": "", "shape": []},
+        },
+    )
+    stop_doc = {'uid': 'stop', 'run_start': start_doc['uid'],
+                'time': time.time(), 'exit_status': 'success'}
+    calls = []
+    LT = LiveTable(["x", "y"], out=calls.append, **kwargs)
+    LT("start", start_doc)
+    LT("descriptor", desc)
+    for i in range(n):
+        LT("event", compose_event(data={"x": i, "y": i / 2},
+                                  timestamps={"x": 0, "y": 0}, time=0))
+    LT("stop", stop_doc)
+    return calls
+
+
+def test_table_buffered():
+    unbuffered = _run_table(10)
+    buffered = _run_table(10, buffer_size=4)
+    # 3 header lines + 10 rows + 1 border, plus the watermark
+    assert len(unbuffered) == 15
+    # flushed after 4, 8 and 12 lines, then the rest at stop
+    assert len(buffered) == 5
+    # same lines, apart from the watermark (which includes the uid)
+    assert '\n'.join(buffered[:-1]) == '\n'.join(unbuffered[:-1])
+    assert '|      4.500 |' in unbuffered[-3]
+
+
+def test_table_print_every():
+    calls = _run_table(10, print_every=4)
+    rows = [ln for ln in calls[3:] if ln.startswith('|')]
+    # rows 1, 5 and 9, plus the last row
+    assert [int(r.split('|')[1]) for r in rows] == [1, 5, 9, 10]
+    assert calls[-2] == LiveTable.summary.format(shown=4, total=10,
+                                                 print_every=4)
+
+
 def test_callback_safe():
     @make_callback_safe
     def test_function(to_fail):
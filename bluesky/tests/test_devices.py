@@ -108,6 +108,54 @@ def test_monitor_with_pause_resume(RE):
     assert len(docs) == 6  # two new Events + RunStop
 
 
+@requires_ophyd
+def test_monitor_uses_delivered_value(RE):
+    docs = DocCollector()
+    a = A('', name='a')
+
+    def read():
+        raise AssertionError("monitor should not re-read a Signal")
+
+    def plan():
+        yield Msg('open_run')
+        yield Msg('monitor', a.s1, name='s1_monitor', buffer_size=3)
+        # These all land in the buffer before the loop gets a chance to
+        # drain it.
+        a.s1.read = read
+        for i in range(1, 6):
+            a.s1.put(i)
+        yield Msg('close_run')
+
+    RE(plan(), docs.insert)
+    desc, = docs.descriptor.values()
+    events = docs.event[desc[0]['uid']]
+    # The oldest updates were dropped when the buffer overflowed.
+    assert [ev['data']['a_s1'] for ev in events] == [3, 4, 5]
+    assert [ev['seq_num'] for ev in events] == [1, 2, 3]
+    stop, = docs.stop.values()
+    assert stop['num_events'] == {}
+
+
+@requires_ophyd
+def test_monitor_min_interval(RE):
+    docs = DocCollector()
+    a = A('', name='a')
+
+    def plan():
+        yield Msg('open_run')
+        yield Msg('monitor', a.s1, min_interval=60)
+        for i in range(1, 6):
+            a.s1.put(i)
+            yield Msg('null')
+        yield Msg('close_run')
+
+    RE(plan(), docs.insert)
+    desc, = docs.descriptor.values()
+    events = docs.event[desc[0]['uid']]
+    # Only the first update is accepted.
+    assert [ev['data']['a_s1'] for ev in events] == [1]
+
+
 def _make_overlapping_raising_tests(func):
     labels = ['part_v_whole',
               'whole_v_part',
@@ -6,7 +6,8 @@ from itertools import zip_longest
 from bluesky import Msg
 
 from bluesky.preprocessors import (msg_mutator, stub_wrapper,
-                                   plan_mutator, pchain, single_gen as
+                                   plan_mutator, fused_plan_mutator,
+                                   pchain, single_gen as
                                    single_message_gen,
                                    finalize_wrapper)
 
@@ -462,3 +463,141 @@ def test_stub_wrapper():
     stub_plan = list(stub_wrapper(plan()))
     assert len(stub_plan) == 1
     assert stub_plan[0].command == 'read'
+
+
+def test_fused_plan_mutator_matches_nesting():
+
+    def target():
+        yield Msg('open_run')
+        for i in range(3):
+            ret = yield Msg('TARGET', i)
+            assert ret.command == 'TARGET'
+        yield Msg('close_run')
+
+    def wrap_target(msg):
+        # insert before and after, passing the message itself through
+        if msg.command == 'TARGET':
+            def pre():
+                yield Msg('pre', msg.obj)
+                return (yield msg)
+
+            return pre(), single_message_gen(Msg('post', msg.obj))
+        return None, None
+
+    def tag_inserted(msg):
+        # sees the messages inserted by wrap_target
+        if msg.command in ('pre', 'post'):
+            tagged = msg._replace(command=msg.command + '!')
+            return single_message_gen(tagged), None
+        return None, None
+
+    def after_open(msg):
+        if msg.command == 'open_run':
+            return None, single_message_gen(Msg('TARGET', 'extra'))
+        return None, None
+
+    procs = [wrap_target, tag_inserted, after_open]
+    nested = target()
+    for proc in procs:
+        nested = plan_mutator(nested, proc)
+    expected = EchoRE(nested)
+    actual = EchoRE(fused_plan_mutator(target(), procs))
+    assert actual == expected
+    # the 'TARGET' inserted by the last function is not seen by the first
+    assert [m.command for m in actual[:3]] == ['open_run', 'TARGET', 'pre!']
+
+
+def test_plan_mutator_does_not_retain_messages():
+    import gc
+    import weakref
+
+    class Payload:
+        ...
+
+    refs = []
+
+    def plan():
+        for i in range(5):
+            payload = Payload()
+            refs.append(weakref.ref(payload))
+            yield Msg('set', None, payload)
+
+    def insert_after(msg):
+        return None, single_message_gen(Msg('null'))
+
+    gen = plan_mutator(plan(), insert_after)
+    ret = None
+    for i in range(8):
+        ret = gen.send(ret)
+    gc.collect()
+    # every message but the ones still in flight has been released
+    assert sum(ref() is not None for ref in refs) <= 1
+
+
+def test_msg_processor_transforms():
+    from bluesky.preprocessors import MsgProcessor, apply_preprocessors
+
+    def plan():
+        ret = yield Msg('a', 1)
+        assert ret.command == 'A'  # the response to the replacement
+        ret = yield Msg('drop')
+        assert ret is None
+        yield Msg('b', 2)
+
+    upper = MsgProcessor.map(lambda msg: msg._replace(
+        command=msg.command.upper()))
+    no_drop = MsgProcessor.filter(lambda msg: msg.command != 'drop')
+    before_b = MsgProcessor.insert_before(
+        lambda msg: [Msg('pre')] if msg.command == 'b' else None)
+    after_a = MsgProcessor.insert_after(
+        lambda msg: [Msg('post')] if msg.command == 'A' else None)
+    preprocessors = [no_drop, before_b, upper, after_a]
+    msgs = EchoRE(apply_preprocessors(plan(), preprocessors))
+    # 'pre' is inserted inside 'upper', so it is mapped too
+    assert [m.command for m in msgs] == ['A', 'post', 'PRE', 'B']
+
+    # nesting the same preprocessors gives the same messages
+    nested = plan()
+    for preprocessor in preprocessors:
+        nested = preprocessor(nested)
+    assert EchoRE(nested) == msgs
+
+
+def test_apply_preprocessors_mixed():
+    from bluesky.preprocessors import MsgProcessor, apply_preprocessors
+
+    def plan():
+        yield Msg('a')
+        yield Msg('b')
+
+    def tag(plan):
+        return msg_mutator(plan, lambda msg: msg._replace(
+            command=msg.command + '!'))
+
+    add_c = MsgProcessor.insert_after(
+        lambda msg: [Msg('c')] if msg.command == 'a' else None)
+    add_d = MsgProcessor.insert_after(
+        lambda msg: [Msg('d')] if msg.command == 'a!' else None)
+    msgs = EchoRE(apply_preprocessors(plan(), [add_c, tag, add_d]))
+    # the generator preprocessor runs between the two message-level ones
+    assert [m.command for m in msgs] == ['a!', 'd', 'c!', 'b!']
+
+
+def test_apply_preprocessors_overridden_call():
+    from bluesky.preprocessors import (MsgProcessor, SupplementalData,
+                                       apply_preprocessors)
+
+    class TaggedData(SupplementalData):
+        def __call__(self, plan):
+            plan = msg_mutator(plan, lambda msg: msg._replace(
+                command=msg.command + '!'))
+            return (yield from super().__call__(plan))
+
+    def plan():
+        yield Msg('a')
+
+    add_b = MsgProcessor.insert_after(
+        lambda msg: [Msg('b')] if msg.command == 'a' else None)
+    msgs = EchoRE(apply_preprocessors(plan(), [add_b, TaggedData()]))
+    # the subclass's __call__ is used, not just its msg_procs
+    assert [m.command for m in msgs] == ['a!', 'b!']
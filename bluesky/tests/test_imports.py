@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+import bluesky
+import bluesky.callbacks
+
+
+def _imported_after(statement, modules):
+    "Return those of ``modules`` imported by ``statement`` in a fresh process."
+    code = ('import sys\n{}\n'
+            'print(" ".join(m for m in {!r} if m in sys.modules))'
+            .format(statement, modules))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return output.decode().split()
+
+
+HEAVY = ['numpy', 'event_model', 'jsonschema', 'tqdm', 'toolz', 'zict',
+         'super_state_machine', 'bluesky.run_engine', 'bluesky.utils']
+
+
+@pytest.mark.parametrize('statement, allowed', [
+    ('import bluesky', []),
+    ('import bluesky.callbacks', []),
+    ('from bluesky import Msg', ['numpy', 'zict', 'bluesky.utils']),
+    ('import bluesky.callbacks.core', ['numpy', 'zict', 'bluesky.utils']),
+    ('import bluesky.simulators',
+     ['numpy', 'toolz', 'zict', 'bluesky.utils']),
+])
+def test_import_is_lazy(statement, allowed):
+    # A regression test of import time, counting modules rather than seconds.
+    imported = _imported_after(statement, HEAVY)
+    assert set(imported) <= set(allowed)
+
+
+def test_lazy_attributes():
+    from bluesky.run_engine import RunEngine
+    from bluesky.utils import Msg
+    from bluesky.callbacks.core import LiveTable
+    assert bluesky.RunEngine is RunEngine
+    assert bluesky.Msg is Msg
+    assert bluesky.callbacks.LiveTable is LiveTable
+    assert isinstance(bluesky.__version__, str)
+    assert {'RunEngine', 'Msg', '__version__'} <= set(dir(bluesky))
+    assert 'LiveTable' in dir(bluesky.callbacks)
+    with pytest.raises(AttributeError):
+        bluesky.no_such_name
+    with pytest.raises(AttributeError):
+        bluesky.callbacks.no_such_name
+
+
+def test_submodule_attributes():
+    # Submodules that used to be imported along with the package are still
+    # available as attributes; others are not, even if they fail to import.
+    code = ('import bluesky, bluesky.callbacks\n'
+            'print(bluesky.plan_stubs.__name__,'
+            ' bluesky.callbacks.fitting.__name__,'
+            ' hasattr(bluesky, "magics"), hasattr(bluesky, "simulators"),'
+            ' hasattr(bluesky.callbacks, "zmq"))')
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode().split() == ['bluesky.plan_stubs',
+                                       'bluesky.callbacks.fitting',
+                                       'False', 'False', 'False']
@@ -6,3 +6,103 @@ def test_blueskyversion(RE):
 
 def test_ophydversion(RE):
     assert RE.md['versions'].get('ophyd') == ophyd.__version__
+
+
+def test_md_validator_copy(RE, hw):
+    import jsonschema
+    import pytest
+    from bluesky.plans import count
+    seen = []
+    docs = []
+    schema = {'type': 'object', 'required': ['sample']}
+
+    def validator(md):
+        # A plain dict, as JSON schema validation requires
+        jsonschema.validate(md, schema)
+        seen.append(dict(md))
+        md['sample'] = 'mutated'
+
+    RE.md_validator = validator
+    RE.md['sample'] = 'dirt'
+    RE.subscribe(lambda name, doc: docs.append(doc), 'start')
+    RE(count([hw.det]), operator='me')
+    md, = seen
+    assert md['sample'] == 'dirt'
+    assert md['operator'] == 'me'
+    assert md['plan_name'] == 'count'
+    assert md['scan_id'] == 1
+    # Mutating the copy changes neither the run nor RE.md.
+    assert docs[0]['sample'] == 'dirt'
+    assert RE.md['sample'] == 'dirt'
+
+    del RE.md['sample']
+    with pytest.raises(jsonschema.ValidationError):
+        RE(count([hw.det]))
+
+
+def test_persistent_md_cached_by_version(RE, hw):
+    from collections.abc import MutableMapping
+    from bluesky.plans import count
+
+    class VersionedDict(MutableMapping):
+        def __init__(self):
+            self._d = {}
+            self.version = 0
+            self.copies = 0
+
+        def __getitem__(self, key):
+            return self._d[key]
+
+        def __setitem__(self, key, value):
+            self._d[key] = value
+            self.version += 1
+
+        def __delitem__(self, key):
+            del self._d[key]
+            self.version += 1
+
+        def __iter__(self):
+            self.copies += 1
+            return iter(self._d)
+
+        def __len__(self):
+            return len(self._d)
+
+    RE.md = VersionedDict()
+    RE.md['beamline'] = 'X'
+    docs = []
+    RE.subscribe(lambda name, doc: docs.append(doc), 'start')
+    for _ in range(3):
+        RE(count([hw.det]))
+    # copied once; the RunEngine's own scan_id updates do not invalidate it
+    assert RE.md.copies == 1
+    assert [doc['scan_id'] for doc in docs] == [1, 2, 3]
+
+    RE.md['beamline'] = 'Y'
+    RE(count([hw.det]))
+    assert RE.md.copies == 2
+    assert docs[-1]['beamline'] == 'Y'
+    assert docs[-1]['scan_id'] == 4
+
+
+def test_persistent_md_nested_values_not_shared(RE, hw, tmp_path):
+    from bluesky.plans import count
+    from bluesky.utils import PersistentDict
+
+    RE.md = PersistentDict(tmp_path)
+    RE.md['sample'] = {'name': 'dirt'}
+    seen = []
+    docs = []
+
+    def mutate(name, doc):
+        docs.append(doc)
+        doc['sample']['name'] = 'mutated'
+
+    RE.md_validator = lambda md: seen.append(md['sample']['name'])
+    RE.subscribe(mutate, 'start')
+    RE(count([hw.det]))
+    RE(count([hw.det]))
+    # Mutating one run's start document reaches neither later runs nor RE.md.
+    assert seen == ['dirt', 'dirt']
+    assert docs[0]['sample'] is not docs[1]['sample']
+    assert RE.md['sample'] == {'name': 'dirt'}
@@ -1,6 +1,8 @@
 import collections.abc
+import gc
 
 import numpy
+import pytest
 from numpy.testing import assert_array_equal
 
 from ..utils import PersistentDict
@@ -51,6 +53,84 @@ def test_integration(tmp_path, RE, hw):
     recursive_assert_equal(reloaded, expected)
 
 
+def test_write_behind(tmp_path):
+    directory = tmp_path / 'md'
+    d = PersistentDict(directory, write_behind=True, flush_interval=None)
+    d['a'] = 1
+    d['c'] = numpy.zeros((5, 5))
+    d['gone'] = 1
+    del d['gone']
+    expected = dict(d)
+    # Nothing has been written to the directory yet...
+    assert PersistentDict(directory) == {}
+    # A second write-behind instance would share the journal.
+    with pytest.raises(RuntimeError):
+        PersistentDict(directory, write_behind=True)
+
+    # ...but the changes are journaled, so they are recovered if d is lost
+    # without being closed, as if the process died now.
+    del d
+    gc.collect()
+    d = PersistentDict(directory, write_behind=True, flush_interval=None)
+    recursive_assert_equal(d, expected)
+
+    d['a'] = 2
+    d.flush()
+    expected = dict(d)
+    recursive_assert_equal(PersistentDict(directory), expected)
+    d.close()
+    assert not (tmp_path / 'md.journal').exists()
+    recursive_assert_equal(PersistentDict(directory), expected)
+    # Once closed, the directory may be opened again.
+    PersistentDict(directory, write_behind=True, flush_interval=None).close()
+
+
+def test_write_behind_partial_record(tmp_path):
+    directory = tmp_path / 'md'
+    journal = tmp_path / 'md.journal'
+    d = PersistentDict(directory, write_behind=True, flush_interval=None)
+    d['a'] = 1
+    d.flush()
+    d['b'] = 2
+    del d
+    gc.collect()
+    # as if the process died while writing its only record
+    journal.write_bytes(journal.read_bytes()[:-3])
+    d = PersistentDict(directory, write_behind=True, flush_interval=None)
+    recursive_assert_equal(d, {'a': 1})
+
+    # Records written after recovering are not lost behind the partial one.
+    d['c'] = 3
+    d['d'] = 4
+    del d
+    gc.collect()
+    journal.write_bytes(journal.read_bytes()[:-3])
+    d = PersistentDict(directory, write_behind=True, flush_interval=None)
+    recursive_assert_equal(d, {'a': 1, 'c': 3})
+    d.close()
+    recursive_assert_equal(PersistentDict(directory), {'a': 1, 'c': 3})
+
+
+def test_write_behind_interval(tmp_path):
+    import time
+    d = PersistentDict(tmp_path / 'md', write_behind=True,
+                       flush_interval=0.05)
+    d['scan_id'] = 3
+    time.sleep(0.5)
+    assert PersistentDict(tmp_path / 'md') == {'scan_id': 3}
+    d.close()
+
+
+def test_write_behind_integration(tmp_path, RE, hw):
+    d = PersistentDict(tmp_path, write_behind=True, flush_interval=None)
+    RE.md = d
+    RE(count([hw.det]))
+    RE(count([hw.det]))
+    assert RE.md['scan_id'] == 2
+    d.close()
+    assert PersistentDict(tmp_path)['scan_id'] == 2
+
+
 def recursive_assert_equal(actual, expected):
     assert set(actual.keys()) == set(expected.keys())
     for key in actual:
@@ -97,6 +97,20 @@ def test_mesh_pseudo(hw, RE):
     assert all(df[p3x3.pseudo3.name] == 0)
 
 
+def test_grid_scan_is_lazy(hw):
+    # A 1000 x 1000 x 10 grid must not be expanded to start the scan.
+    plan = bp.grid_scan([hw.det],
+                        hw.motor1, 0, 1, 1000,
+                        hw.motor2, 0, 1, 1000, True,
+                        hw.motor3, 0, 1, 10, True)
+    msgs = [next(plan) for _ in range(10)]
+    open_run, = [msg for msg in msgs if msg.command == 'open_run']
+    assert open_run.kwargs['num_points'] == 10000000
+    assert open_run.kwargs['shape'] == (1000, 1000, 10)
+    sets = [msg for msg in msgs if msg.command == 'set']
+    assert [msg.args[0] for msg in sets[:3]] == [0, 0, 0]
+
+
 def test_rmesh_pseudo(hw, RE):
     p3x3 = hw.pseudo3x3
     p3x3.set(1, -2, 100)
@@ -192,3 +206,78 @@ def test_pseudo_mv(hw, RE, pln):
     expecte_objs = [p, None]
     assert len(m_col.msgs) == 2
     assert [m.obj for m in m_col.msgs] == expecte_objs
+
+
+def test_fly_scan(RE, hw):
+    from ophyd.sim import SynAxis
+
+    motor = SynAxis(name='motor', delay=0.2)
+    d = DocCollector()
+    RE.subscribe(d.insert)
+
+    rs, = RE(bp.fly_scan([hw.det], motor, 0, 1, period=0.02))
+    start, = d.start
+    assert start['plan_name'] == 'fly_scan'
+    assert start['motors'] == ['motor']
+    desc, = d.descriptor[rs]
+    positions = [ev['data']['motor'] for ev in d.event[desc['uid']]]
+    # Readings were taken while the motor was moving, and after it stopped.
+    assert len(positions) > 2
+    assert positions[-1] == 1
+    assert positions == sorted(positions)
+
+
+def test_fly_grid_scan(RE, hw):
+    from ophyd.sim import SynAxis
+
+    motor = SynAxis(name='motor', delay=0.05)
+    d = DocCollector()
+    RE.subscribe(d.insert)
+
+    rs, = RE(bp.fly_grid_scan([hw.det], hw.motor1, 0, 1, 3,
+                              motor, 0, 1, snake=True, period=0.01))
+    start, = d.start
+    assert start['shape'] == (3,)
+    assert start['snaking'] == (False, True)
+    desc, = d.descriptor[rs]
+    events = d.event[desc['uid']]
+    rows = [[ev['data']['motor'] for ev in events
+             if ev['data']['motor1'] == pos] for pos in (0, 0.5, 1)]
+    # Each row ends where the swept axis stops, alternating direction.
+    assert [row[-1] for row in rows] == [1, 0, 1]
+
+
+def test_fly_scan_simulated():
+    from ophyd.sim import motor, det
+    msgs = list(bp.fly_scan([det], motor, 0, 1))
+    sets = [msg for msg in msgs if msg.command == 'set']
+    assert [msg.args[0] for msg in sets] == [0, 1]
+    # Without status objects there is nothing to poll, so the plan goes
+    # straight to waiting for the sweep before the final reading.
+    assert msgs[msgs.index(sets[1]) + 1].command == 'wait'
+
+
+def test_pipelined_per_step(RE, hw):
+    m_col = MsgCollector()
+    RE.msg_hook = m_col
+    d = DocCollector()
+    RE.subscribe(d.insert)
+
+    readings = []
+    for per_step in (None, bps.one_nd_step_pipelined):
+        m_col.msgs.clear()
+        rs, = RE(bp.scan([hw.det], hw.motor, -1, 1, 3, per_step=per_step))
+        desc, = d.descriptor[rs]
+        readings.append([(ev['data']['motor'], ev['data']['det'])
+                         for ev in d.event[desc['uid']]])
+    # The detector readings match the positions they were taken at.
+    assert readings[0] == readings[1]
+    assert [motor for motor, det in readings[1]] == [-1, 0, 1]
+
+    # The move to the next point is issued inside the open Event, between
+    # reading the motor and reading the detector.
+    commands = [(m.command, m.obj) for m in m_col.msgs]
+    first_save = commands.index(('save', None))
+    bundle = commands[commands.index(('create', None)):first_save]
+    assert bundle == [('create', None), ('read', hw.motor),
+                      ('set', hw.motor), ('read', hw.det)]
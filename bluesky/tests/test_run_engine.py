@@ -1289,6 +1289,79 @@ def test_failures_kill_run(RE):
         RE([Msg('set', dummy, 1)])
 
 
+@requires_ophyd
+def test_multi_set(RE):
+    from ophyd import StatusBase
+
+    statuses = []
+
+    class Dummy:
+        def __init__(self, name):
+            self.name = name
+            self.position = None
+
+        def set(self, val):
+            self.position = val
+            st = StatusBase()
+            statuses.append(st)
+            return st
+
+        def stop(self, *, success=False):
+            pass
+
+    a, b = Dummy('a'), Dummy('b')
+
+    def plan():
+        ret = yield Msg('multi_set', None, {a: 1, b: 2}, group='A')
+        assert not any(st.done for st in ret)
+        for st, delay in zip(ret, (0.05, 0.1)):
+            threading.Timer(delay, st._finished).start()
+        yield Msg('wait', None, group='A')
+        assert all(st.done for st in ret)
+        return ret
+
+    RE(plan())
+    assert (a.position, b.position) == (1, 2)
+
+
+@requires_ophyd
+def test_multi_set_failure(RE):
+    from ophyd import StatusBase
+
+    class Dummy:
+        def __init__(self, name, success):
+            self.name = name
+            self.success = success
+
+        def set(self, val):
+            st = StatusBase()
+            st._finished(success=self.success)
+            return st
+
+        def stop(self, *, success=False):
+            pass
+
+    good, bad = Dummy('good', True), Dummy('bad', False)
+
+    with pytest.raises(FailedStatus) as excinfo:
+        RE([Msg('multi_set', None, [(good, 1), (bad, 1)], group='A'),
+            Msg('wait', None, group='A')])
+    failed, = excinfo.value.args
+    assert not failed.success
+
+
+def test_status_tasks_pruned(RE, hw):
+    from bluesky.plans import count
+
+    def plan():
+        yield from count([hw.det], num=50)
+        # Every status callback has run and been forgotten.
+        assert not RE._status_tasks
+        assert not RE._status_batches
+
+    RE(plan())
+
+
 def test_colliding_streams(RE, hw):
 
     collector = {'primary': [], 'baseline': []}
@@ -1608,3 +1681,328 @@ def test_broken_read_exception(RE):
     obj = Dummy('broken read')
     with pytest.raises(RuntimeError):
         RE([Msg('read', obj)])
+
+
+@requires_ophyd
+def test_uid_source(RE, hw):
+    from bluesky.utils import SequentialUid
+    RE.uid_source = SequentialUid()
+    docs = []
+    RE(count([hw.det], 3), lambda name, doc: docs.append((name, doc)))
+    uids = [doc['uid'] for name, doc in docs]
+    assert len(set(uids)) == len(uids) == 6
+    assert all(uid.startswith(RE.uid_source.prefix) for uid in uids)
+
+
+@requires_ophyd
+def test_memory_report(RE, hw):
+    report = RE.memory_report()
+    for name in ('objs_seen', 'movable_objs_touched', 'msg_cache',
+                 'status_tasks', 'temp_callback_ids', 'callbacks'):
+        assert report[name]['size'] == 0
+        assert report[name]['objects'] == []
+
+    reports = []
+
+    def plan():
+        yield from abs_set(hw.motor, 1, wait=True)
+        yield from count([hw.det])
+        reports.append(RE.memory_report(max_objects=1))
+
+    RE(plan(), {'event': lambda name, doc: None})
+    during, = reports
+    assert during['objs_seen']['size'] == 3  # motor, det and None
+    assert len(during['objs_seen']['objects']) == 1
+    assert during['temp_callback_ids']['size'] == 1
+    assert not any(name.startswith('run[') for name in during)
+
+    reports.clear()
+
+    @run_decorator()
+    def in_run():
+        yield from trigger_and_read([hw.det])
+        reports.append(RE.memory_report())
+
+    RE(in_run())
+    during, = reports
+    assert during['run_bundlers']['size'] == 1
+    assert during['run[None].describe_cache']['objects'] == ['det']
+    after = RE.memory_report()
+    assert 'run[None].describe_cache' not in after
+    assert after['movable_objs_touched']['size'] == 0
+    assert after['temp_callback_ids']['size'] == 0
+
+
+def test_unsubscribe_forgets_token(RE):
+    for _ in range(5):
+        RE([Msg('null')], {'all': lambda name, doc: None})
+    # Per-call subscriptions are removed at the start of the next call.
+    RE([Msg('null')])
+    token = RE.subscribe(lambda name, doc: None)
+    RE.unsubscribe(token)
+    assert RE.dispatcher._token_mapping == {}
+    assert RE.memory_report()['callbacks']['size'] == 0
+    # Unsubscribing again does nothing, but unknown tokens are an error.
+    RE.unsubscribe(token)
+    with pytest.raises(KeyError):
+        RE.unsubscribe(token + 1)
+
+    # Per-call subscriptions may be removed by unsubscribe_all.
+    RE([Msg('null')], {'all': lambda name, doc: None})
+    RE.dispatcher.unsubscribe_all()
+    RE([Msg('null')])
+
+    # Subscriptions removed by reset may still be unsubscribed, as a
+    # Publisher does when it is closed.
+    token = RE.subscribe(lambda name, doc: None)
+    RE.reset()
+    RE.unsubscribe(token)
+
+
+@pytest.fixture
+def group(request):
+    from bluesky.run_engine import RunEngineGroup
+    loop = asyncio.new_event_loop()
+    group = RunEngineGroup(loop=loop)
+
+    def clean_event_loop():
+        for RE in group._idle:
+            RE.loop.call_soon_threadsafe(loop.stop)
+            RE._th.join()
+            break
+        loop.close()
+
+    request.addfinalizer(clean_event_loop)
+    return group
+
+
+def test_group_runs_plans_concurrently(group):
+    events = []
+    group.subscribe(lambda name, doc: events.append((name, doc)))
+    log = []
+
+    def plan(tag):
+        @run_decorator(md={'tag': tag})
+        def inner():
+            log.append(('start', tag))
+            yield Msg('sleep', None, 0.2)
+            log.append(('end', tag))
+        return (yield from inner())
+
+    futures = [group.submit(plan(tag), tag=tag) for tag in 'abc']
+    results = [future.result(timeout=5) for future in futures]
+    # All the plans started before any of them was over.
+    assert sorted(log[:3]) == [('start', 'a'), ('start', 'b'), ('start', 'c')]
+    assert all(len(uids) == 1 for uids in results)
+    # Each plan has its own RunEngine and its own run.
+    assert len({future.run_engine for future in futures}) == 3
+    run_starts = [doc for name, doc in events if name == 'start']
+    assert {doc['uid'] for doc in run_starts} == {
+        uids[0] for uids in results}
+    assert [doc['tag'] for doc in run_starts] == [
+        doc['tag'] for doc in run_starts if doc['tag'] in 'abc']
+    assert group.locks == {}
+
+    # Idle RunEngines are reused.
+    assert group.submit([Msg('null')]).run_engine in {
+        future.run_engine for future in futures}
+
+
+@requires_ophyd
+def test_group_device_locks(group, hw):
+    from bluesky.utils import DeviceLocked
+    caught = []
+
+    def hold(motor):
+        yield Msg('set', motor, 1, group='A')
+        yield Msg('wait', None, group='A')
+        yield Msg('sleep', None, 0.3)
+
+    def intrude(motor):
+        yield Msg('sleep', None, 0.1)
+        try:
+            yield Msg('set', motor, 2)
+        except DeviceLocked as err:
+            caught.append(err)
+        yield Msg('set', hw.motor2, 2)
+
+    holding = group.submit(hold(hw.motor))
+    intruding = group.submit(intrude(hw.motor))
+    intruding.result(timeout=5)
+    holding.result(timeout=5)
+    assert len(caught) == 1
+    assert hw.motor.position == 1
+    assert hw.motor2.position == 2
+
+    # Unhandled, DeviceLocked fails the plan.
+    holding = group.submit(hold(hw.motor))
+    intruding = group.submit(
+        [Msg('sleep', None, 0.1), Msg('set', hw.motor, 2)])
+    with pytest.raises(DeviceLocked):
+        intruding.result(timeout=5)
+    holding.result(timeout=5)
+    assert group.locks == {}
+
+
+@requires_ophyd
+def test_group_reserved_devices(group, hw):
+    order = []
+
+    def plan(tag):
+        order.append(tag)
+        yield Msg('sleep', None, 0.1)
+        order.append(tag)
+
+    first = group.submit(plan('first'), devices=[hw.motor])
+    assert group.locks == {hw.motor: first}
+    second = group.submit(plan('second'), devices=[hw.motor, hw.det])
+    other = group.submit(plan('other'), devices=[hw.det])
+    for future in (first, second, other):
+        future.result(timeout=5)
+    # 'second' waits for 'first'; 'other' does not wait for 'second'.
+    assert order.index('second') > order.index('first', 1)
+    assert order.index('other') < order.index('second')
+
+
+@requires_ophyd
+def test_group_paused_plan(group, hw):
+    def plan():
+        yield Msg('set', hw.motor, 1)
+        yield Msg('checkpoint')
+        yield Msg('sleep', None, 0.5)
+        yield Msg('checkpoint')
+
+    def wait_until_paused(RE):
+        deadline = ttime.monotonic() + 5
+        while RE.state != 'paused':
+            assert ttime.monotonic() < deadline
+            ttime.sleep(0.01)
+
+    future = group.submit(plan())
+    ttime.sleep(0.1)
+    future.run_engine.request_pause()
+    wait_until_paused(future.run_engine)
+    # The paused plan is not over, and keeps its devices.
+    assert not future.done()
+    assert group.locks == {hw.motor: future}
+    group.resume(future)
+    assert future.result(timeout=5) == ()
+    assert group.locks == {}
+    with pytest.raises(RuntimeError):
+        group.resume(future)
+
+    # A paused plan may also be ended through its RunEngine.
+    future = group.submit(plan())
+    ttime.sleep(0.1)
+    future.run_engine.request_pause()
+    wait_until_paused(future.run_engine)
+    future.run_engine.abort()
+    with pytest.raises(RunEngineInterrupted):
+        future.result(timeout=5)
+    assert group.locks == {}
+
+
+def test_group_interrupted_plan(group):
+    future = group.submit([Msg('sleep', None, 10)])
+    ttime.sleep(0.1)
+    future.run_engine.abort()
+    with pytest.raises(RunEngineInterrupted):
+        future.result(timeout=5)
+
+
+@pytest.fixture
+def owned_loop(request):
+    "An event loop run by the test itself, not by a RunEngine thread."
+    loop = asyncio.new_event_loop()
+    request.addfinalizer(loop.close)
+    return loop
+
+
+def test_async_run(owned_loop):
+    from bluesky.run_engine import RunEngine
+    docs = []
+    threads = set()
+
+    def cb(name, doc):
+        docs.append((name, doc))
+        threads.add(threading.get_ident())
+
+    async def main():
+        RE = RunEngine({}, loop=owned_loop)
+        assert RE._th is None
+        with pytest.raises(RuntimeError):
+            RE([Msg('null')])
+        with pytest.raises(RuntimeError):
+            RE.request_pause()
+        uids = await RE.run(count([]), {'all': cb}, sample='dirt')
+        return RE, uids
+
+    RE, uids = owned_loop.run_until_complete(main())
+    assert len(uids) == 1
+    assert [name for name, doc in docs] == ['start', 'stop']
+    assert docs[0][1]['sample'] == 'dirt'
+    # The plan ran on this thread.
+    assert threads == {threading.get_ident()}
+    assert RE.state == 'idle'
+
+    # Awaiting on another loop is refused.
+    other_loop = asyncio.new_event_loop()
+    with pytest.raises(RuntimeError):
+        other_loop.run_until_complete(RE.run([Msg('null')]))
+    other_loop.close()
+
+    # Exceptions from the plan are raised.
+    def failing():
+        yield Msg('null')
+        raise ValueError('failing plan')
+
+    with pytest.raises(ValueError):
+        owned_loop.run_until_complete(RE.run(failing()))
+    assert RE.state == 'idle'
+
+
+def test_async_pause_resume_abort(owned_loop):
+    from bluesky.run_engine import RunEngine
+    RE = None
+
+    def plan():
+        yield Msg('open_run')
+        yield Msg('checkpoint')
+        yield Msg('sleep', None, 0.2)
+        yield Msg('checkpoint')
+        yield Msg('close_run')
+
+    async def pause_soon():
+        await asyncio.sleep(0.05)
+        await RE.pause_async()
+
+    async def main():
+        nonlocal RE
+        RE = RunEngine({}, loop=owned_loop)
+        pausing = owned_loop.create_task(pause_soon())
+        with pytest.raises(RunEngineInterrupted):
+            await RE.run(plan())
+        await pausing
+        assert RE.state == 'paused'
+        uids = await RE.resume_async()
+        assert RE.state == 'idle'
+        assert len(uids) == 1
+
+        pausing = owned_loop.create_task(pause_soon())
+        with pytest.raises(RunEngineInterrupted):
+            await RE.run(plan())
+        await pausing
+        await RE.abort_async('testing')
+        assert RE.state == 'idle'
+        assert RE._exit_status == 'abort'
+
+        # Cancelling the awaiting task halts the plan.
+        running = owned_loop.create_task(RE.run(plan()))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        await asyncio.sleep(0.05)
+        assert RE.state == 'idle'
+
+    owned_loop.run_until_complete(main())
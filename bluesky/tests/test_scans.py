@@ -488,6 +488,66 @@ def test_tune_centroid(RE, hw):
         RE(scan5)
 
 
+@pytest.mark.parametrize('parabolic', [True, False])
+def test_tune_peak(RE, hw, parabolic):
+    from ophyd.sim import SynGauss
+    motor = hw.motor
+    det = SynGauss('det', motor, 'motor', center=-1.3, Imax=1e5, sigma=0.05)
+    result = {}
+
+    def plan():
+        ret = yield from bp.tune_peak([det], 'det', motor, -1.5, -0.5, 0.001,
+                                      parabolic=parabolic)
+        result.update(ret)
+
+    counter = CallbackCounter()
+    RE(plan(), {'event': counter})
+    assert abs(result['position'] + 1.3) < 0.001
+    assert result['uncertainty'] <= 0.001
+    assert result['num_evaluations'] == counter.value
+    # far fewer than tune_centroid needs for the same precision
+    assert counter.value < 20
+    assert motor.position == result['position']
+
+    with pytest.raises(ValueError):  # tolerance < 0
+        RE(bp.tune_peak([det], 'det', motor, -1.5, -0.5, -0.1))
+
+
+def test_tune_nelder_mead(RE, hw):
+    from ophyd import Signal
+    motor1, motor2 = hw.motor1, hw.motor2
+
+    class CoupledPeak(Signal):
+        # a peak along motor1 + motor2 == 1, narrow across it
+        def trigger(self):
+            u = motor1.position + motor2.position - 1
+            v = motor1.position - motor2.position
+            self.put(np.exp(-(u ** 2 / 0.1 + v ** 2 / 2)))
+            return super().trigger()
+
+    det = CoupledPeak(name='det')
+    result = {}
+
+    def plan():
+        ret = yield from bp.tune_nelder_mead(
+            [det], 'det', motor1, 0, 0.5, motor2, 0, 0.5, xtol=1e-3,
+            bounds={motor2: (-1, 0.45)})
+        result.update(ret)
+
+    counter = CallbackCounter()
+    RE(plan(), {'event': counter})
+    # the unconstrained optimum (0.5, 0.5) is out of bounds
+    assert result['position']['motor2'] == pytest.approx(0.45, abs=1e-3)
+    assert result['position']['motor1'] == pytest.approx(0.55, abs=1e-2)
+    assert result['value'] > 0.99
+    assert result['num_evaluations'] == counter.value
+    assert motor1.position == result['position']['motor1']
+    assert motor2.position == result['position']['motor2']
+
+    with pytest.raises(ValueError):  # not triplets
+        RE(bp.tune_nelder_mead([det], 'det', motor1, 0, xtol=1e-3))
+
+
 def test_count(RE, hw):
     det = hw.det
     motor = hw.motor
@@ -4,6 +4,7 @@ from bluesky.simulators import (print_summary, print_summary_wrapper,
                                 check_limits, LimitsExceeded,
                                 plot_raster_path)
 import pytest
+from bluesky import Msg
 from bluesky.plans import grid_scan
 
 
@@ -62,3 +63,103 @@ def test_plot_raster_path(hw):
     motor2 = hw.motor2
     plan = grid_scan([det], motor1, -5, 5, 10, motor2, -7, 7, 15, True)
     plot_raster_path(plan, 'motor1', 'motor2', probe_size=.3)
+
+
+def test_analyze_plan(hw):
+    from bluesky.simulators import analyze_plan, DeviceModel
+    from bluesky.plans import count
+    import bluesky.plan_stubs as bps
+    det, motor = hw.det, hw.motor
+    models = {motor: DeviceModel(velocity=2, settle_time=0.1),
+              'det': DeviceModel(exposure_time=0.5)}
+    stats = analyze_plan(scan([det], motor, -1, 1, 5), models=models,
+                         initial_positions={motor: 0})
+    assert stats.runs == 1
+    assert stats.events == {'primary': 5}
+    assert stats.commands['set'] == 5
+    assert stats.commands['trigger'] == 10  # det and motor
+    assert stats.devices == {'det', 'motor'}
+    # 1 + 4 * 0.5 units of travel, 5 settles and 5 exposures
+    assert stats.duration == pytest.approx(3 / 2 + 5 * 0.1 + 5 * 0.5)
+
+    def plan():
+        yield from count([det], num=3, delay=1)
+        yield from bps.mv(motor, 4)
+
+    stats = analyze_plan(plan(), models=models, message_overhead=0.01)
+    assert stats.events == {'primary': 3}
+    # repeat() sleeps after every reading, less the (tiny) time elapsed
+    expected = (stats.commands['sleep'] * 1 + 3 * 0.5 + 0.1 +
+                sum(stats.commands.values()) * 0.01)
+    assert stats.duration == pytest.approx(expected, abs=0.05)
+    assert 'PlanStatistics' in repr(stats)
+
+    # Objects without a name are recorded by their repr.
+    stats = analyze_plan([Msg('stage', 'not a device')])
+    assert stats.devices == {"'not a device'"}
+
+
+def test_analyze_plan_feeds_responses(hw):
+    from bluesky.simulators import analyze_plan
+    from bluesky.plans import tune_peak
+    det, motor = hw.det, hw.motor
+    # Brent's method needs readings to make progress and terminate.
+    stats = analyze_plan(tune_peak([det], 'det', motor, -1, 1, 0.01))
+    assert stats.events['primary'] > 1
+
+
+def test_sim_run_engine(hw):
+    from bluesky.simulators import SimRunEngine, DeviceModel
+    from bluesky.plans import count
+    import time as ttime
+    det, motor = hw.det, hw.motor
+    motor.set(0)
+    RE = SimRunEngine({}, models={motor: DeviceModel(velocity=1,
+                                                     settle_time=5)},
+                      initial_positions={motor: 0}, start_time=1000)
+    docs = []
+    RE.subscribe(lambda name, doc: docs.append((name, doc)))
+
+    t0 = ttime.time()
+    RE(scan([det], motor, 0, 10, 11))
+    RE(count([det], num=5, delay=3600))
+    assert ttime.time() - t0 < 5  # not 5 hours
+
+    # 10 units of travel, 11 settles, and the sleeps of count
+    sleeps = 5 * 3600
+    assert RE.sim_time == pytest.approx(1000 + 10 + 11 * 5 + sleeps,
+                                        abs=0.1)
+    events = [doc for name, doc in docs if name == 'event']
+    assert len(events) == 16
+    assert [ev['data']['motor'] for ev in events[:11]] == list(range(11))
+    stamps = [ev['timestamps']['motor'] for ev in events[:11]]
+    assert stamps == sorted(stamps)
+    assert stamps[0] == pytest.approx(1005)
+    # the hardware was not touched
+    assert motor.position == 0
+    assert [name for name, doc in docs].count('stop') == 2
+
+
+def test_virtual_time_event_loop(virtual_RE, hw):
+    import bluesky.plan_stubs as bps
+    import bluesky.preprocessors as bpp
+    import time as ttime
+    RE = virtual_RE
+    docs = []
+    RE.subscribe(lambda name, doc: docs.append((name, doc)))
+
+    @bpp.run_decorator()
+    def plan():
+        yield from bps.trigger_and_read([hw.det])
+        yield from bps.sleep(3600)
+        yield from bps.trigger_and_read([hw.det])
+
+    t0 = ttime.time()
+    RE(plan())
+    assert ttime.time() - t0 < 5
+    # Only timers advance the virtual clock, so the times are exact.
+    times = [doc['time'] for name, doc in docs]
+    assert times[0] == 0
+    events = [doc for name, doc in docs if name == 'event']
+    assert events[1]['time'] - events[0]['time'] == 3600
+    assert RE.loop.time() == 3600
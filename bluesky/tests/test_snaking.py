@@ -1,3 +1,10 @@
+from functools import reduce
+import operator
+
+import numpy as np
+import pytest
+
+from bluesky import plan_patterns
 from bluesky.utils import snake_cyclers
 from cycler import cycler
 
@@ -74,3 +81,47 @@ def test_snake_some_snaking():
         {'x': 2, 'y': 2, 'z': 3},
         {'x': 3, 'y': 2, 'z': 3}]
     assert actual == expected
+
+
+def test_snake_lazy_indexing():
+    cyc = snake_cyclers([z, y, x], [False, True, True])
+    expected = list(cyc)
+    assert len(cyc) == len(expected) == 18
+    assert [cyc._left[i] for i in range(len(cyc))] == expected
+    assert cyc._left[-1] == expected[-1]
+    assert cyc.shape == (3, 2, 3)
+
+
+def _expanded_snake_cyclers(cyclers, snake_booleans):
+    # The eagerly-expanded Cycler that snake_cyclers used to return.
+    total_length = np.prod([len(c) for c in cyclers])
+    length_of_innermost = total_length
+    new_cyclers = []
+    for c, snake in zip(cyclers, snake_booleans):
+        num_tiles = total_length // length_of_innermost
+        length_of_innermost //= len(c)
+        for k, v in c.by_key().items():
+            if snake:
+                v = v + v[::-1]
+            expanded = np.tile(np.repeat(v, length_of_innermost), num_tiles)
+            new_cyclers.append(cycler(k, expanded[:total_length]))
+    return reduce(operator.add, new_cyclers)
+
+
+@pytest.mark.parametrize('snake', [[False, False, False],
+                                   [False, True, True],
+                                   [False, True, False]])
+def test_snake_repr(snake):
+    xy = cycler('x', [1, 2, 3]) + cycler('w', [4., 5., 6.])
+    expected = _expanded_snake_cyclers([z, y, xy], snake)
+    actual = snake_cyclers([z, y, xy], snake)
+    assert list(actual) == list(expected)
+    assert repr(actual) == repr(expected)
+
+
+def test_outer_product_repr():
+    args = ['a', 0, 1, 2, 'b', 0, 1, 3, True, 'c', 5, 6, 2, False]
+    expected = _expanded_snake_cyclers(
+        [cycler('a', np.linspace(0, 1, 2)), cycler('b', np.linspace(0, 1, 3)),
+         cycler('c', np.linspace(5, 6, 2))], [False, True, False])
+    assert repr(plan_patterns.outer_product(args)) == repr(expected)
@@ -11,10 +11,25 @@ from bluesky.suspenders import (SuspendBoolHigh,
                                 SuspendOutBand)
 from bluesky.tests.utils import MsgCollector
 from bluesky import Msg
-import time as ttime
 from bluesky.run_engine import RunEngineInterrupted
-import threading
-import time
+from bluesky.utils import ensure_generator
+
+
+def on_clock(loop, plan, *calls, elapsed=None):
+    """
+    Run plan, scheduling calls, given as (delay, func, *args), as it starts.
+
+    Plans run on the loop's thread, so the delays count from the start of the
+    plan on the loop's (virtual) clock. The time the plan took is appended to
+    the list ``elapsed``, if given.
+    """
+    start = loop.time()
+    for delay, func, *args in calls:
+        loop.call_later(delay, func, *args)
+    yield from ensure_generator(plan)
+    if elapsed is not None:
+        elapsed.append(loop.time() - start)
+
 
 @pytest.mark.parametrize(
     'klass,sc_args,start_val,fail_val,resume_val,wait_time',
@@ -26,56 +41,53 @@ import time
      (SuspendInBand, (.5, 1.5), 1, 0, 1, .2),  # renamed to WhenOutsideBand
      (SuspendOutBand, (.5, 1.5), 0, 1, 0, .2)])  # deprecated
 def test_suspender(klass, sc_args, start_val, fail_val,
-                   resume_val, wait_time, RE, hw):
-    loop = RE._loop
+                   resume_val, wait_time, virtual_RE, hw):
+    RE = virtual_RE
+    loop = RE.loop
     sig = hw.bool_sig
     my_suspender = klass(sig,
                          *sc_args, sleep=wait_time)
     my_suspender.install(RE)
 
-    def putter(val):
-        sig.put(val)
-
     # make sure we start at good value!
-    putter(start_val)
+    sig.put(start_val)
     # dumb scan
     scan = [Msg('checkpoint'), Msg('sleep', None, .2)]
     RE(scan)
     # paranoid
     assert RE.state == 'idle'
 
-    start = ttime.time()
-    # queue up fail and resume conditions
-    threading.Timer(.1, putter, (fail_val,)).start()
-    threading.Timer(.5, putter, (resume_val,)).start()
-    # start the scan
-    RE(scan)
-    stop = ttime.time()
-    # assert we waited at least 2 seconds + the settle time
-    delta = stop - start
-    print(delta)
-    assert delta > .5 + wait_time + .2
+    elapsed = []
+    # queue up fail and resume conditions and start the scan
+    RE(on_clock(loop, scan, (.1, sig.put, fail_val), (.5, sig.put, resume_val),
+                elapsed=elapsed))
+    # we waited for the resume condition, the settle time and then re-ran
+    # the scan from its checkpoint
+    assert elapsed == [pytest.approx(.5 + wait_time + .2)]
 
 
-def test_pretripped(RE, hw):
+def test_pretripped(virtual_RE, hw):
     'Tests if suspender is tripped before __call__'
+    RE = virtual_RE
     sig = hw.bool_sig
     scan = [Msg('checkpoint')]
     msg_lst = []
     sig.put(1)
 
     def accum(msg):
+        if not msg_lst:
+            RE.loop.call_later(1, sig.put, 0)
         msg_lst.append(msg)
 
     susp = SuspendBoolHigh(sig)
 
     RE.install_suspender(susp)
-    threading.Timer(1, sig.put, (0,)).start()
     RE.msg_hook = accum
     RE(scan)
 
     assert len(msg_lst) == 2
     assert ['wait_for', 'checkpoint'] == [m[0] for m in msg_lst]
+    assert RE.loop.time() == 1
 
 
 @pytest.mark.parametrize('pre_plan,post_plan,expected_list',
@@ -94,7 +106,8 @@ def test_pretripped(RE, hw):
                            ['checkpoint', 'sleep', 'rewindable', 'null',
                             'wait_for', 'resume', 'null', 'rewindable',
                             'sleep'])])
-def test_pre_suspend_plan(RE, pre_plan, post_plan, expected_list, hw):
+def test_pre_suspend_plan(virtual_RE, pre_plan, post_plan, expected_list, hw):
+    RE = virtual_RE
     sig = hw.bool_sig
     scan = [Msg('checkpoint'), Msg('sleep', None, .2)]
     msg_lst = []
@@ -107,10 +120,8 @@ def test_pre_suspend_plan(RE, pre_plan, post_plan, expected_list, hw):
                            post_plan=post_plan)
 
     RE.install_suspender(susp)
-    threading.Timer(.1, sig.put, (1,)).start()
-    threading.Timer(1, sig.put, (0,)).start()
     RE.msg_hook = accum
-    RE(scan)
+    RE(on_clock(RE.loop, scan, (.1, sig.put, 1), (1, sig.put, 0)))
 
     assert len(msg_lst) == len(expected_list)
     assert expected_list == [m[0] for m in msg_lst]
@@ -125,21 +136,24 @@ def test_pre_suspend_plan(RE, pre_plan, post_plan, expected_list, hw):
     assert not RE.suspenders
 
 
-def test_pause_from_suspend(RE, hw):
+def test_pause_from_suspend(virtual_RE, hw):
     'Tests what happens when a pause is requested from a suspended state'
+    RE = virtual_RE
+    loop = RE.loop
     sig = hw.bool_sig
     scan = [Msg('checkpoint')]
     msg_lst = []
     sig.put(1)
 
     def accum(msg):
+        if not msg_lst:
+            loop.call_later(1, loop.create_task, RE.pause_async())
+            loop.call_later(2, sig.put, 0)
         msg_lst.append(msg)
 
     susp = SuspendBoolHigh(sig)
 
     RE.install_suspender(susp)
-    threading.Timer(1, RE.request_pause).start()
-    threading.Timer(2, sig.put, (0,)).start()
     RE.msg_hook = accum
     with pytest.raises(RunEngineInterrupted):
         RE(scan)
@@ -148,22 +162,24 @@ def test_pause_from_suspend(RE, hw):
     assert ['wait_for', 'wait_for', 'checkpoint'] == [m[0] for m in msg_lst]
 
 
-def test_deferred_pause_from_suspend(RE, hw):
+def test_deferred_pause_from_suspend(virtual_RE, hw):
     'Tests what happens when a soft pause is requested from a suspended state'
+    RE = virtual_RE
+    loop = RE.loop
     sig = hw.bool_sig
     scan = [Msg('checkpoint'), Msg('null')]
     msg_lst = []
     sig.put(1)
 
     def accum(msg):
-        print(msg)
+        if not msg_lst:
+            loop.call_later(1, loop.create_task, RE.pause_async(defer=True))
+            loop.call_later(4, sig.put, 0)
         msg_lst.append(msg)
 
     susp = SuspendBoolHigh(sig)
 
     RE.install_suspender(susp)
-    threading.Timer(1, RE.request_pause, (True,)).start()
-    threading.Timer(4, sig.put, (0,)).start()
     RE.msg_hook = accum
     with pytest.raises(RunEngineInterrupted):
         RE(scan)
@@ -172,33 +188,35 @@ def test_deferred_pause_from_suspend(RE, hw):
     assert ['wait_for', 'checkpoint', 'null'] == [m[0] for m in msg_lst]
 
 
-def test_unresumable_suspend_fail(RE):
+def test_unresumable_suspend_fail(virtual_RE):
     'Tests what happens when a soft pause is requested from a suspended state'
-
+    RE = virtual_RE
+    loop = RE.loop
     scan = [Msg('clear_checkpoint'), Msg('sleep', None, 2)]
     m_coll = MsgCollector()
     RE.msg_hook = m_coll
+    stopped = []
+    RE.state_hook = lambda new, old: (
+        stopped.append(loop.time()) if new == 'idle' else None)
 
-    ev = asyncio.Event(loop=RE.loop)
-    threading.Timer(.1, partial(RE.request_suspend, fut=ev.wait)).start()
-    threading.Timer(1, ev.set).start()
-    start = time.time()
+    ev = asyncio.Event(loop=loop)
+    start = loop.time()
     with pytest.raises(RunEngineInterrupted):
-        RE(scan)
-    stop = time.time()
-    assert .1 < stop - start < 1
+        RE(on_clock(loop, scan,
+                    (.1, partial(RE.request_suspend, fut=ev.wait)),
+                    (1, ev.set)))
+    # The plan was aborted when the suspension was requested.
+    assert stopped == [pytest.approx(start + .1)]
 
 
-def test_suspender_plans(RE, hw):
+def test_suspender_plans(virtual_RE, hw):
     'Tests that the suspenders can be installed via Msg'
-    loop = RE._loop
+    RE = virtual_RE
+    loop = RE.loop
     sig = hw.bool_sig
     my_suspender = SuspendBoolHigh(sig, sleep=0.2)
 
-    def putter(val):
-        sig.put(val)
-
-    putter(0)
+    sig.put(0)
 
     # Do the messages work?
     RE([Msg('install_suspender', None, my_suspender)])
@@ -213,26 +231,18 @@ def test_suspender_plans(RE, hw):
     scan = [Msg('checkpoint'), Msg('sleep', None, .2)]
 
     # No suspend scan: does the wrapper error out?
-    start = ttime.time()
-    RE(suspend_wrapper(scan, my_suspender))
-    stop = ttime.time()
-    delta = stop - start
-    assert delta < .9
-
-    # Suspend scan
-    start = ttime.time()
-    threading.Timer(.1, putter, (1,)).start()
-    threading.Timer(.5, putter, (0,)).start()
-    RE(suspend_wrapper(scan, my_suspender))
-    stop = ttime.time()
-    delta = stop - start
-    assert delta > .9
+    elapsed = []
+    RE(on_clock(loop, suspend_wrapper(scan, my_suspender), elapsed=elapsed))
+    assert elapsed == [pytest.approx(.2)]
+
+    # Suspend scan: resumed at .5, after .2 settling, and run again.
+    elapsed = []
+    RE(on_clock(loop, suspend_wrapper(scan, my_suspender),
+                (.1, sig.put, 1), (.5, sig.put, 0), elapsed=elapsed))
+    assert elapsed == [pytest.approx(.9)]
 
     # Did we clean up?
-    start = ttime.time()
-    threading.Timer(.1, putter, (1,)).start()
-    threading.Timer(.5, putter, (0,)).start()
-    RE(scan)
-    stop = ttime.time()
-    delta = stop - start
-    assert delta < .9
+    elapsed = []
+    RE(on_clock(loop, scan, (.1, sig.put, 1), (.5, sig.put, 0),
+                elapsed=elapsed))
+    assert elapsed == [pytest.approx(.2)]
@@ -2,9 +2,12 @@ import pytest
 
 from functools import reduce
 import operator
+import uuid
 
-from bluesky.utils import ensure_generator, Msg, merge_cycler
+from bluesky.utils import (ensure_generator, Msg, merge_cycler, ArrayCycler,
+                           UidPool, SequentialUid, short_uid)
 from cycler import cycler
+import numpy as np
 
 
 def test_single_msg_to_gen():
@@ -100,3 +103,68 @@ def test_cycler_merge_mixed(hw, children):
 
     assert mcyc.keys == cyc.keys
     assert mcyc.by_key() == cyc.by_key()
+
+
+def test_array_cycler_matches_cycler():
+    x = np.linspace(0, 1, 7)
+    y = np.arange(7)
+    acyc = ArrayCycler({'x': x, 'y': y})
+    cyc = cycler('x', x) + cycler('y', y)
+
+    assert len(acyc) == len(cyc)
+    assert acyc.keys == cyc.keys
+    assert list(acyc) == list(cyc)
+    assert acyc.by_key() == {k: list(v) for k, v in cyc.by_key().items()}
+    assert repr(acyc) == repr(cyc)
+
+    # Composes with ordinary cyclers.
+    assert list(acyc * cycler('z', [0, 1])) == list(cyc * cycler('z', [0, 1]))
+    assert list(acyc + cycler('z', range(7))) == list(cyc + cycler('z', range(7)))
+
+
+def test_array_cycler_repr_many_keys():
+    columns = {'x': [1, 2], 'y': [3, 4], 'z': [5, 6], 'w': [7, 8]}
+    cyc = reduce(operator.add, (cycler(k, v) for k, v in columns.items()))
+    assert repr(ArrayCycler(columns)) == repr(cyc)
+
+
+def test_array_cycler_length_mismatch():
+    with pytest.raises(ValueError):
+        ArrayCycler({'x': [1, 2, 3], 'y': [1, 2]})
+
+
+@pytest.mark.parametrize('source', [UidPool(batch_size=7), SequentialUid()])
+def test_uid_sources(source):
+    uids = [source() for _ in range(100)]
+    assert len(set(uids)) == len(uids)
+    for uid in uids:
+        parsed = uuid.UUID(uid)
+        assert str(parsed) == uid
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+
+    source.reset()
+    assert source() not in uids
+
+
+def test_sequential_uid():
+    source = SequentialUid()
+    prefix = source.prefix
+    uids = [source() for _ in range(3)]
+    assert all(uid.startswith(prefix) for uid in uids)
+    assert uids == sorted(uids)
+    source.reset()
+    assert source.prefix != prefix
+
+    # A new prefix is drawn when the counter runs out.
+    source._max_count = 2
+    prefix = source.prefix
+    source(), source()
+    assert not source().startswith(prefix)
+    assert source.prefix != prefix
+
+
+def test_short_uid():
+    uid = short_uid('set')
+    assert uid.startswith('set-') and len(uid) == len('set-') + 6
+    assert len(short_uid(truncate=10)) == 10
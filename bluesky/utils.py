@@ -1,37 +1,30 @@
-from collections import namedtuple
+from collections import deque, namedtuple
 import asyncio
+import atexit
 import os
 import sys
 import signal
-import operator
 import uuid
-from functools import reduce
-from weakref import ref, WeakKeyDictionary
+from weakref import ref, WeakKeyDictionary, WeakSet, WeakValueDictionary
 import types
+from urllib.parse import quote
 import inspect
 from inspect import Parameter, Signature
 import itertools
-from collections.abc import Iterable
+from collections.abc import Iterable, MutableMapping, Sequence
 import numpy as np
-from cycler import cycler
+from cycler import Cycler
 import datetime
-from functools import wraps, partial
+from functools import wraps, partial, reduce
 import threading
+import tempfile
 import time
-from tqdm import tqdm
-from tqdm._utils import _environ_cols_wrapper, _term_move_up, _unicode
 import warnings
 
 import msgpack
 import msgpack_numpy
 import zict
 
-try:
-    # cytools is a drop-in replacement for toolz, implemented in Cython
-    from cytools import groupby
-except ImportError:
-    from toolz import groupby
-
 
 class Msg(namedtuple("Msg_base", ["command", "obj", "args", "kwargs", "run"])):
     __slots__ = ()
@@ -75,6 +68,10 @@ class FailedStatus(Exception):
     'Exception to be raised if a SatusBase object reports done but failed'
 
 
+class DeviceLocked(Exception):
+    'Exception to be raised if a plan uses a device held by another plan'
+
+
 class InvalidCommand(KeyError):
     pass
 
@@ -555,6 +552,9 @@ def snake_cyclers(cyclers, snake_booleans):
     """
     Combine cyclers with a 'snaking' back-and-forth order.
 
+    The combination is computed lazily: each point is derived from its
+    index along every axis, so the full product is never built.
+
     Parameters
     ----------
     cyclers : cycler.Cycler
@@ -571,21 +571,257 @@ def snake_cyclers(cyclers, snake_booleans):
     """
     if len(cyclers) != len(snake_booleans):
         raise ValueError("number of cyclers does not match number of booleans")
-    lengths = []
-    new_cyclers = []
+    axes = []
     for c in cyclers:
-        lengths.append(len(c))
-    total_length = np.product(lengths)
-    for i, (c, snake) in enumerate(zip(cyclers, snake_booleans)):
-        num_tiles = np.product(lengths[:i])
-        num_repeats = np.product(lengths[i+1:])
-        for k, v in c._transpose().items():
-            if snake:
-                v = v + v[::-1]
-            v2 = np.tile(np.repeat(v, num_repeats), num_tiles)
-            expanded = v2[:total_length]
-            new_cyclers.append(cycler(k, expanded))
-    return reduce(operator.add, new_cyclers)
+        if isinstance(c, ArrayCycler) and len(c._left.axes) == 1:
+            axes.append(c._left.axes[0])
+        else:
+            axes.append(c._transpose())
+    return ArrayCycler.from_axes(axes, snake_booleans)
+
+
+def _zip_repr(columns):
+    """
+    Repr of ``cycler(k1, v1) + cycler(k2, v2) + ...`` for a dict of columns.
+
+    Additions nest to the left, as in the repr of the equivalent Cycler.
+    """
+    reprs = ['cycler({!r}, {!r})'.format(k, list(v))
+             for k, v in columns.items()]
+    return reduce('({} + {})'.format, reprs)
+
+
+class _GridPoints(Sequence):
+    """
+    Read-only sequence of dicts, one per point, computed on demand.
+
+    Each axis is a dict of parallel columns of positions. The points are
+    the outer product of the axes, the first axis being the slowest. Axes
+    flagged in ``snake`` reverse direction on every other pass.
+    """
+    def __init__(self, axes, snake=None):
+        if snake is None:
+            snake = [False] * len(axes)
+        self.axes = []
+        self.snake = list(snake)
+        self.shape = []
+        for columns in axes:
+            lengths = {len(v) for v in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("All position arrays must have the same "
+                                 "length, got lengths {}"
+                                 .format(sorted(lengths)))
+            self.axes.append(columns)
+            self.shape.append(lengths.pop() if lengths else 0)
+        self._len = int(np.prod(self.shape)) if self.shape else 0
+
+    def __len__(self):
+        return self._len
+
+    def _row(self, axis, j):
+        return {k: v[j] for k, v in self.axes[axis].items()}
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("point index out of range")
+        point = {}
+        stride = self._len
+        for axis, n in enumerate(self.shape):
+            stride //= n
+            # number of complete passes over this axis before point i
+            passes, j = divmod(i // stride, n)
+            if self.snake[axis] and passes % 2:
+                j = n - 1 - j
+            point.update(self._row(axis, j))
+        return point
+
+    def __iter__(self):
+        if not self._len:
+            return
+        rows = [[self._row(axis, j) for j in range(n)]
+                for axis, n in enumerate(self.shape)]
+        yield from self._iter_axis(rows, 0, {}, [0] * len(rows))
+
+    def _iter_axis(self, rows, axis, base, passes):
+        axis_rows = rows[axis]
+        if self.snake[axis] and passes[axis] % 2:
+            axis_rows = reversed(axis_rows)
+        passes[axis] += 1
+        last = axis == len(rows) - 1
+        for row in axis_rows:
+            point = dict(base)
+            point.update(row)
+            if last:
+                yield point
+            else:
+                yield from self._iter_axis(rows, axis + 1, point, passes)
+
+
+class _MappedPoints(Sequence):
+    """
+    Read-only sequence applying ``func`` to each point of ``points``.
+    """
+    def __init__(self, points, func):
+        self._points = points
+        self._func = func
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._func(p) for p in self._points[i]]
+        return self._func(self._points[i])
+
+    def __iter__(self):
+        return map(self._func, self._points)
+
+
+class _PointsCycler(Cycler):
+    """
+    A Cycler over a sequence of points computed on demand.
+
+    ``points`` needs only support ``len`` and iteration, yielding a new dict
+    per point.
+    """
+    def __init__(self, points, keys):
+        super().__init__(None)
+        self._left = points
+        self._keys = set(keys)
+
+    def __len__(self):
+        return len(self._left)
+
+    def __iter__(self):
+        # Each point is a new dict, so there is no need to copy it.
+        return iter(self._left)
+
+    def change_key(self, old, new):
+        if old == new:
+            return
+        if new in self._keys:
+            raise ValueError(
+                "Can't replace {old} with {new}, {new} is already a key"
+                .format(old=old, new=new))
+        if old not in self._keys:
+            raise KeyError("Can't replace {old} with {new}, {old} is not a key"
+                           .format(old=old, new=new))
+
+        def rename(point):
+            point[new] = point.pop(old)
+            return point
+
+        self._left = _MappedPoints(self._left, rename)
+        self._keys = (self._keys - {old}) | {new}
+
+    def __repr__(self):
+        # Keys in the order they appear in the points, rather than that of
+        # the set of keys, so that the repr is reproducible.
+        columns = {}
+        for point in self:
+            for k, v in point.items():
+                columns.setdefault(k, []).append(v)
+        return _zip_repr(columns or {k: [] for k in self._keys})
+
+
+class ArrayCycler(_PointsCycler):
+    """
+    A Cycler backed by arrays of positions, one array per key.
+
+    Unlike a Cycler built with :func:`cycler.cycler`, no per-point dictionary
+    is created until the point is reached during iteration, so building one
+    costs next to nothing and memory use is that of the position arrays. It
+    behaves like ``cycler(k1, v1) + cycler(k2, v2) + ...`` and can be
+    composed with other Cyclers (at which point the composite is built
+    eagerly, as usual).
+
+    Use :meth:`from_axes` to build a lazy outer product (optionally snaked)
+    of several such groups of positions.
+
+    Parameters
+    ----------
+    positions : dict
+        Maps each key (e.g., a motor) to a sequence of positions. NumPy
+        arrays are used as-is; other sequences are copied into lists so that
+        the types of their elements are preserved. All sequences must have
+        the same length.
+    """
+    def __init__(self, positions):
+        self._init_axes([positions], [False])
+
+    @classmethod
+    def from_axes(cls, axes, snake=None):
+        """
+        Build the outer product of several groups of positions.
+
+        Parameters
+        ----------
+        axes : list of dict
+            Each dict maps keys to sequences of positions of equal length,
+            as for the constructor. The first axis is the slowest.
+        snake : list of bool, optional
+            Whether each axis reverses direction on every other pass.
+
+        Returns
+        -------
+        cyc : ArrayCycler
+        """
+        if snake is not None and len(snake) != len(axes):
+            raise ValueError("number of axes does not match number of "
+                             "snake booleans")
+        ret = cls.__new__(cls)
+        ret._init_axes(axes, snake)
+        return ret
+
+    def _init_axes(self, axes, snake):
+        axes = [{k: v if isinstance(v, np.ndarray) else list(v)
+                 for k, v in positions.items()}
+                for positions in axes]
+        keys = set()
+        for positions in axes:
+            if keys & set(positions):
+                raise ValueError("Keys appear in more than one axis: {}"
+                                 .format(keys & set(positions)))
+            keys.update(positions)
+        super().__init__(_GridPoints(axes, snake), keys)
+
+    @property
+    def positions(self):
+        """
+        Mapping of each key to its sequence of positions.
+
+        For an outer product this expands every axis to the full length of
+        the cycler.
+        """
+        points = self._left
+        if len(points.axes) == 1:
+            return dict(points.axes[0])
+        return {k: np.asarray(v) for k, v in self.by_key().items()}
+
+    @property
+    def shape(self):
+        "Number of points along each axis."
+        return tuple(self._left.shape)
+
+    def change_key(self, old, new):
+        if old == new or new in self._keys or old not in self._keys:
+            # let the base class raise or return
+            return super().change_key(old, new)
+        axes = [{(new if k == old else k): v for k, v in positions.items()}
+                for positions in self._left.axes]
+        self._init_axes(axes, self._left.snake)
+
+    def __repr__(self):
+        axes = self._left.axes
+        if len(axes) == 1:
+            return _zip_repr(axes[0])
+        # An outer product reprs as the zip of its expanded columns, like
+        # the Cycler that snake_cyclers used to build.
+        return super().__repr__()
 
 
 def first_key_heuristic(device):
@@ -708,15 +944,74 @@ def all_safe_rewind(devices):
 
 
 class PersistentDict(zict.Func):
-    def __init__(self, directory):
+    """
+    A dictionary synced with a directory, one msgpack-encoded file per key.
+
+    Parameters
+    ----------
+    directory : str or Path
+    write_behind : bool, optional
+        If False (default), every change rewrites its file immediately. If
+        True, the contents are cached in memory and changed files are
+        rewritten in batches, each atomically (written aside, then renamed
+        into place), every ``flush_interval`` seconds, on :meth:`flush` and
+        at exit. Until then, each change is appended to a journal next to
+        the directory, ``<directory>.journal``, and replayed if the process
+        died before flushing, so no update (e.g., of ``scan_id``) is lost.
+        Only one write-behind PersistentDict may use a directory at a time:
+        a second one in the same process raises RuntimeError until the first
+        is closed, and sharing a directory between processes is not
+        supported.
+    flush_interval : float or None, optional
+        seconds between flushes in write-behind mode; default 5. If None,
+        flush only on :meth:`flush`, :meth:`close` and at exit.
+    fsync : bool, optional
+        In write-behind mode, also fsync the journal after each change, so
+        that it survives a crash of the operating system, not only of the
+        process. Default is False.
+
+    Attributes
+    ----------
+    version : int
+        incremented by every change made through this object, so that
+        readers (such as the RunEngine) can cache a copy of the contents
+    """
+    def __init__(self, directory, *, write_behind=False, flush_interval=5,
+                 fsync=False):
         self._directory = directory
-        self._file = zict.File(directory)
+        self._version = 0
+        if write_behind:
+            self._file = _WriteBehindFile(directory, flush_interval, fsync)
+        else:
+            self._file = zict.File(directory)
         super().__init__(self._dump, self._load, self._file)
 
     @property
     def directory(self):
         return self._directory
 
+    @property
+    def version(self):
+        return self._version
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._version += 1
+
+    def flush(self):
+        "Write any pending changes to the directory (write-behind mode)."
+        if isinstance(self._file, _WriteBehindFile):
+            self._file.flush()
+
+    def close(self):
+        "Flush and stop syncing (write-behind mode)."
+        if isinstance(self._file, _WriteBehindFile):
+            self._file.close()
+
     def __repr__(self):
         return f"<{self.__class__.__name__} {dict(self)!r}>"
 
@@ -737,6 +1032,178 @@ class PersistentDict(zict.Func):
             raw=False)
 
 
+class _WriteBehindFile(MutableMapping):
+    """
+    Mapping of str to bytes, cached in memory and written behind to a
+    directory in the layout of zict.File, with a journal for recovery.
+    """
+    def __init__(self, directory, flush_interval, fsync):
+        self.directory = os.fspath(directory)
+        self.journal_path = self.directory + '.journal'
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        # Two instances would overwrite (and truncate) each other's journal.
+        key = os.path.realpath(self.directory)
+        with _write_behind_files_lock:
+            if key in _write_behind_files:
+                raise RuntimeError(
+                    "{} is already in use by a write-behind PersistentDict; "
+                    "close it first.".format(self.directory))
+            _write_behind_files[key] = self
+        self._data = dict(zict.File(self.directory).items())
+        self._dirty = set()
+        # Recover changes that were journaled but not flushed.
+        for op, key, value in self._read_journal():
+            if op == 'set':
+                self._data[key] = value
+            else:
+                self._data.pop(key, None)
+            self._dirty.add(key)
+        self._journal = None
+        self.flush()  # Compact any recovered changes.
+        # Start a new journal, rather than appending to one that may end in
+        # a partial record, which would corrupt every record after it.
+        self._journal = open(self.journal_path, 'wb')
+        self._closed = threading.Event()
+        atexit.register(_flush_write_behind, ref(self))
+        if flush_interval is not None:
+            threading.Thread(target=_flush_write_behind_periodically,
+                             args=(ref(self), self._closed, flush_interval),
+                             daemon=True).start()
+
+    def _read_journal(self):
+        try:
+            with open(self.journal_path, 'rb') as f:
+                unpacker = msgpack.Unpacker(f, raw=False)
+                # A truncated last record, from a crash mid-write, is
+                # never yielded.
+                try:
+                    for record in unpacker:
+                        if not _is_journal_record(record):
+                            raise ValueError(record)
+                        yield record
+                except (ValueError, TypeError):  # corrupt, not truncated
+                    warnings.warn("Ignoring the unreadable end of "
+                                  "{}".format(self.journal_path))
+        except FileNotFoundError:
+            return
+
+    def _log(self, op, key, value=None):
+        if self._closed.is_set():
+            raise RuntimeError("This PersistentDict has been closed.")
+        self._journal.write(msgpack.packb((op, key, value),
+                                          use_bin_type=True))
+        # Hand the record to the OS now, so that it survives a crash of
+        # this process.
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(value, (tuple, list)):
+            value = b''.join(value)
+        value = bytes(value)
+        with self._lock:
+            self._log('set', key, value)
+            self._data[key] = value
+            self._dirty.add(key)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._data:
+                raise KeyError(key)
+            self._log('del', key)
+            del self._data[key]
+            self._dirty.add(key)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def flush(self):
+        "Write the changed keys, each atomically, then clear the journal."
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            parent = os.path.dirname(os.path.abspath(self.directory))
+            for key in self._dirty:
+                # the file name used by zict.File
+                path = os.path.join(self.directory, quote(key, safe=''))
+                if key not in self._data:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                # Write aside (outside the directory, so that a concurrent
+                # reader never lists it) and rename into place.
+                fd, tmp_path = tempfile.mkstemp(dir=parent, prefix='.tmp-')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self._data[key])
+                os.replace(tmp_path, path)
+            self._dirty.clear()
+            if self._journal is not None:  # else still recovering
+                self._journal.seek(0)
+                self._journal.truncate()
+
+    def close(self):
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self.flush()
+            self._closed.set()
+            self._journal.close()
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+            with _write_behind_files_lock:
+                key = os.path.realpath(self.directory)
+                if _write_behind_files.get(key) is self:
+                    del _write_behind_files[key]
+
+
+def _is_journal_record(record):
+    "Whether record is a ('set', key, bytes) or ('del', key, None) record."
+    if not isinstance(record, list) or len(record) != 3:
+        return False
+    op, key, value = record
+    if not isinstance(key, str):
+        return False
+    return ((op == 'set' and isinstance(value, bytes)) or
+            (op == 'del' and value is None))
+
+
+# the open _WriteBehindFile of each directory
+_write_behind_files = WeakValueDictionary()
+_write_behind_files_lock = threading.Lock()
+
+
+def _flush_write_behind(file_ref):
+    "Flush a _WriteBehindFile at exit, if it still exists."
+    file = file_ref()
+    if file is not None:
+        file.close()
+
+
+def _flush_write_behind_periodically(file_ref, closed, interval):
+    while not closed.wait(interval):
+        file = file_ref()
+        if file is None:
+            return
+        file.flush()
+        del file
+
+
 SEARCH_PATH = []
 ENV_VAR = 'BLUESKY_HISTORY_PATH'
 if ENV_VAR in os.environ:
@@ -961,6 +1428,131 @@ def new_uid():
     return str(uuid.uuid4())
 
 
+def _uuid4_batch(n):
+    "Return a list of ``n`` uuid4 strings, drawing on os.urandom only once."
+    h = os.urandom(16 * n).hex()
+    uids = []
+    for i in range(0, 32 * n, 32):
+        s = h[i:i + 32]
+        # Set the version (4) and variant (RFC 4122) bits as uuid.uuid4 does.
+        uids.append('%s-%s-4%s-%s%s-%s' % (
+            s[:8], s[8:12], s[13:16], '89ab'[int(s[16], 16) & 3], s[17:20],
+            s[20:]))
+    return uids
+
+
+# uid sources that hold random state, which a forked child must not reuse
+_uid_sources = WeakSet()
+
+
+def _reset_uid_sources():
+    for source in list(_uid_sources):
+        source.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_uid_sources)
+
+
+class UidPool:
+    """
+    A source of uuid4 strings, generated in batches.
+
+    Calling an instance returns a random, RFC 4122 version 4 uuid string, like
+    :func:`new_uid`, but the random bytes for ``batch_size`` uids are read
+    from ``os.urandom`` at once and formatted without creating
+    :class:`uuid.UUID` objects, which is several times faster per uid.
+
+    Parameters
+    ----------
+    batch_size : int, optional
+        number of uids generated each time the pool runs dry; default 1024
+
+    Examples
+    --------
+    >>> RE = RunEngine(uid_source=UidPool())
+    """
+    def __init__(self, batch_size=1024):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self._pool = deque()
+        self._lock = threading.Lock()
+        _uid_sources.add(self)
+
+    def __call__(self):
+        while True:
+            try:
+                return self._pool.popleft()
+            except IndexError:
+                with self._lock:
+                    if not self._pool:
+                        self._pool.extend(_uuid4_batch(self.batch_size))
+
+    def reset(self):
+        "Discard the uids generated so far."
+        self._pool.clear()
+
+    def __repr__(self):
+        return '{}(batch_size={!r})'.format(type(self).__name__,
+                                            self.batch_size)
+
+
+class SequentialUid:
+    """
+    A source of uuid-formatted strings made of a random prefix and a counter.
+
+    The first 20 hex digits of each uid are drawn at random when the instance
+    is created (or :meth:`reset`), and the last 12 count up from zero, so
+    consecutive uids are cheap to generate and sort in the order they were
+    made. The prefix carries 74 random bits, so uids from different sources
+    are as unlikely to collide as (shorter) uuid4s. A new prefix is drawn
+    when the counter is exhausted, and in a forked child process.
+
+    Examples
+    --------
+    Give each run its own prefix:
+
+    >>> uid_source = SequentialUid()
+    >>> RE = RunEngine(uid_source=uid_source)
+    >>> RE.subscribe(lambda name, doc: uid_source.reset(), 'stop')
+    """
+    _max_count = 16 ** 12
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+        _uid_sources.add(self)
+
+    def __call__(self):
+        prefix, counter = self._state
+        n = next(counter)
+        if n >= self._max_count:
+            with self._lock:
+                if self._state[0] == prefix:
+                    self.reset()
+            return self()
+        return '%s%012x' % (prefix, n)
+
+    def reset(self):
+        "Draw a new random prefix and restart the counter."
+        # 'xxxxxxxx-xxxx-4xxx-yxxx-', keeping the version and variant bits
+        self._state = (new_uid()[:24], itertools.count())
+
+    @property
+    def prefix(self):
+        "The prefix shared by the uids generated since the last reset"
+        return self._state[0]
+
+    def __repr__(self):
+        return '{}()'.format(type(self).__name__)
+
+
+# short_uid is called for every group of 'set' or 'trigger' messages; it only
+# needs a few random characters, so draw them from a pool.
+_short_uid_source = UidPool()
+
+
 def sanitize_np(val):
     "Convert any numpy objects into built-in Python types."
     if isinstance(val, (np.generic, np.ndarray)):
@@ -989,9 +1581,9 @@ def expiring_function(func, loop, *args, **kwargs):
 def short_uid(label=None, truncate=6):
     "Return a readable but unique id like 'label-fjfi5a'"
     if label:
-        return '-'.join([label, new_uid()[:truncate]])
+        return '-'.join([label, _short_uid_source()[:truncate]])
     else:
-        return new_uid()[:truncate]
+        return _short_uid_source()[:truncate]
 
 
 def ensure_uid(doc_or_uid):
@@ -1079,6 +1671,10 @@ class ProgressBar:
             they are displayed, delay drawing until the progress bar has been
             around for awhile. Default is 0.2 seconds.
         """
+        # tqdm is imported here, not at module level, to keep it out of the
+        # import of bluesky.utils.
+        from tqdm._utils import _environ_cols_wrapper
+
         self.meters = []
         self.status_objs = []
         # Determine terminal width.
@@ -1113,6 +1709,8 @@ class ProgressBar:
                fraction=None,
                time_elapsed=None, time_remaining=None):
         if all(x is not None for x in (current, initial, target)):
+            from tqdm import tqdm
+
             # Display a proper progress bar.
             total = round(_L2norm(target, initial), precision or 3)
             n = round(_L2norm(current, initial), precision or 3)
@@ -1143,6 +1741,9 @@ class ProgressBar:
         self.draw()
 
     def draw(self):
+        from tqdm import tqdm
+        from tqdm._utils import _term_move_up, _unicode
+
         with self.lock:
             if (time.time() - self.creation_time) < self.delay_draw:
                 return
@@ -1162,6 +1763,8 @@ class ProgressBar:
                 self.draw()
 
     def clear(self):
+        from tqdm._utils import _term_move_up, _unicode
+
         with self.lock:
             self.done = True
             if self.drawn:
@@ -1234,6 +1837,12 @@ def merge_axis(objs):
     coupled : Dict[PseudoPositioner, Dict[str, List[OphydObj]]]
         Mapping of interdependent axis passed in.
     '''
+    try:
+        # cytools is a drop-in replacement for toolz, implemented in Cython
+        from cytools import groupby
+    except ImportError:
+        from toolz import groupby
+
     def get_parent(o):
         return getattr(o, 'parent')
 
@@ -1303,9 +1912,9 @@ def merge_cycler(cyc):
     if len(co) == len(gb) == 0:
         return cyc
 
-    input_data = cyc.by_key()
-    output_data = [cycler(i, input_data[i]) for i in io | co]
-
+    keys = set(io | co)
+    # parent -> {child: attribute name} for axes to be moved together
+    merged = {}
     for parent, type_map in gb.items():
 
         if parent in co and (type_map['pseudo'] or type_map['real']):
@@ -1318,18 +1927,22 @@ def merge_cycler(cyc):
                              "Can not cope, failing")
         pseudo_axes = type_map['pseudo']
         if len(pseudo_axes) > 1:
-            p_cyc = reduce(operator.add,
-                           (cycler(my_name(c), input_data[c])
-                            for c in type_map['pseudo']))
-            output_data.append(cycler(parent, list(p_cyc)))
-        elif len(pseudo_axes) == 1:
-            c, = pseudo_axes
-            output_data.append(cycler(c, input_data[c]))
-
-        for c in type_map['real'] + type_map['unrelated']:
-            output_data.append(cycler(c, input_data[c]))
-
-    return reduce(operator.add, output_data)
+            merged[parent] = {c: my_name(c) for c in pseudo_axes}
+            keys.add(parent)
+        else:
+            keys.update(pseudo_axes)
+
+        keys.update(type_map['real'] + type_map['unrelated'])
+
+    def merge(point):
+        for parent, children in merged.items():
+            point[parent] = {name: point.pop(c)
+                             for c, name in children.items()}
+        return point
+
+    # Merge each point as it is reached rather than building the whole
+    # trajectory up front.
+    return _PointsCycler(_MappedPoints(cyc, merge), keys)
 
 
 _qapp = None